@@ -0,0 +1,120 @@
+"""
+Micro-benchmark for the ADF (Atlassian Document Format) to text renderer in jira_fetch_tool.
+
+Compares the previous recursive string-concatenating extract_text_from_adf with the
+iterative iter_adf_text renderer on large synthetic descriptions (many paragraphs, long
+and deeply nested bullet lists), checks both produce identical text, and shows that only
+the iterative renderer survives documents nested beyond the recursion limit. Usage:
+
+    python benchmarks/bench_adf_render.py [--paragraphs 20000] [--items 20000] [--depth 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agentic_testing.tools.jira_fetch_tool import extract_text_from_adf  # noqa: E402
+
+
+def legacy_extract_text_from_adf(adf):
+    """The renderer before the iterative rewrite, kept verbatim for comparison."""
+    def _rec(node, depth=0):
+        text = ""
+        if isinstance(node, list):
+            for n in node:
+                text += _rec(n, depth)
+            return text
+        t = node.get('type')
+        if t == 'text':
+            return node.get('text', '')
+        if t == 'paragraph':
+            return _rec(node.get('content', []), depth) + "\n"
+        if t == 'heading':
+            return _rec(node.get('content', []), depth) + "\n"
+        if t in ('bulletList', 'orderedList'):
+            s = ""
+            for item in node.get('content', []):
+                s += _rec(item, depth + 1)
+            return s
+        if t == 'listItem':
+            inner = _rec(node.get('content', []), depth).strip()
+            if depth == 1:
+                return "• " + inner + "\n"
+            else:
+                return "  " * (depth-1) + "– " + inner + "\n"
+        if 'content' in node:
+            return _rec(node['content'], depth)
+        return ""
+    return _rec(adf)
+
+
+def paragraph(text):
+    return {'type': 'paragraph', 'content': [{'type': 'text', 'text': text}]}
+
+
+def list_item(text, children=None):
+    content = [paragraph(text)]
+    if children:
+        content.append({'type': 'bulletList', 'content': children})
+    return {'type': 'listItem', 'content': content}
+
+
+def wide_document(paragraphs, items):
+    """Many paragraphs followed by one long bullet list with a nested sub-list per item."""
+    content = [paragraph(f"Paragraph {i} describing the expected behaviour of the login form.") for i in range(paragraphs)]
+    content.append(paragraph("Acceptance Criteria:"))
+    content.append({'type': 'bulletList', 'content': [
+        list_item(f"Criterion {i}", [list_item(f"Detail {i}.{j}") for j in range(3)]) for i in range(items)
+    ]})
+    return content
+
+
+def deep_document(depth, leaves_per_level=1):
+    """A bullet list nested depth levels deep; every level carries some text."""
+    node = list_item(f"Level {depth}")
+    for level in range(depth - 1, 0, -1):
+        node = list_item(f"Level {level}", [node] + [list_item(f"Leaf {level}.{k}") for k in range(leaves_per_level)])
+    return [{'type': 'bulletList', 'content': [node]}]
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    try:
+        result = fn()
+    except RecursionError:
+        print(f"  {label:<28} RecursionError")
+        return None, None
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed * 1000:9.1f} ms")
+    return result, elapsed
+
+
+def compare(name, document):
+    print(f"{name}:")
+    legacy, legacy_time = timed("legacy recursive", lambda: legacy_extract_text_from_adf(document))
+    current, current_time = timed("iterative renderer", lambda: extract_text_from_adf(document))
+    if legacy is not None:
+        if legacy != current:
+            print("❌ Rendered text differs from the legacy renderer")
+            sys.exit(1)
+        print(f"  ✅ identical output ({len(current)} chars), {legacy_time / current_time:.1f}x")
+    else:
+        print(f"  ✅ rendered {len(current)} chars")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, default=20000)
+    parser.add_argument('--items', type=int, default=20000)
+    parser.add_argument('--depth', type=int, default=200)
+    args = parser.parse_args()
+
+    compare(f"Wide document ({args.paragraphs} paragraphs, {args.items} list items)", wide_document(args.paragraphs, args.items))
+    compare(f"Deep list ({args.depth} levels)", deep_document(args.depth, leaves_per_level=20))
+    compare("Deep list beyond the recursion limit", deep_document(sys.getrecursionlimit() * 2))
+
+
+if __name__ == '__main__':
+    main()
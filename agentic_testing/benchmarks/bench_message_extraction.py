@@ -0,0 +1,125 @@
+"""
+Benchmark the message extractor on a synthetic JS/TS tree.
+
+Compares the previous nine-pass extractor (one re.finditer per pattern, line numbers from
+counting newlines before every match) with the single-pass extractor, scanned serially
+and in a process pool. Usage:
+
+    python benchmarks/bench_message_extraction.py [--files 10000] [--workers N]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agentic_testing.tools.message_extraction_tool import (  # noqa: E402
+    MESSAGE_PATTERNS,
+    find_source_files,
+    is_relevant,
+    scan_files,
+)
+
+SNIPPETS = [
+    "newErrors.email = 'Please enter a valid email address {n}';",
+    "setError('Unable to save your changes {n}');",
+    "toast.error(\"Session expired, please log in again {n}\", {{ duration: 3000 }});",
+    "const label = t('dashboard.welcome_message_{n}');",
+    "throw new Error('Unexpected response from server {n}');",
+    "toast({{ title: 'Profile updated {n}', description: 'Your profile was saved {n}' }});",
+    "alert('Are you sure you want to leave {n}');",
+    "console.warn('Deprecated prop used in component {n}');",
+]
+FILLER = [
+    "const value{n} = computeSomething(input{n}, options);",
+    "if (items.length > {n}) {{ return items.slice(0, {n}); }}",
+    "export function handler{n}(event) {{ return event.target.value; }}",
+    "// TODO: revisit layout spacing for breakpoint {n}",
+]
+
+
+def legacy_extract_messages_from_file(path):
+    """The extractor before the single-pass rewrite, kept verbatim for comparison."""
+    messages = []
+    try:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            lines = f.readlines()
+            full_text = ''.join(lines)
+            for msg_type, pattern in MESSAGE_PATTERNS.items():
+                for match in re.finditer(pattern, full_text):
+                    msg = match.group(1).strip()
+                    if is_relevant(msg):
+                        start = match.start()
+                        line_no = full_text[:start].count('\n') + 1
+                        messages.append({
+                            'message': msg,
+                            'type': msg_type,
+                            'file': path,
+                            'line': line_no
+                        })
+    except Exception as e:
+        print(f"Error parsing {path}: {e}")
+    return messages
+
+
+def build_tree(root, file_count, seed=0):
+    rng = random.Random(seed)
+    extensions = ('.js', '.jsx', '.ts', '.tsx')
+    for i in range(file_count):
+        directory = os.path.join(root, 'src', f'module_{i % 100}', f'feature_{i % 7}')
+        os.makedirs(directory, exist_ok=True)
+        # Roughly 1% of files are large bundled/generated modules, where per-match line counting hurts most
+        line_count = rng.randint(5000, 20000) if rng.random() < 0.01 else rng.randint(50, 400)
+        lines = []
+        for _ in range(line_count):
+            pool = SNIPPETS if rng.random() < 0.1 else FILLER
+            lines.append(rng.choice(pool).format(n=rng.randint(0, 500)))
+        with open(os.path.join(directory, f'file_{i}{rng.choice(extensions)}'), 'w') as f:
+            f.write('\n'.join(lines))
+    # Excluded directories must not be scanned
+    os.makedirs(os.path.join(root, 'node_modules', 'pkg'), exist_ok=True)
+    with open(os.path.join(root, 'node_modules', 'pkg', 'index.js'), 'w') as f:
+        f.write("throw new Error('should never be extracted');")
+
+
+def as_set(results):
+    return {(m['file'], m['line'], m['type'], m['message']) for messages in results for m in messages}
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.2f}s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        print(f"Generating {args.files} synthetic source files in {root} ...")
+        build_tree(root, args.files)
+        paths = find_source_files(root)
+        print(f"Scanning {len(paths)} files:")
+        legacy, legacy_time = timed("legacy nine-pass (serial)", lambda: [legacy_extract_messages_from_file(p) for p in paths])
+        serial, serial_time = timed("single-pass (serial)", lambda: list(scan_files(paths, workers=1)))
+        parallel, parallel_time = timed("single-pass (process pool)", lambda: list(scan_files(paths, workers=args.workers)))
+
+    expected = as_set(legacy)
+    if as_set(serial) != expected or as_set(parallel) != expected:
+        print("❌ Extracted messages differ from the legacy extractor")
+        sys.exit(1)
+    print(f"✅ {len(expected)} identical matches; speedup {legacy_time / serial_time:.1f}x serial, "
+          f"{legacy_time / parallel_time:.1f}x parallel")
+
+
+if __name__ == '__main__':
+    main()
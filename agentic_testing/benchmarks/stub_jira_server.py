@@ -0,0 +1,175 @@
+"""
+Local stub of the JIRA REST endpoints used by tools/jira_fetch_tool.py.
+
+Serves /rest/api/3/issue/<KEY> and /rest/api/3/search with startAt/maxResults paging.
+Keys EPIC-<n> are epics with --children child stories each; every --rate-limit-every-th
+request is answered with 429 and Retry-After. Running the module fetches all epics
+through the stub with process_jira_tickets and checks that no child story was lost
+to paging; compare --workers 1 with the default to see the effect of concurrency:
+
+    python benchmarks/stub_jira_server.py [--epics 8] [--children 250] [--latency 0.05] [--workers N]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agentic_testing.tools import jira_fetch_tool  # noqa: E402
+
+EPIC_KEY_PATTERN = re.compile(r'EPIC-\d+')
+
+
+DEFAULT_UPDATED = '2024-01-01T00:00:00.000+0000'
+UPDATED_FILTER_PATTERN = re.compile(r'updated >= "([^"]+)"')
+
+
+def make_issue(key, issue_type, fields, summary=None, updated=DEFAULT_UPDATED):
+    issue = {'key': key, 'fields': {}}
+    all_fields = {
+        'summary': summary or f'Story {key}',
+        'description': {'type': 'doc', 'content': [
+            {'type': 'paragraph', 'content': [{'type': 'text', 'text': f'As a user I want {key}.'}]},
+            {'type': 'paragraph', 'content': [{'type': 'text', 'text': 'Acceptance Criteria:'}]},
+            {'type': 'bulletList', 'content': [
+                {'type': 'listItem', 'content': [{'type': 'paragraph', 'content': [{'type': 'text', 'text': 'It works'}]}]},
+            ]},
+        ]},
+        'issuetype': {'name': issue_type},
+        'updated': updated,
+        'status': {'name': 'To Do'},
+        'priority': {'name': 'Medium'},
+        'assignee': {'displayName': 'Someone'},
+        'reporter': {'displayName': 'Someone Else'},
+    }
+    for name in fields:
+        if name in all_fields:
+            issue['fields'][name] = all_fields[name]
+    return issue
+
+
+class StubJira:
+    def __init__(self, children=250, latency=0.0, rate_limit_every=0):
+        self.children = children
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.requests = 0
+        self.rate_limited = 0
+        self.fields_requested = set()
+        # key -> (summary, updated) for issues edited through edit_issue
+        self.edits = {}
+        self._lock = threading.Lock()
+
+    def edit_issue(self, key, summary):
+        """Change an issue's summary and bump its 'updated' timestamp to now."""
+        updated = time.strftime('%Y-%m-%dT%H:%M:%S.000+0000', time.gmtime())
+        self.edits[key] = (summary, updated)
+
+    def issue(self, key, issue_type, fields):
+        summary, updated = self.edits.get(key, (None, DEFAULT_UPDATED))
+        return make_issue(key, issue_type, fields, summary, updated)
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def send_json(self, status, payload, headers=None):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    limited = stub.rate_limit_every and stub.requests % stub.rate_limit_every == 0
+                    if limited:
+                        stub.rate_limited += 1
+                if limited:
+                    return self.send_json(429, {'errorMessages': ['Rate limited']}, {'Retry-After': '0'})
+                time.sleep(stub.latency)
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                fields = query.get('fields', '*all').split(',')
+                with stub._lock:
+                    stub.fields_requested.update(fields)
+                if url.path.startswith('/rest/api/3/issue/'):
+                    key = url.path.rsplit('/', 1)[-1]
+                    issue_type = 'Epic' if EPIC_KEY_PATTERN.fullmatch(key) else 'Story'
+                    return self.send_json(200, stub.issue(key, issue_type, fields))
+                if url.path == '/rest/api/3/search':
+                    epic = EPIC_KEY_PATTERN.search(query.get('jql', ''))
+                    if not epic or '"Epic Link"' not in query.get('jql', ''):
+                        return self.send_json(200, {'startAt': 0, 'maxResults': 0, 'total': 0, 'issues': []})
+                    keys = [f"{epic.group()}-S{i}" for i in range(stub.children)]
+                    since = UPDATED_FILTER_PATTERN.search(query['jql'])
+                    if since:
+                        # JQL minute-precision date compared with the ISO timestamp prefix
+                        cutoff = since.group(1).replace(' ', 'T')
+                        keys = [key for key in keys if stub.edits.get(key, (None, DEFAULT_UPDATED))[1][:16] >= cutoff]
+                    start = int(query.get('startAt', 0))
+                    # Real JIRA caps maxResults server side as well
+                    page = min(int(query.get('maxResults', 50)), 100)
+                    return self.send_json(200, {
+                        'startAt': start, 'maxResults': page, 'total': len(keys),
+                        'issues': [stub.issue(key, 'Story', fields) for key in keys[start:start + page]],
+                    })
+                self.send_json(404, {'errorMessages': ['Not found']})
+
+        return Handler
+
+    def serve(self):
+        """Start the stub on a free local port; returns (server, base_url)."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--epics', type=int, default=8)
+    parser.add_argument('--children', type=int, default=250)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every response')
+    parser.add_argument('--rate-limit-every', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=jira_fetch_tool.JIRA_MAX_WORKERS)
+    args = parser.parse_args()
+
+    stub = StubJira(args.children, args.latency, args.rate_limit_every)
+    server, base_url = stub.serve()
+    keys = [f"EPIC-{i}" for i in range(args.epics)]
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            start = time.perf_counter()
+            saved = jira_fetch_tool.process_jira_tickets(base_url, 'user', 'token', keys,
+                                                         max_workers=args.workers, folder=folder)
+            elapsed = time.perf_counter() - start
+            stored = len([name for name in os.listdir(folder) if name.endswith('.txt')])
+    finally:
+        server.shutdown()
+    expected = args.epics * args.children
+    print(f"\nFetched {len(saved)} stories ({stored} files, expected {expected}) from {args.epics} epics "
+          f"in {elapsed:.2f}s with {args.workers} workers")
+    print(f"Stub served {stub.requests} requests, {stub.rate_limited} answered with 429; "
+          f"fields requested: {', '.join(sorted(stub.fields_requested))}")
+    if stored != expected:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -70,6 +70,12 @@ class AgenticTesting():
         return Task(
             config=self.tasks_config['enhance_environment_for_test'],
         )
+
+    @task
+    def enhance_environment_for_tests(self) -> Task:
+        return Task(
+            config=self.tasks_config['enhance_environment_for_tests'],
+        )
     
     @agent
     def test_execution_debugger(self) -> Agent:
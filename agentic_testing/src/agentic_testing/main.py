@@ -5,19 +5,53 @@ import os
 import re
 from datetime import datetime
 import json
-import subprocess
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 
 from agentic_testing.crew import AgenticTesting
+from agentic_testing.pipeline_context import PipelineContext
 from agentic_testing.tools.git_clone_tool import clone_repo
 from agentic_testing.tools.jira_fetch_tool import fetch_and_save_jira_stories
 from agentic_testing.tools.message_extraction_tool import extract_messages
-from agentic_testing.tools.environment_base_generator import generate_base_environment_file
+from agentic_testing.tools.metadata_extraction_client import extract_metadata
+from agentic_testing.tools.environment_base_generator import generate_base_environment_file, install_support_modules
+from agentic_testing.tools.kickoff_cache import KickoffCache, config_hash, hash_text
+from agentic_testing.tools.pipeline_manifest import PipelineManifest, hash_file
+from agentic_testing.tools.fence_stream import extract_fenced_code, stream_fenced_code
+from agentic_testing.tools.prompt_budget import DEFAULT_TOKEN_BUDGET, estimate_tokens, trim_metadata
+from agentic_testing.tools.test_requirements import extract_test_requirements, format_test_requirements
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 # Set this variable to 'all' or a specific file name like 'LD-2_story.txt'
 STORY_SELECTION = os.environ.get('STORY_SELECTION', 'all')  # Can be set via env var or hardcoded
 FEATURE_SELECTION = os.environ.get('FEATURE_SELECTION', 'all')  # New env var for step definition selection
+# Number of stories processed concurrently in Steps 4-6; 1 keeps the original serial pipeline
+PIPELINE_CONCURRENCY = max(1, int(os.environ.get('PIPELINE_CONCURRENCY', '1')))
+# How many times a rate-limited kickoff is retried (with exponential backoff) before giving up
+RATE_LIMIT_MAX_RETRIES = int(os.environ.get('RATE_LIMIT_MAX_RETRIES', '5'))
+# 'on' reuses cached LLM results, 'off' (or --no-cache) always calls the LLM, 'clear' (or --clear-cache) invalidates first
+KICKOFF_CACHE_MODE = os.environ.get('KICKOFF_CACHE', 'on')
+if '--no-cache' in sys.argv:
+    KICKOFF_CACHE_MODE = 'off'
+elif '--clear-cache' in sys.argv:
+    KICKOFF_CACHE_MODE = 'clear'
+
+# 'on' streams LLM tokens and writes the fenced code block to the target file as it arrives
+STREAM_GENERATION = os.environ.get('STREAM_GENERATION', 'off') == 'on'
+# Step 8 mode: 'batched' enhances environment.py once for all test files, 'per_test' makes one call per test file
+ENV_ENHANCE_MODE = os.environ.get('ENV_ENHANCE_MODE', 'batched')
+# Maximum test files per batched Step 8 call; 0 puts every test file into a single call
+ENV_ENHANCE_BATCH_SIZE = int(os.environ.get('ENV_ENHANCE_BATCH_SIZE', '0'))
+# 'on' skips stories/features whose inputs are unchanged since the last run, 'off' rebuilds everything
+INCREMENTAL_BUILD = os.environ.get('INCREMENTAL_BUILD', 'on')
+# Step 2 extractors: 'off' spawns node per run, 'on' queries a running extraction server, 'auto' starts one if needed
+METADATA_SERVER = os.environ.get('METADATA_SERVER', 'off')
+
+kickoff_cache = KickoffCache(enabled=KICKOFF_CACHE_MODE != 'off')
+pipeline_manifest = PipelineManifest(enabled=INCREMENTAL_BUILD != 'off')
+pipeline = PipelineContext(stream=STREAM_GENERATION)
 
 # This main file is intended to be a way for you to run your
 # crew locally, so refrain from adding unnecessary logic into this file.
@@ -32,20 +66,64 @@ def extract_title_from_story(story_content):
     # Fallback: use first 10 words of the story
     return "_".join(story_content.split()[:10])
 
-def save_feature_file(title, gherkin_content):
+def is_rate_limit_error(error):
+    name = type(error).__name__.lower()
+    message = str(error).lower()
+    return 'ratelimit' in name or 'rate limit' in message or 'rate_limit' in message or '429' in message
+
+def kickoff_with_backoff(crew, inputs, stream_to=None):
+    """
+    Kick off the crew, retrying with exponential backoff and jitter while the LLM provider rate-limits us.
+    With stream_to=(target_path, language) and STREAM_GENERATION on, the fenced code block is
+    written to target_path while tokens arrive.
+    """
+    for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+        try:
+            if STREAM_GENERATION and stream_to:
+                with stream_fenced_code(*stream_to, crew.agents[0].llm):
+                    return crew.kickoff(inputs=inputs)
+            return crew.kickoff(inputs=inputs)
+        except Exception as e:
+            if attempt == RATE_LIMIT_MAX_RETRIES or not is_rate_limit_error(e):
+                raise
+            delay = 2 ** (attempt + 1) + random.uniform(0, 1)
+            print(f"⏳ Rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{RATE_LIMIT_MAX_RETRIES}): {e}")
+            time.sleep(delay)
+
+def kickoff_with_cache(agent_name, task_name, inputs, stream_to=None):
+    """
+    Return the cached result for (task_name, inputs) or kick off the shared crew for it and cache its output.
+    """
+    cached = kickoff_cache.get(task_name, inputs)
+    if cached is not None:
+        return cached
+    # Streamed generations stop at the closing code fence instead of running on into prose
+    crew = pipeline.crew(agent_name, task_name, stop_at_fence=stream_to is not None)
+    result = str(pipeline.timed_kickoff(task_name, lambda: kickoff_with_backoff(crew, inputs, stream_to)))
+    kickoff_cache.put(task_name, inputs, result)
+    return result
+
+def feature_file_path(title):
     features_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../features'))
-    os.makedirs(features_dir, exist_ok=True)
     safe_title = re.sub(r'[^a-zA-Z0-9_\-]', '_', title)[:50]
-    file_path = os.path.join(features_dir, f"{safe_title}.feature")
+    return os.path.join(features_dir, f"{safe_title}.feature")
+
+def save_feature_file(title, gherkin_content):
+    file_path = feature_file_path(title)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(gherkin_content)
     print(f"✅ Saved feature: {file_path}")
+    return file_path
 
-def save_step_definition_file(title, step_def_content):
+def step_definition_path(title):
     steps_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../features/steps'))
-    os.makedirs(steps_dir, exist_ok=True)
     safe_title = re.sub(r'[^a-zA-Z0-9_\-]', '_', title)[:50]
-    file_path = os.path.join(steps_dir, f"{safe_title}_steps.py")
+    return os.path.join(steps_dir, f"{safe_title}_steps.py")
+
+def save_step_definition_file(title, step_def_content):
+    file_path = step_definition_path(title)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(step_def_content)
     print(f"✅ Saved step definitions: {file_path}")
@@ -56,31 +134,38 @@ def process_feature_file(feature_file):
     with open(feature_file, 'r', encoding='utf-8') as f:
         feature_content = f.read()
     title = os.path.splitext(os.path.basename(feature_file))[0]
+    step_def_path = step_definition_path(title)
     try:
         # Only run the step_definition_generation task here
-        from agentic_testing.crew import AgenticTesting
-        step_def_agent = AgenticTesting().step_definition_generator()
-        step_def_task = AgenticTesting().step_definition_generation()
-        from crewai import Crew, Process
-        crew = Crew(
-            agents=[step_def_agent],
-            tasks=[step_def_task],
-            process=Process.sequential,
-            verbose=True,
-        )
-        result = crew.kickoff(inputs={
+        result_str = kickoff_with_cache("step_definition_generator", "step_definition_generation", {
             "feature_content": feature_content
-        })
+        }, stream_to=(step_def_path, "python"))
         # Post-process to remove ```python and ``` code fences
-        result_str = str(result)
-        match = re.search(r'```python\s*([\s\S]+?)```', result_str)
-        if match:
-            code_content = match.group(1).strip()
-        else:
-            code_content = result_str.strip()
+        code_content = extract_fenced_code(result_str, "python") or result_str.strip()
         save_step_definition_file(title, code_content)
+        return True
     except Exception as e:
         print(f"❌ Error generating step definitions for {feature_file}: {e}")
+        return False
+
+def budget_metadata(title, feature_content, step_def_content, locators_json, endpoints_json, ui_endpoints_json):
+    """
+    Trim the locators/endpoints/UI routes JSON to the entries the feature and step text refer to,
+    within PROMPT_TOKEN_BUDGET tokens, and log the Selenium call's input size before and after.
+    """
+    try:
+        metadata = [json.loads(locators_json), json.loads(endpoints_json), json.loads(ui_endpoints_json)]
+    except ValueError as e:
+        print(f"⚠️  Sending untrimmed metadata for {title}: {e}")
+        return locators_json, endpoints_json, ui_endpoints_json
+    before = estimate_tokens(feature_content + step_def_content + locators_json + endpoints_json + ui_endpoints_json)
+    trimmed = trim_metadata(feature_content + "\n" + step_def_content, *metadata, token_budget=DEFAULT_TOKEN_BUDGET)
+    trimmed_json = tuple(json.dumps(entries, indent=2) for entries in trimmed)
+    after = estimate_tokens(feature_content + step_def_content + "".join(trimmed_json))
+    print(f"✂️  Prompt budget for {title}: locators {len(metadata[0])}->{len(trimmed[0])}, "
+          f"endpoints {len(metadata[1])}->{len(trimmed[1])}, UI routes {len(metadata[2])}->{len(trimmed[2])}; "
+          f"input tokens ~{before} -> ~{after}")
+    return trimmed_json
 
 def process_selenium_test_file(feature_file):
     print(f"📝 Generating Selenium Behave test for feature file {feature_file}")
@@ -105,37 +190,46 @@ def process_selenium_test_file(feature_file):
         endpoints_json = f.read()
     with open(ui_endpoints_path, 'r', encoding='utf-8') as f:
         ui_endpoints_json = f.read()
-    try:
-        from agentic_testing.crew import AgenticTesting
-        selenium_agent = AgenticTesting().selenium_test_generator()
-        selenium_task = AgenticTesting().selenium_test_generation()
-        from crewai import Crew, Process
-        crew = Crew(
-            agents=[selenium_agent],
-            tasks=[selenium_task],
-            process=Process.sequential,
-            verbose=True,
+    if DEFAULT_TOKEN_BUDGET > 0:
+        locators_json, endpoints_json, ui_endpoints_json = budget_metadata(
+            title, feature_content, step_def_content, locators_json, endpoints_json, ui_endpoints_json
         )
-        result = crew.kickoff(inputs={
+    try:
+        result_str = kickoff_with_cache("selenium_test_generator", "selenium_test_generation", {
             "step_def_content": step_def_content,
             "locators_json": locators_json,
             "endpoints_json": endpoints_json,
             "ui_endpoints_json": ui_endpoints_json,
             "feature_content": feature_content
-        })
+        }, stream_to=(step_def_path, "python"))
         # Only save the code part (no markdown/code fences)
-        result_str = str(result)
-        match = re.search(r'```python\s*([\s\S]+?)```', result_str)
-        if match:
-            code_content = match.group(1).strip()
-        else:
-            code_content = result_str.strip()
+        code_content = extract_fenced_code(result_str, "python") or result_str.strip()
         # Overwrite the step definition file with the generated Selenium test code
         with open(step_def_path, 'w', encoding='utf-8') as f:
             f.write(code_content)
         print(f"✅ Overwrote step definition file with Selenium test: {step_def_path}")
+        return True
     except Exception as e:
         print(f"❌ Error generating Selenium Behave test for {feature_file}: {e}")
+        return False
+
+def test_artifact(feature_file):
+    """
+    Manifest entry for the step definition file generated from a feature file (Steps 5-6).
+    """
+    title = os.path.splitext(os.path.basename(feature_file))[0]
+    steps_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../features/steps'))
+    meta_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../features/meta_data'))
+    inputs = {
+        "feature": hash_file(feature_file),
+        "locators": hash_file(os.path.join(meta_dir, "locators_babel.json")),
+        "endpoints": hash_file(os.path.join(meta_dir, "endpoints_babel.json")),
+        "ui_endpoints": hash_file(os.path.join(meta_dir, "ui_endpoints_babel.json")),
+        "config": config_hash(),
+        # The budget decides which metadata reaches the prompt, so changing it rebuilds the output
+        "prompt_token_budget": str(DEFAULT_TOKEN_BUDGET),
+    }
+    return f"steps:{os.path.basename(feature_file)}", os.path.join(steps_dir, f"{title}_steps.py"), inputs
 
 def load_extracted_messages():
     messages_path = os.path.abspath(
@@ -153,43 +247,90 @@ def process_story_file(story_file):
         story_content = f.read()
     title = extract_title_from_story(story_content)
     messages = load_extracted_messages()
+    feature_file = feature_file_path(title)
+    artifact = f"feature:{os.path.basename(story_file)}"
+    inputs = {
+        "story": hash_text(story_content),
+        "messages": hash_text(json.dumps(messages)),
+        "config": config_hash(),
+    }
+    if not pipeline_manifest.needs_rebuild(artifact, feature_file, inputs):
+        return feature_file
     try:
         # Only run the gherkin_generation task here with a Crew containing only the gherkin agent and task
-        from agentic_testing.crew import AgenticTesting
-        gherkin_agent = AgenticTesting().gherkin_generator()
-        gherkin_task = AgenticTesting().gherkin_generation()
-        from crewai import Crew, Process
-        crew = Crew(
-            agents=[gherkin_agent],
-            tasks=[gherkin_task],
-            process=Process.sequential,
-            verbose=True,
-        )
-        result = crew.kickoff(inputs={
+        result = kickoff_with_cache("gherkin_generator", "gherkin_generation", {
             "user_story": story_content,
             "messages": messages
-        })
-        gherkin_content = result
-        match = re.search(r'```gherkin\s*([\s\S]+?)```', str(result))
-        if match:
-            gherkin_content = match.group(1).strip()
-        save_feature_file(title, gherkin_content)
+        }, stream_to=(feature_file, "gherkin"))
+        gherkin_content = extract_fenced_code(result, "gherkin") or result
+        feature_file = save_feature_file(title, gherkin_content)
+        pipeline_manifest.record(artifact, feature_file, inputs)
+        return feature_file
     except Exception as e:
         print(f"❌ Error generating feature for {story_file}: {e}")
+        return None
+
+def is_selected_feature(feature_file):
+    return FEATURE_SELECTION == 'all' or os.path.basename(feature_file) == FEATURE_SELECTION
+
+def process_feature_job(feature_file):
+    """
+    Generate step definitions and then the Selenium test for one feature file, unless they are up to date.
+    """
+    artifact, steps_path, inputs = test_artifact(feature_file)
+    if not pipeline_manifest.needs_rebuild(artifact, steps_path, inputs):
+        return
+    try:
+        step_defs_ok = process_feature_file(feature_file)
+        if process_selenium_test_file(feature_file) and step_defs_ok:
+            pipeline_manifest.record(artifact, steps_path, inputs)
+    except Exception as e:
+        print(f"❌ Error generating tests for {feature_file}: {e}")
+
+def process_story_job(feature_file, story_files):
+    """
+    Run gherkin -> step definitions -> Selenium generation for the stories that map to one feature file.
+    Stories with the same title are processed in order inside one job so the last one wins,
+    exactly as in the serial pipeline.
+    """
+    for story_file in story_files:
+        process_story_file(story_file)
+    if os.path.exists(feature_file) and is_selected_feature(feature_file):
+        process_feature_job(feature_file)
+
+def run_concurrent_generation(story_files, features_dir):
+    """
+    Steps 4-6 with up to PIPELINE_CONCURRENCY stories in flight; returns the selected feature files.
+    """
+    jobs = {}
+    for story_file in story_files:
+        with open(story_file, 'r', encoding='utf-8') as f:
+            title = extract_title_from_story(f.read())
+        jobs.setdefault(feature_file_path(title), []).append(story_file)
+    print(f"⚙️  Processing {len(story_files)} stories with up to {PIPELINE_CONCURRENCY} concurrent jobs")
+    with ThreadPoolExecutor(max_workers=PIPELINE_CONCURRENCY) as pool:
+        story_jobs = [pool.submit(process_story_job, feature_file, files) for feature_file, files in jobs.items()]
+        for job in as_completed(story_jobs):
+            job.result()
+        # Feature files that no story maps to still get their tests generated, as in the serial pipeline
+        feature_files = list_selected_feature_files(features_dir)
+        wait([pool.submit(process_feature_job, feature_file)
+              for feature_file in feature_files if feature_file not in jobs])
+    return feature_files
+
+def list_selected_feature_files(features_dir):
+    if FEATURE_SELECTION == 'all':
+        return sorted(os.path.join(features_dir, f) for f in os.listdir(features_dir) if f.endswith('.feature'))
+    feature_file = os.path.join(features_dir, FEATURE_SELECTION)
+    if not os.path.exists(feature_file):
+        print(f"Feature file not found: {feature_file}")
+        return []
+    return [feature_file]
 
 def generate_environment_file():
     print("📝 Generating features/environment.py for Behave infrastructure setup")
     try:
-        from agentic_testing.crew import AgenticTesting
-        env_agent = AgenticTesting().environment_generator()
-        env_task = AgenticTesting().generate_environment()
-        from crewai import Crew, Process
-        crew = Crew(
-            agents=[env_agent],
-            tasks=[env_task],
-            process=Process.sequential,
-            verbose=True,
-        )
+        crew = pipeline.crew("environment_generator", "generate_environment")
         result = crew.kickoff(inputs={})
         # Save to the correct location in the project root features/ directory
         features_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../features'))
@@ -201,6 +342,64 @@ def generate_environment_file():
     except Exception as e:
         print(f"❌ Error generating features/environment.py: {e}")
 
+def enhance_environment_per_test(env_path, feature_files):
+    """
+    Legacy Step 8: one enhancement call per test file, each re-sending the growing environment.py.
+    """
+    steps_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../features/steps'))
+    for feature_file in feature_files:
+        title = os.path.splitext(os.path.basename(feature_file))[0]
+        test_file_path = os.path.join(steps_dir, f"{title}_steps.py")
+        try:
+            with open(env_path, 'r', encoding='utf-8') as f:
+                environment_base_code = f.read()
+            with open(test_file_path, 'r', encoding='utf-8') as f:
+                test_file_code = f.read()
+            result = kickoff_with_cache("environment_generator", "enhance_environment_for_test", {
+                "environment_base_code": environment_base_code,
+                "test_file_code": test_file_code
+            })
+            # Save the enhanced environment.py
+            with open(env_path, 'w', encoding='utf-8') as f:
+                f.write(result)
+            print(f"✅ Enhanced environment.py for {title} at {env_path}")
+        except Exception as e:
+            print(f"❌ Error enhancing environment.py for {title}: {e}")
+
+def enhance_environment_batched(env_path, feature_files):
+    """
+    Step 8: collect the requirements of every test file up front and enhance environment.py in
+    ceil(len(feature_files) / ENV_ENHANCE_BATCH_SIZE) calls (a single call by default).
+    """
+    steps_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../features/steps'))
+    requirements = []
+    for feature_file in feature_files:
+        title = os.path.splitext(os.path.basename(feature_file))[0]
+        test_file_path = os.path.join(steps_dir, f"{title}_steps.py")
+        if not os.path.exists(test_file_path):
+            print(f"❌ Skipping environment requirements for {title}: {test_file_path} not found")
+            continue
+        requirements.append(extract_test_requirements(feature_file, test_file_path))
+    if not requirements:
+        print("No test files to enhance environment.py for")
+        return
+    batch_size = ENV_ENHANCE_BATCH_SIZE or len(requirements)
+    batches = [requirements[i:i + batch_size] for i in range(0, len(requirements), batch_size)]
+    for index, batch in enumerate(batches, start=1):
+        test_names = ', '.join(req['test_file'] for req in batch)
+        try:
+            with open(env_path, 'r', encoding='utf-8') as f:
+                environment_base_code = f.read()
+            result = kickoff_with_cache("environment_generator", "enhance_environment_for_tests", {
+                "environment_base_code": environment_base_code,
+                "test_requirements": format_test_requirements(batch)
+            })
+            with open(env_path, 'w', encoding='utf-8') as f:
+                f.write(result)
+            print(f"✅ Enhanced environment.py (batch {index}/{len(batches)}: {test_names}) at {env_path}")
+        except Exception as e:
+            print(f"❌ Error enhancing environment.py for batch {index}/{len(batches)} ({test_names}): {e}")
+
 def initialPipeline():
     """
     Run the pipeline for all or a specific user story file.
@@ -215,18 +414,8 @@ def initialPipeline():
     print("[Step 2] Running Python message extraction...")
     extract_messages()##Alternative to this
     
-    print("[Step 2] Running Babel AST parser for locators, endpoints, and UI routes...")
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
-    subprocess.run([
-        "node", 
-        os.path.join(os.path.dirname(__file__), 'tools', 'extract_all_metadata_babel.js')
-    ], cwd=project_root)
-    
-    print("[Step 2] Running Java endpoint extraction...")
-    subprocess.run([
-        "node", 
-        os.path.join(os.path.dirname(__file__), 'tools', 'extract_java_endpoints.js')
-    ], cwd=project_root)
+    print("[Step 2] Running Babel AST parser and Java endpoint extraction for locators, endpoints, and UI routes...")
+    extract_metadata(METADATA_SERVER)
     print("Extraction complete. Check features/meta_data/ for outputs.")
     
     # Step 3: Fetch JIRA user stories
@@ -240,34 +429,38 @@ def initialPipeline():
         print(f"No user_stories directory found at {user_stories_dir}")
         return
     if STORY_SELECTION == 'all':
-        for filename in os.listdir(user_stories_dir):
-            if filename.endswith('.txt'):
-                story_file = os.path.join(user_stories_dir, filename)
-                process_story_file(story_file)
+        story_files = [os.path.join(user_stories_dir, f) for f in sorted(os.listdir(user_stories_dir)) if f.endswith('.txt')]
     else:
         story_file = os.path.join(user_stories_dir, STORY_SELECTION)
         if not os.path.exists(story_file):
             print(f"User story file not found: {story_file}")
             return
-        process_story_file(story_file)
-
-    # Step 5: Generate Behave step definitions for each feature file based on FEATURE_SELECTION
-    print("[Step 5] Generating Behave step definitions for feature files...")
+        story_files = [story_file]
     features_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../features'))
-    if FEATURE_SELECTION == 'all':
-        feature_files = [os.path.join(features_dir, f) for f in os.listdir(features_dir) if f.endswith('.feature')]
-    else:
-        feature_file = os.path.join(features_dir, FEATURE_SELECTION)
-        feature_files = [feature_file] if os.path.exists(feature_file) else []
-        if not feature_files:
-            print(f"Feature file not found: {feature_file}")
-    for feature_file in feature_files:
-        process_feature_file(feature_file)
 
-    # Step 6: Generate Selenium Behave test files for each feature file
-    print("[Step 6] Generating Selenium Behave test files for feature files...")
-    for feature_file in feature_files:
-        process_selenium_test_file(feature_file)
+    if PIPELINE_CONCURRENCY > 1:
+        # Steps 4-6 run per story as independent jobs
+        print("[Steps 5-6] Step definitions and Selenium tests are generated inside each story job")
+        feature_files = run_concurrent_generation(story_files, features_dir)
+    else:
+        for story_file in story_files:
+            process_story_file(story_file)
+
+        # Step 5: Generate Behave step definitions for each feature file based on FEATURE_SELECTION
+        print("[Step 5] Generating Behave step definitions for feature files...")
+        feature_files = list_selected_feature_files(features_dir)
+        stale_tests = {}
+        for feature_file in feature_files:
+            artifact, steps_path, inputs = test_artifact(feature_file)
+            if pipeline_manifest.needs_rebuild(artifact, steps_path, inputs):
+                stale_tests[feature_file] = (artifact, steps_path, inputs, process_feature_file(feature_file))
+
+        # Step 6: Generate Selenium Behave test files for each feature file
+        print("[Step 6] Generating Selenium Behave test files for feature files...")
+        for feature_file, (artifact, steps_path, inputs, step_defs_ok) in stale_tests.items():
+            if process_selenium_test_file(feature_file) and step_defs_ok:
+                pipeline_manifest.record(artifact, steps_path, inputs)
+    pipeline_manifest.report()
 
     # Step 7: Generate environment.py only if it does not already exist
     env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../features/environment.py'))
@@ -276,59 +469,38 @@ def initialPipeline():
         generate_base_environment_file(env_path)
     else:
         print(f"[Step 7] Skipping environment.py generation (already exists at {env_path})")
+    # Shared runtime helpers (locator registry, driver pool, reporting, ...) are always refreshed
+    install_support_modules(os.path.dirname(env_path))
 
-    # Step 8: Enhance environment.py for each test file
-    print("[Step 8] Enhancing environment.py for each test file...")
-    steps_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../features/steps'))
-    for feature_file in feature_files:
-        title = os.path.splitext(os.path.basename(feature_file))[0]
-        test_file_path = os.path.join(steps_dir, f"{title}_steps.py")
-        try:
-            with open(env_path, 'r', encoding='utf-8') as f:
-                environment_base_code = f.read()
-            with open(test_file_path, 'r', encoding='utf-8') as f:
-                test_file_code = f.read()
-            from agentic_testing.crew import AgenticTesting
-            env_agent = AgenticTesting().environment_generator()
-            enhance_task = AgenticTesting().enhance_environment_for_test()
-            from crewai import Crew, Process
-            crew = Crew(
-                agents=[env_agent],
-                tasks=[enhance_task],
-                process=Process.sequential,
-                verbose=True,
-            )
-            result = crew.kickoff(inputs={
-                "environment_base_code": environment_base_code,
-                "test_file_code": test_file_code
-            })
-            # Save the enhanced environment.py
-            with open(env_path, 'w', encoding='utf-8') as f:
-                f.write(str(result))
-            print(f"✅ Enhanced environment.py for {title} at {env_path}")
-        except Exception as e:
-            print(f"❌ Error enhancing environment.py for {title}: {e}")
+    # Step 8: Enhance environment.py for the generated test files
+    if ENV_ENHANCE_MODE == 'per_test':
+        print("[Step 8] Enhancing environment.py for each test file...")
+        enhance_environment_per_test(env_path, feature_files)
+    else:
+        print("[Step 8] Enhancing environment.py for all test files in batched mode...")
+        enhance_environment_batched(env_path, feature_files)
     return
 
 def run():
-    initialPipeline()
-    print("✅ Initial pipeline completed")
-
-    # Change to the project root so the agent can find the features directory
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
-    os.chdir(project_root)
-    print(f"Changed directory to: {project_root}")
-
-    from crewai import Crew, Process
-    crew = Crew(
-            agents=[AgenticTesting().test_execution_debugger()],
-            tasks=[AgenticTesting().test_execution_debugging()],
-            process=Process.sequential,
-            verbose=True,
-            )
-    
-    # Pass FEATURE_SELECTION to the crew
-    result = crew.kickoff(inputs={'feature_selection': FEATURE_SELECTION})
+    if KICKOFF_CACHE_MODE == 'clear':
+        kickoff_cache.clear()
+    # The cache and timing statistics are reported even when a step fails
+    try:
+        initialPipeline()
+        print("✅ Initial pipeline completed")
+
+        # Change to the project root so the agent can find the features directory
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+        os.chdir(project_root)
+        print(f"Changed directory to: {project_root}")
+
+        crew = pipeline.crew("test_execution_debugger", "test_execution_debugging")
+
+        # Pass FEATURE_SELECTION to the crew
+        result = pipeline.timed_kickoff("test_execution_debugging", lambda: crew.kickoff(inputs={'feature_selection': FEATURE_SELECTION}))
+    finally:
+        kickoff_cache.report()
+        pipeline.report()
 
 
 
@@ -0,0 +1,78 @@
+import threading
+import time
+
+from crewai import Crew, Process
+
+from agentic_testing.crew import AgenticTesting
+from agentic_testing.tools.fence_stream import CLOSING_FENCE_STOP
+
+
+class PipelineContext:
+    """
+    Long-lived owner of the agents, tasks and single-task crews used by the pipeline.
+
+    Each worker thread builds one AgenticTesting instance (one parse of agents.yaml/tasks.yaml)
+    and one Crew per (agent, task) pair, then reuses them for every story it processes.
+    Setup and kickoff times are recorded per task so the removed overhead can be compared
+    with LLM latency at the end of the run. With stream=True the agents' LLMs stream tokens,
+    and crews created with stop_at_fence=True stop generating at the closing code fence.
+    """
+
+    def __init__(self, stream=False):
+        self.stream = stream
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.timings = {}
+
+    def _record(self, task_name, kind, seconds):
+        with self._lock:
+            stats = self.timings.setdefault(task_name, {'setup': [], 'kickoff': []})
+            stats[kind].append(seconds)
+
+    def crew(self, agent_name, task_name, stop_at_fence=False):
+        crews = getattr(self._local, 'crews', None)
+        if crews is None:
+            crews = self._local.crews = {}
+        if (agent_name, task_name) not in crews:
+            start = time.perf_counter()
+            base = getattr(self._local, 'base', None)
+            if base is None:
+                base = self._local.base = AgenticTesting()
+            agent = getattr(base, agent_name)()
+            if self.stream and hasattr(agent.llm, 'stream'):
+                agent.llm.stream = True
+                if stop_at_fence and hasattr(agent.llm, 'stop'):
+                    agent.llm.stop = list(agent.llm.stop or []) + [CLOSING_FENCE_STOP]
+            crews[(agent_name, task_name)] = Crew(
+                agents=[agent],
+                tasks=[getattr(base, task_name)()],
+                process=Process.sequential,
+                verbose=True,
+            )
+            self._record(task_name, 'setup', time.perf_counter() - start)
+        return crews[(agent_name, task_name)]
+
+    def timed_kickoff(self, task_name, kickoff):
+        start = time.perf_counter()
+        try:
+            return kickoff()
+        finally:
+            self._record(task_name, 'kickoff', time.perf_counter() - start)
+
+    def report(self):
+        if not self.timings:
+            return
+        print("📊 Crew setup vs LLM latency per task:")
+        total_saved = 0.0
+        for task_name, stats in sorted(self.timings.items()):
+            setups, kickoffs = stats['setup'], stats['kickoff']
+            if not kickoffs:
+                continue
+            setup_avg = sum(setups) / len(setups) if setups else 0.0
+            kickoff_avg = sum(kickoffs) / len(kickoffs)
+            # Re-instantiating per call would have paid the setup cost on every kickoff
+            saved = setup_avg * max(len(kickoffs) - len(setups), 0)
+            total_saved += saved
+            print(f"  {task_name}: {len(kickoffs)} kickoffs, setup {setup_avg * 1000:.0f} ms x{len(setups)}, "
+                  f"avg kickoff {kickoff_avg:.2f}s, ~{saved:.2f}s setup avoided")
+        print(f"  Estimated setup time avoided by reusing crews: {total_saved:.2f}s")
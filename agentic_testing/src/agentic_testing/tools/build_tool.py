@@ -1,24 +1,195 @@
 from crewai.tools import BaseTool
-from typing import Type
+from typing import List, Optional, Type
 from pydantic import BaseModel, Field
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import signal
 import subprocess
+import threading
+import time
 import os
 
+# Seconds a build command may run before its whole process group is killed
+DEFAULT_BUILD_TIMEOUT = int(os.environ.get('BUILD_TOOL_TIMEOUT', '600'))
+# Lines of stdout/stderr kept (the tail) for the agent; earlier lines are only counted
+DEFAULT_TAIL_LINES = int(os.environ.get('BUILD_TOOL_TAIL_LINES', '200'))
+# 'on' echoes command output to the console as it arrives
+BUILD_TOOL_ECHO = os.environ.get('BUILD_TOOL_ECHO', 'off') == 'on'
+KILL_GRACE_SECONDS = 5
+BUILD_FILES = ('package.json', 'pom.xml', 'build.gradle', 'Makefile')
+# Never descended into when indexing the workspace
+PRUNE_DIRS = {'node_modules', '.git'}
+
 class BuildToolInput(BaseModel):
     project_path: str = Field(description="Path to the project directory")
     build_command: str = Field(description="Build command to run (e.g., 'npm install', 'mvn install')")
-    
-    
+    parallel_commands: Optional[List[str]] = Field(default=None, description="Optional extra commands to run concurrently with build_command in the same directory")
+    timeout: Optional[int] = Field(default=None, description="Optional timeout in seconds for each command")
+
+
+class OutputTail:
+    """Reads a process stream line by line, keeping only the last max_lines lines."""
+
+    def __init__(self, stream, max_lines, label=None):
+        self.lines = deque(maxlen=max_lines)
+        self.total = 0
+        self.label = label
+        self._thread = threading.Thread(target=self._read, args=(stream,), daemon=True)
+        self._thread.start()
+
+    def _read(self, stream):
+        for line in stream:
+            self.lines.append(line)
+            self.total += 1
+            if self.label:
+                print(f"{self.label} {line}", end='')
+        stream.close()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def text(self):
+        dropped = self.total - len(self.lines)
+        prefix = f"... ({dropped} earlier lines omitted)\n" if dropped > 0 else ""
+        return prefix + ''.join(self.lines)
+
+
+def kill_process_group(process):
+    """Terminate the command and everything it spawned, escalating to SIGKILL."""
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGTERM)
+        else:
+            process.terminate()
+        process.wait(KILL_GRACE_SECONDS)
+    except subprocess.TimeoutExpired:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+
+def run_command(command, cwd, timeout=DEFAULT_BUILD_TIMEOUT, tail_lines=DEFAULT_TAIL_LINES, echo=BUILD_TOOL_ECHO):
+    """
+    Run a shell command in cwd without changing the process working directory.
+    Output is streamed into bounded tails; on timeout the command's process group is killed.
+    """
+    start = time.monotonic()
+    popen_kwargs = {'start_new_session': True} if os.name == 'posix' else {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    process = subprocess.Popen(command, shell=True, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               stdin=subprocess.DEVNULL, text=True, errors='replace', **popen_kwargs)
+    stdout = OutputTail(process.stdout, tail_lines, '[stdout]' if echo else None)
+    stderr = OutputTail(process.stderr, tail_lines, '[stderr]' if echo else None)
+    timed_out = False
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        kill_process_group(process)
+    # Daemonized grandchildren may keep the pipes open; don't wait on them forever
+    stdout.join(KILL_GRACE_SECONDS)
+    stderr.join(KILL_GRACE_SECONDS)
+    return {
+        'command': command,
+        'returncode': process.returncode,
+        'timed_out': timed_out,
+        'elapsed': time.monotonic() - start,
+        'stdout': stdout.text(),
+        'stderr': stderr.text(),
+    }
+
+
+def format_result(result, project_path, timeout):
+    output = [f"Command: {result['command']}\n"]
+    output.append(f"Working Directory: {project_path}\n")
+    if result['timed_out']:
+        output.append(f"Timed Out: killed after {timeout}s\n")
+    output.append(f"Return Code: {result['returncode']}\n")
+    output.append(f"Duration: {result['elapsed']:.1f}s\n")
+    output.append(f"STDOUT:\n{result['stdout']}\n")
+    output.append(f"STDERR:\n{result['stderr']}\n")
+    return ''.join(output)
+
+
+class ProjectIndex:
+    """
+    Directories below root that contain a build file. Each directory's listing is cached
+    with its mtime, so a lookup only stats the indexed directories and rescans the ones
+    whose entries changed since the previous lookup.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        # directory -> (mtime_ns, has_build_file, subdirectories)
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.rescans = 0
+
+    def _scan(self, directory, mtime):
+        subdirs = []
+        has_build_file = False
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name in BUILD_FILES:
+                        has_build_file = True
+                    if entry.name not in PRUNE_DIRS and entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+        except OSError:
+            pass
+        self.rescans += 1
+        return mtime, has_build_file, sorted(subdirs)
+
+    def projects(self):
+        """Return the project directories below root (root itself excluded), depth first."""
+        with self._lock:
+            projects = []
+            seen = set()
+            stack = [self.root]
+            while stack:
+                directory = stack.pop()
+                try:
+                    mtime = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                entry = self._entries.get(directory)
+                if entry is None or entry[0] != mtime:
+                    entry = self._scan(directory, mtime)
+                    self._entries[directory] = entry
+                seen.add(directory)
+                if entry[1] and directory != self.root:
+                    projects.append(directory)
+                stack.extend(reversed(entry[2]))
+            # Forget directories that were removed or moved away
+            for directory in self._entries.keys() - seen:
+                del self._entries[directory]
+            return projects
+
+
+_project_indexes = {}
+
+def get_project_index(root):
+    """Shared ProjectIndex per root, kept for the lifetime of the process."""
+    if root not in _project_indexes:
+        _project_indexes[root] = ProjectIndex(root)
+    return _project_indexes[root]
+
 
 class BuildTool(BaseTool):
     name: str = "build_tool"
     description: str = "Run build commands and capture output"
     args_schema: Type[BaseModel] = BuildToolInput
+    timeout: int = DEFAULT_BUILD_TIMEOUT
+    tail_lines: int = DEFAULT_TAIL_LINES
     
     def cache_function(self, *args, **kwargs) -> bool:
         return False
     
-    def _run(self, project_path: str, build_command: str) -> str:
+    def _run(self, project_path: str, build_command: str, parallel_commands: Optional[List[str]] = None, timeout: Optional[int] = None) -> str:
         """Run a build command in the specified project directory"""
         try:
             print(f"BuildTool: Running '{build_command}' in '{project_path}'")
@@ -37,13 +208,7 @@ class BuildTool(BaseTool):
                 workspace_base = "workspace"
                 if os.path.exists(workspace_base):
                     # Look for the project in workspace subdirectories
-                    available_projects = []
-                    for root, dirs, files in os.walk(workspace_base):
-                        for dir_name in dirs:
-                            # Check if this directory contains build files
-                            dir_path = os.path.join(root, dir_name)
-                            if any(os.path.exists(os.path.join(dir_path, f)) for f in ['package.json', 'pom.xml', 'build.gradle', 'Makefile']):
-                                available_projects.append(dir_path)
+                    available_projects = get_project_index(workspace_base).projects()
                     
                     if available_projects:
                         error_msg = f"Error: Project path {project_path} does not exist. Available projects in workspace: {available_projects}"
@@ -56,29 +221,24 @@ class BuildTool(BaseTool):
                     print(f"BuildTool: {error_msg}")
                     return error_msg
             
-            # Store current directory to restore later
-            original_dir = os.getcwd()
+            timeout = timeout or self.timeout
+            commands = [build_command] + list(parallel_commands or [])
+            if len(commands) == 1:
+                results = [run_command(build_command, project_path, timeout, self.tail_lines)]
+            else:
+                with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+                    results = list(executor.map(lambda command: run_command(command, project_path, timeout, self.tail_lines), commands))
             
-            try:
-                # Change to project directory
-                os.chdir(project_path)
-                
-                # Run the build command
-                result = subprocess.run(build_command, shell=True, capture_output=True, text=True)
-                
-                output = f"Command: {build_command}\n"
-                output += f"Working Directory: {project_path}\n"
-                output += f"Return Code: {result.returncode}\n"
-                output += f"STDOUT:\n{result.stdout}\n"
-                output += f"STDERR:\n{result.stderr}\n"
-                
-                print(f"BuildTool: Command completed with return code {result.returncode}")
-                return output
-            finally:
-                # Restore original directory
-                os.chdir(original_dir)
+            for result in results:
+                status = "timed out" if result['timed_out'] else f"completed with return code {result['returncode']}"
+                print(f"BuildTool: '{result['command']}' {status} in {result['elapsed']:.1f}s")
+            return "\n".join(format_result(result, project_path, timeout) for result in results)
                 
         except Exception as e:
             error_msg = f"Error running build command: {str(e)}"
             print(f"BuildTool: {error_msg}")
-            return error_msg
\ No newline at end of file
+            return error_msg
+
+    async def _arun(self, project_path: str, build_command: str, parallel_commands: Optional[List[str]] = None, timeout: Optional[int] = None) -> str:
+        """Async variant: runs the commands in a worker thread so the event loop is not blocked."""
+        return await asyncio.to_thread(self._run, project_path, build_command, parallel_commands, timeout)
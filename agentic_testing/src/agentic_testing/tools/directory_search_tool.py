@@ -1,60 +1,175 @@
 from crewai.tools import BaseTool
 from typing import Type
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+import fnmatch
+import functools
 import glob
 import os
+import re
+
+EXCLUDE_DIRS = {"node_modules", ".git", ".venv", "venv", "__pycache__"}
+# Stop after this many matches so huge result lists don't flood the agent prompt
+DEFAULT_MAX_RESULTS = int(os.environ.get('DIRECTORY_SEARCH_MAX_RESULTS', '500'))
 
 class DirectorySearchInput(BaseModel):
     search_path: str = Field(..., description="Path pattern to search (e.g., 'features/**/*.feature', './*.py'). Supports recursive glob patterns like '**'.")
 
+def split_glob_pattern(pattern):
+    """Split a glob pattern into its literal base directory and the remaining pattern components."""
+    parts = pattern.replace(os.sep, '/').split('/')
+    base = []
+    for part in parts:
+        if glob.has_magic(part):
+            break
+        base.append(part)
+    rest = [p for p in parts[len(base):] if p]
+    base_path = '/'.join(base)
+    if pattern.startswith('/') and not base_path:
+        base_path = '/'
+    return base_path, rest
+
+@functools.lru_cache(maxsize=None)
+def _component_regex(component):
+    return re.compile(fnmatch.translate(component))
+
+def _component_matches(component, name):
+    # Like glob, wildcards never match hidden names unless the pattern starts with '.'
+    if name.startswith('.') and not component.startswith('.'):
+        return False
+    return _component_regex(component).match(name) is not None
+
+def _closure(states, parts):
+    """Add the states reached by letting '**' match zero directories."""
+    stack = list(states)
+    result = set(states)
+    while stack:
+        i = stack.pop()
+        if i < len(parts) and parts[i] == '**' and i + 1 not in result:
+            result.add(i + 1)
+            stack.append(i + 1)
+    return result
+
+def iter_glob(pattern, list_dir, exclude=EXCLUDE_DIRS):
+    """
+    Yield (path, is_dir) for every path matching the recursive glob pattern, like
+    glob.glob(pattern, recursive=True) but walking with list_dir(path) -> [(name, is_dir)]
+    and never descending into excluded directories or ones the pattern cannot match below.
+    Entries are visited in sorted order, so results stream deterministically.
+    As with glob, a trailing '/' matches directories only, each yielded with a trailing separator.
+    """
+    base, parts = split_glob_pattern(pattern)
+    dirs_only = pattern.replace(os.sep, '/').endswith('/')
+    if any(part in exclude for part in base.split('/')):
+        return
+    if not parts:
+        if base and os.path.lexists(base) and (not dirs_only or os.path.isdir(base)):
+            yield (os.path.join(base, '') if dirs_only and base != '/' else base), os.path.isdir(base)
+        return
+    root = base or os.curdir
+    if not os.path.isdir(root):
+        return
+    start = _closure({0}, parts)
+    if len(parts) in start and base:
+        # Trailing '**' also matches the base directory itself
+        yield os.path.join(base, ''), True
+    # Depth-first walk; each directory carries the set of pattern positions still to match
+    stack = [(root, base, start)]
+    while stack:
+        directory, prefix, states = stack.pop()
+        subdirs = []
+        for name, is_dir in list_dir(directory):
+            path = os.path.join(prefix, name) if prefix else name
+            if is_dir and name in exclude:
+                continue
+            matched = False
+            child_states = set()
+            for i in states:
+                if i >= len(parts):
+                    continue
+                component = parts[i]
+                if component == '**':
+                    if name.startswith('.'):
+                        continue
+                    if is_dir:
+                        child_states.add(i)
+                    if i == len(parts) - 1:
+                        matched = True
+                elif _component_matches(component, name):
+                    if i == len(parts) - 1:
+                        matched = True
+                    elif is_dir:
+                        child_states.add(i + 1)
+            if matched and (is_dir or not dirs_only):
+                yield (os.path.join(path, '') if dirs_only else path), is_dir
+            if is_dir and child_states:
+                subdirs.append((os.path.join(directory, name), path, _closure(child_states, parts)))
+        stack.extend(reversed(subdirs))
+
 class DirectorySearchTool(BaseTool):
     name: str = "directory_search_tool"
     description: str = "Search for files and directories using a glob pattern. Use '**' for recursive searches."
     args_schema: Type[BaseModel] = DirectorySearchInput
+    max_results: int = DEFAULT_MAX_RESULTS
+    # Directory listings reused across calls while the directory's mtime is unchanged
+    _listing_cache: dict = PrivateAttr(default_factory=dict)
+
+    def _list_dir(self, directory):
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+        cached = self._listing_cache.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            with os.scandir(directory) as entries:
+                listing = sorted((entry.name, entry.is_dir()) for entry in entries)
+        except OSError:
+            listing = []
+        self._listing_cache[directory] = (mtime, listing)
+        return listing
 
     def _run(self, search_path: str) -> str:
         """Search for files and directories using a glob pattern."""
         try:
             print(f"DirectorySearchTool: Searching with glob pattern '{search_path}'")
-            
-            results = glob.glob(search_path, recursive=True)
-            
-            exclude_list = ["node_modules", ".git", ".venv", "venv", "__pycache__"]
-            
-            filtered_results = [
-                p for p in results 
-                if not any(excluded in p.split(os.sep) for excluded in exclude_list)
-            ]
 
             found_files = []
             found_dirs = []
+            truncated = False
 
-            for path in filtered_results:
-                if os.path.isdir(path):
+            for path, is_dir in iter_glob(search_path, self._list_dir):
+                if len(found_files) + len(found_dirs) >= self.max_results:
+                    truncated = True
+                    break
+                if is_dir:
                     found_dirs.append(path)
                 else:
                     found_files.append(path)
 
-            output = f"Search Pattern: {search_path}\n"
-            
+            output = [f"Search Pattern: {search_path}\n"]
+
             if not found_files and not found_dirs:
-                output += "No files or directories found matching the pattern.\n"
+                output.append("No files or directories found matching the pattern.\n")
             else:
                 if found_dirs:
-                    output += f"Found directories ({len(found_dirs)}):\n"
+                    output.append(f"Found directories ({len(found_dirs)}):\n")
                     for dir_path in sorted(found_dirs):
-                        output += f"  - {dir_path}\n"
-                    output += "\n"
-                
+                        output.append(f"  - {dir_path}\n")
+                    output.append("\n")
+
                 if found_files:
-                    output += f"Found files ({len(found_files)}):\n"
+                    output.append(f"Found files ({len(found_files)}):\n")
                     for file_path in sorted(found_files):
-                        output += f"  - {file_path}\n"
-            
-            print(f"DirectorySearchTool: Found {len(found_files)} files and {len(found_dirs)} directories")
-            return output
-            
+                        output.append(f"  - {file_path}\n")
+            if truncated:
+                output.append(f"\nStopped after {self.max_results} results; use a more specific pattern to see the rest.\n")
+
+            print(f"DirectorySearchTool: Found {len(found_files)} files and {len(found_dirs)} directories"
+                  + (" (truncated)" if truncated else ""))
+            return ''.join(output)
+
         except Exception as e:
             error_msg = f"Error searching with glob: {str(e)}"
             print(f"DirectorySearchTool: {error_msg}")
-            return error_msg 
\ No newline at end of file
+            return error_msg
@@ -0,0 +1,92 @@
+"""
+WebDriver session pool used by the selenium_browser_pooled fixture in environment.py.
+
+Cold-starting Chrome for every UI scenario dominated short scenarios, so DriverPool keeps
+sessions warm and resets them between scenarios. Step 7 copies this file next to
+environment.py with the other support modules.
+"""
+import os
+
+from selenium.common.exceptions import WebDriverException
+
+# Reuse warm Chrome sessions across scenarios; DRIVER_POOL=off starts a new browser per scenario
+DRIVER_POOL = os.environ.get("DRIVER_POOL", "on") != "off"
+# Scenarios a pooled session serves before it is quit and replaced by a fresh one
+DRIVER_POOL_MAX_USES = int(os.environ.get("DRIVER_POOL_MAX_USES", "25"))
+# Implicit wait (seconds) set on new sessions and restored on every pooled session before reuse
+DEFAULT_IMPLICIT_WAIT = 5
+
+
+class DriverPool:
+    """
+    Keeps WebDriver sessions warm across scenarios instead of cold-starting Chrome for each.
+    A released session is reset (extra windows, cookies, storage, implicit wait, about:blank)
+    and handed to the next scenario; it is replaced after max_uses scenarios or when it stops
+    responding.
+    """
+
+    def __init__(self, factory, logger, max_uses=DRIVER_POOL_MAX_USES, max_idle=1, implicit_wait=DEFAULT_IMPLICIT_WAIT):
+        self.factory = factory
+        self.logger = logger
+        self.max_uses = max_uses
+        self.implicit_wait = implicit_wait
+        self.max_idle = max_idle
+        self._idle = []
+        self._uses = {}
+        self.stats = {"launches": 0, "hits": 0, "recycled": 0, "crashed": 0}
+
+    def acquire(self):
+        if self._idle:
+            self.stats["hits"] += 1
+            return self._idle.pop()
+        driver = self.factory()
+        self.stats["launches"] += 1
+        self._uses[id(driver)] = 0
+        return driver
+
+    def release(self, driver):
+        uses = self._uses.get(id(driver), 0) + 1
+        self._uses[id(driver)] = uses
+        if uses >= self.max_uses or len(self._idle) >= self.max_idle:
+            self.stats["recycled"] += 1
+            self._discard(driver)
+            return
+        try:
+            self._reset(driver)
+        except Exception as e:
+            # A dead browser also surfaces as urllib3/connection errors, not just WebDriverException
+            self.logger.warning(f"Discarding WebDriver session that failed to reset: {e.__class__.__name__}: {e}")
+            self.stats["crashed"] += 1
+            self._discard(driver)
+            return
+        self._idle.append(driver)
+
+    def _reset(self, driver):
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except (AttributeError, WebDriverException):
+            driver.delete_all_cookies()
+        driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+        # A scenario may have changed the timeout; the next one must not inherit it
+        driver.implicitly_wait(self.implicit_wait)
+        driver.get("about:blank")
+
+    def _discard(self, driver):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    def summary(self):
+        return (f"{self.stats['launches']} launches, {self.stats['hits']} reused sessions, "
+                f"{self.stats['recycled']} recycled, {self.stats['crashed']} discarded after errors")
@@ -0,0 +1,155 @@
+"""
+Single-wait element resolution over several candidate locators.
+
+Step code used to try fallback locators one at a time, each under its own
+WebDriverWait(..., 10), so a missing primary locator cost ten seconds (plus the implicit
+wait) before the fallback was even tried. resolve() polls every candidate together: each
+poll is one execute_script probe that checks the candidates in order and returns the first
+matching element. The winning locator is remembered per candidate set and tried first on
+later lookups. Step 7 copies this file next to environment.py with locator_registry.py.
+"""
+import time
+
+from selenium.common.exceptions import JavascriptException, StaleElementReferenceException, TimeoutException
+
+from locator_registry import get_registry
+
+DEFAULT_TIMEOUT = 10
+POLL_SECONDS = 0.1
+CONDITIONS = ("present", "visible", "clickable")
+
+# arguments: [[by, selector], ...], condition, collect_all
+# Returns [index, element] for the first candidate (in order) with an element meeting the
+# condition, or with collect_all every such element; locating by 'link text' etc. mirrors
+# Selenium's strategies so compiled (By, selector) tuples can be passed through unchanged.
+PROBE_SCRIPT = """
+const candidates = arguments[0], condition = arguments[1], collectAll = arguments[2];
+function locate(by, selector) {
+    switch (by) {
+        case 'css selector': return Array.from(document.querySelectorAll(selector));
+        case 'id': return Array.from(document.querySelectorAll('[id="' + CSS.escape(selector) + '"]'));
+        case 'name': return Array.from(document.getElementsByName(selector));
+        case 'class name': return Array.from(document.getElementsByClassName(selector));
+        case 'tag name': return Array.from(document.getElementsByTagName(selector));
+        case 'link text': return Array.from(document.querySelectorAll('a')).filter(a => a.textContent.trim() === selector);
+        case 'partial link text': return Array.from(document.querySelectorAll('a')).filter(a => a.textContent.includes(selector));
+        case 'xpath': {
+            const found = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            const nodes = [];
+            for (let i = 0; i < found.snapshotLength; i++) nodes.push(found.snapshotItem(i));
+            return nodes;
+        }
+    }
+    return [];
+}
+function meets(element) {
+    if (condition === 'present') return true;
+    const style = window.getComputedStyle(element);
+    const visible = element.getClientRects().length > 0 && style.visibility !== 'hidden' && style.visibility !== 'collapse';
+    return condition === 'clickable' ? visible && !element.disabled : visible;
+}
+const all = [];
+for (let i = 0; i < candidates.length; i++) {
+    let elements;
+    try {
+        elements = locate(candidates[i][0], candidates[i][1]);
+    } catch (e) {
+        continue;  // invalid selector for this candidate
+    }
+    for (const element of elements) {
+        if (!meets(element)) continue;
+        if (!collectAll) return [i, element];
+        if (!all.includes(element)) all.push(element);
+    }
+}
+return collectAll ? all : null;
+"""
+
+
+class ElementResolver:
+    """
+    Resolves locator keys or (By, selector) tuples with one poll loop shared by all of them.
+    """
+
+    def __init__(self, registry=None, timeout=DEFAULT_TIMEOUT, poll=POLL_SECONDS):
+        self.registry = registry
+        self.timeout = timeout
+        self.poll = poll
+        # candidate set -> locator that matched last time
+        self._winners = {}
+        self.stats = {"lookups": 0, "probes": 0, "first_candidate": 0, "fallback": 0, "timeouts": 0}
+
+    def expand(self, candidates):
+        """Locator keys become their ranked registry candidates; tuples are kept as given."""
+        registry = self.registry or get_registry()
+        locators = []
+        for candidate in candidates:
+            options = registry.candidates(candidate) if isinstance(candidate, str) else [tuple(candidate)]
+            for locator in options:
+                if locator not in locators:
+                    locators.append(locator)
+        return tuple(locators)
+
+    def _probe(self, driver, locators, condition, collect_all):
+        self.stats["probes"] += 1
+        try:
+            return driver.execute_script(PROBE_SCRIPT, [list(locator) for locator in locators], condition, collect_all)
+        except (JavascriptException, StaleElementReferenceException):
+            # The page was navigating or re-rendering under the probe; try again next poll
+            return [] if collect_all else None
+
+    def resolve(self, driver, *candidates, condition="visible", timeout=None):
+        """
+        Wait until any candidate has an element meeting condition ('present', 'visible' or
+        'clickable') and return it; candidates are preferred in the order given, except that
+        the locator that won the previous lookup of the same candidates is tried first.
+        Raises TimeoutException when none matches within timeout seconds.
+        """
+        if condition not in CONDITIONS:
+            raise ValueError(f"Unknown condition '{condition}', expected one of {CONDITIONS}")
+        locators = self.expand(candidates)
+        if not locators:
+            raise KeyError(f"No locators found for {', '.join(map(str, candidates))}")
+        winner = self._winners.get(locators)
+        ordered = (winner,) + tuple(locator for locator in locators if locator != winner) if winner else locators
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        self.stats["lookups"] += 1
+        while True:
+            result = self._probe(driver, ordered, condition, False)
+            if result:
+                index, element = result
+                self._winners[locators] = ordered[index]
+                self.stats["first_candidate" if ordered[index] == locators[0] else "fallback"] += 1
+                return element
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll)
+        self.stats["timeouts"] += 1
+        raise TimeoutException(f"None of {', '.join(map(str, candidates))} {list(locators)} was {condition} after {timeout}s")
+
+    def resolve_all(self, driver, *candidates, condition="visible"):
+        """Every element currently meeting condition for any candidate, in one probe and without waiting."""
+        locators = self.expand(candidates)
+        if not locators:
+            return []
+        return self._probe(driver, locators, condition, True) or []
+
+    def winners(self):
+        return {", ".join(f"{by}={selector}" for by, selector in locators): f"{winner[0]}={winner[1]}"
+                for locators, winner in self._winners.items()}
+
+
+_resolver = None
+
+
+def get_resolver():
+    """The process-wide resolver, so winning locators are shared by every step module."""
+    global _resolver
+    if _resolver is None:
+        _resolver = ElementResolver()
+    return _resolver
+
+
+def resolve_element(driver, *candidates, condition="visible", timeout=None):
+    return get_resolver().resolve(driver, *candidates, condition=condition, timeout=timeout)
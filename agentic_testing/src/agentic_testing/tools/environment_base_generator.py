@@ -1,5 +1,25 @@
+import shutil
 from pathlib import Path
 
+TOOLS_DIR = Path(__file__).resolve().parent
+# Runtime helpers imported by environment.py and the step modules, copied next to environment.py
+SUPPORT_MODULES = ("locator_registry.py", "element_resolver.py", "validation_guard.py", "stream_report.py", "step_profiler.py",
+                   "driver_pool.py")
+
+def install_support_modules(features_dir):
+    """
+    Copy the support modules into the features directory (behave puts it on sys.path),
+    replacing older copies so every run uses the current version.
+    """
+    Path(features_dir).mkdir(parents=True, exist_ok=True)
+    for name in SUPPORT_MODULES:
+        source = TOOLS_DIR / name
+        target = Path(features_dir) / name
+        if target.is_file() and target.read_bytes() == source.read_bytes():
+            continue
+        shutil.copyfile(source, target)
+        print(f"✅ Installed {name} at {target}")
+
 def generate_base_environment_file(output_path):
     """
     Generate a robust base environment.py file for Behave/Selenium automation.
@@ -21,6 +41,12 @@ from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 import responses
 
+from locator_registry import LOCATORS_PATH, get_registry
+from element_resolver import get_resolver
+from validation_guard import get_validation_guard
+from step_profiler import STEP_PROFILE, format_summary, get_profiler
+from driver_pool import DEFAULT_IMPLICIT_WAIT, DRIVER_POOL, DriverPool
+
 # --- Locator strategy mapping ---
 def map_locator_strategy(by, value):
     """
@@ -75,51 +101,24 @@ def get_by_strategy(by_value):
     else:
         raise ValueError(f"Unknown locator strategy in locators file: {by_value}")
 
-def load_locators(logger) -> dict:
-    locators_path = Path("features/meta_data/locators_babel.json")
+def load_locators(logger):
+    """
+    Compiled LocatorRegistry for features/meta_data/locators_babel.json; the step modules
+    share the same instance through locator_registry.get_registry().
+    """
+    locators_path = Path(LOCATORS_PATH)
     if not locators_path.is_file():
         logger.warning(f"Locators file {locators_path} not found.")
-        return {}
-    try:
-        with locators_path.open() as f:
-            locs = json.load(f)
-        logger.info(f"Loaded {len(locs)} locators.")
-        result = {}
-        for item in locs:
-            key = item.get('key')
-            if not key:
-                continue
-            if key in result:
-                if isinstance(result[key], list):
-                    result[key].append(item)
-                else:
-                    result[key] = [result[key], item]
-            else:
-                result[key] = item
-        return result
-    except Exception as e:
-        logger.error(f"Failed to load locators: {e}")
-        return {}
+    registry = get_registry()
+    logger.info(f"Loaded {len(registry)} locator keys ({registry.skipped} unsupported entries skipped).")
+    return registry
 
 def get_locator(context, key):
-    locators = context.locators.get(key)
-    if not locators:
+    try:
+        return context.locator_registry.locator(key)
+    except KeyError:
         context.logger.warning(f"Locator key '{key}' not found in locators.")
-        return None
-    if not isinstance(locators, list):
-        locators = [locators]
-    for locator in locators:
-        by_raw = locator.get("by")
-        selector = locator.get("selector")
-        if not by_raw or not selector:
-            continue
-        try:
-            by = get_by_strategy(by_raw)
-            return (by, selector)
-        except ValueError:
-            continue  # skip unsupported strategies
-    context.logger.error(f"No valid locator found for key '{key}'.")
-    return None
+        raise
 
 # Patch context after loading locators in before_all
 def patch_context_with_get_locator(context):
@@ -149,18 +148,34 @@ class MockRequestHandler(http.server.BaseHTTPRequestHandler):
     def log_message(self, format, *args):
         pass
 
-@fixture
-def selenium_browser_chrome(context):
+def create_chrome_driver(logger):
     options = Options()
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--disable-dev-shm-usage")
+    driver = webdriver.Chrome(options=options)
+    driver.implicitly_wait(DEFAULT_IMPLICIT_WAIT)
+    # Validation stays disabled in every page of the session; before_step no longer re-sends it
+    get_validation_guard(logger).install(driver)
+    logger.info("Chrome WebDriver initialized.")
+    return driver
 
+@fixture
+def selenium_browser_pooled(context):
     try:
-        driver = webdriver.Chrome(options=options)
-        driver.implicitly_wait(5)
-        context.logger.info("Chrome WebDriver initialized.")
+        driver = context.driver_pool.acquire()
+    except WebDriverException as e:
+        context.logger.error(f"Error initializing Chrome WebDriver: {e}")
+        raise
+    context.driver = driver
+    yield driver
+    context.driver_pool.release(driver)
+
+@fixture
+def selenium_browser_chrome(context):
+    try:
+        driver = create_chrome_driver(context.logger)
         context.driver = driver
         yield driver
     except WebDriverException as e:
@@ -203,7 +218,9 @@ def before_all(context):
     for d in [logs_dir, screenshots_dir, reports_dir]:
         d.mkdir(parents=True, exist_ok=True)
 
-    log_file = logs_dir / "test_execution.log"
+    # Parallel runs (parallel_behave) give every worker process its own log file
+    worker_id = os.environ.get("BEHAVE_WORKER_ID")
+    log_file = logs_dir / (f"test_execution_worker{worker_id}.log" if worker_id else "test_execution.log")
     logger = logging.getLogger("behave_test")
     logger.setLevel(logging.DEBUG)
     fh = logging.FileHandler(str(log_file))
@@ -216,38 +233,31 @@ def before_all(context):
     context.screenshots_dir = str(screenshots_dir)
     context.logger.info("=== Test execution started ===")
     context.base_url = "http://localhost:3000"
-    context.locators = load_locators(context.logger)
+    context.locator_registry = load_locators(context.logger)
+    context.locators = context.locator_registry.raw
+    context.element_resolver = get_resolver()
+    context.validation_guard = get_validation_guard(logger)
+    context.profiler = get_profiler() if STEP_PROFILE else None
     context.db_stub = None  # placeholder for db stub
+    context.driver_pool = DriverPool(lambda: create_chrome_driver(logger), logger) if DRIVER_POOL else None
     patch_context_with_get_locator(context)
 
 def before_step(context, step):
     if getattr(context, 'driver', None):
-        disable_validation_js = """
-            HTMLFormElement.prototype.reportValidity = function() { return true; };
-            HTMLElement.prototype.setCustomValidity = function() {};
-            HTMLInputElement.prototype.checkValidity = function() { return true; };
-            Object.defineProperty(HTMLInputElement.prototype, 'required', { get: function() { return false; } });
-            Object.defineProperty(HTMLInputElement.prototype, 'validationMessage', { get: function() { return ''; } });
-            Object.defineProperty(HTMLInputElement.prototype, 'validity', { get: function() { return { valid: true }; } });
-            document.querySelectorAll('form').forEach(f => f.noValidate = true);
-            if (!window._mutationObserverSetup) {
-                const observer = new MutationObserver(() => {
-                    document.querySelectorAll('form').forEach(f => f.noValidate = true);
-                });
-                observer.observe(document.body, { childList: true, subtree: true });
-                window._mutationObserverSetup = true;
-            }
-        """
-        try:
-            context.driver.execute_script(disable_validation_js)
-            context.logger.info("Injected JS to disable browser validation and attached MutationObserver before step.")
-        except Exception as e:
-            context.logger.warning(f"Failed to inject validation-disabling JS before step: {e}")
+        context.validation_guard.before_step(context.driver)
+    if context.profiler:
+        if getattr(context, 'driver', None):
+            context.profiler.instrument(context.driver)
+        context.profiler.begin_step(step)
+
+def after_step(context, step):
+    if context.profiler:
+        context.profiler.end_step(step, context.scenario)
 
 def before_scenario(context, scenario):
     tags = set(scenario.tags)
     if tags.intersection({'ui', 'visual', 'ux'}):
-        use_fixture(selenium_browser_chrome, context)
+        use_fixture(selenium_browser_pooled if context.driver_pool else selenium_browser_chrome, context)
     else:
         context.driver = None
     if tags.intersection({'api', 'service', 'integration'}):
@@ -264,14 +274,32 @@ def after_scenario(context, scenario):
         screenshot_path = Path(context.screenshots_dir) / f"{scenario.name.replace(' ', '_')}.png"
         context.driver.save_screenshot(str(screenshot_path))
         context.logger.info(f"Saved screenshot to {screenshot_path}")
-    if getattr(context, "driver", None):
+    # Pooled sessions are reset and returned to the pool by the fixture cleanup
+    if getattr(context, "driver", None) and not context.driver_pool:
         context.driver.quit()
-        context.driver = None
+    context.driver = None
     if getattr(context, "mock_api", None):
         context.mock_api.stop()
         context.mock_api.reset()
         context.mock_api = None
     context.db_stub = None
+
+def after_all(context):
+    if context.driver_pool:
+        context.driver_pool.close()
+        context.logger.info(f"WebDriver pool: {context.driver_pool.summary()}")
+    context.logger.info(f"Locator registry: {context.locator_registry.stats()}")
+    context.logger.info(f"Validation guard: {context.validation_guard.summary()}")
+    context.logger.info(f"Element resolver: {context.element_resolver.stats} winners={context.element_resolver.winners()}")
+    if context.profiler:
+        profile = context.profiler.report()
+        worker_id = os.environ.get("BEHAVE_WORKER_ID")
+        profile_path = Path("features/reports") / (f"step_profile_worker{worker_id}.json" if worker_id else "step_profile.json")
+        profile_path.parent.mkdir(parents=True, exist_ok=True)
+        profile_path.write_text(json.dumps(profile, indent=2), encoding="utf-8")
+        # behave captures stdout in hooks, so the summary goes through the logger's console handler
+        context.logger.info("\\n" + format_summary(profile))
+        context.logger.info(f"Step profile written to {profile_path}")
 '''
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, "w", encoding="utf-8") as f:
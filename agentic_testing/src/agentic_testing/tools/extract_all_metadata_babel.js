@@ -1,8 +1,9 @@
 // extract_all_metadata-babel.js
-// Run with: node extract_all_metadata-babel.js
+// Run with: node extract_all_metadata-babel.js [--no-cache]
 
 const fs = require('fs');
 const path = require('path');
+const crypto = require('crypto');
 const glob = require('glob');
 const parser = require('@babel/parser');
 const traverse = require('@babel/traverse').default;
@@ -15,6 +16,8 @@ const OUT_MESSAGES = path.join(OUT_DIR, 'extracted_messages_babel.json');
 const OUT_LOCATORS = path.join(OUT_DIR, 'locators_babel.json');
 const OUT_ENDPOINTS = path.join(OUT_DIR, 'endpoints_babel.json');
 const OUT_UI = path.join(OUT_DIR, 'ui_endpoints_babel.json');
+// Sidecar cache of per-file extraction results, validated by content hash
+const CACHE_FILE = path.join(OUT_DIR, '.babel_extract_cache.json');
 
 const API_PREFIXES = process.env.API_PREFIXES ? process.env.API_PREFIXES.split(',') : ['/api/', '/auth/', '/v1/', '/v2/'];
 const FILE_EXTENSIONS = ['.js', '.jsx', '.ts', '.tsx'];
@@ -23,8 +26,7 @@ function isApiUrl(url) {
   return API_PREFIXES.some(prefix => url.startsWith(prefix));
 }
 
-function parseFile(filePath) {
-  const code = fs.readFileSync(filePath, 'utf8');
+function parseFile(filePath, code = fs.readFileSync(filePath, 'utf8')) {
   let ast;
   try {
     ast = parser.parse(code, {
@@ -313,10 +315,9 @@ function dedupe(arr, keyFn) {
   });
 }
 
-function main() {
-  if (!fs.existsSync(OUT_DIR)) fs.mkdirSync(OUT_DIR, { recursive: true });
+function collectSourceFiles() {
   // Exclude test and __tests__ folders from glob
-  const files = glob.sync(`${SRC_DIR}/**/*.{js,jsx,ts,tsx}`, {
+  return glob.sync(`${SRC_DIR}/**/*.{js,jsx,ts,tsx}`, {
     ignore: [
       `${SRC_DIR}/test/**/*`,
       `${SRC_DIR}/**/test/**/*`,
@@ -324,26 +325,100 @@ function main() {
       `${SRC_DIR}/**/__tests__/**/*`,
     ]
   });
-  let allMessages = [], allLocators = [], allEndpoints = [], allUI = [];
+}
+
+function extractFile(file, code) {
+  const ast = parseFile(file, code);
+  if (!ast) return null;
+  return extractFromAst(ast, file);
+}
+
+function hashContent(content) {
+  return crypto.createHash('sha1').update(content).digest('hex');
+}
+
+// Cached results are only valid for the extractor code and API prefixes that produced them
+function extractorVersion() {
+  return hashContent(fs.readFileSync(__filename, 'utf8') + '\n' + API_PREFIXES.join(','));
+}
+
+function loadCache() {
+  try {
+    const cache = JSON.parse(fs.readFileSync(CACHE_FILE, 'utf8'));
+    if (cache.version === extractorVersion()) return new Map(Object.entries(cache.files));
+  } catch (e) {
+    if (e.code !== 'ENOENT') console.warn(`Ignoring unreadable extraction cache ${CACHE_FILE}: ${e.message}`);
+  }
+  return new Map();
+}
+
+function saveCache(entries) {
+  if (!fs.existsSync(OUT_DIR)) fs.mkdirSync(OUT_DIR, { recursive: true });
+  const tmpFile = `${CACHE_FILE}.tmp`;
+  fs.writeFileSync(tmpFile, JSON.stringify({ version: extractorVersion(), files: Object.fromEntries(entries) }));
+  fs.renameSync(tmpFile, CACHE_FILE);
+}
+
+// Extract every file, reusing the cached result of files whose content hash is unchanged.
+// Returns the per-file results in file order and the new cache entries (deleted files dropped).
+function extractFilesCached(files, cache) {
+  const entries = new Map();
+  const results = [];
+  let parsed = 0, skipped = 0;
   for (const file of files) {
-    const ast = parseFile(file);
-    if (!ast) continue;
-    const { messages, locators, endpoints, uiRoutes } = extractFromAst(ast, file);
-    allMessages.push(...messages);
-    allLocators.push(...locators);
-    allEndpoints.push(...endpoints);
-    allUI.push(...uiRoutes);
+    const code = fs.readFileSync(file, 'utf8');
+    const hash = hashContent(code);
+    let entry = cache.get(file);
+    if (entry && entry.hash === hash) {
+      skipped++;
+    } else {
+      entry = { hash, result: extractFile(file, code) };
+      parsed++;
+    }
+    entries.set(file, entry);
+    results.push(entry.result);
+  }
+  return { results, entries, parsed, skipped };
+}
+
+// Merge per-file results (in file order) into the deduplicated output lists
+function mergeResults(results) {
+  let allMessages = [], allLocators = [], allEndpoints = [], allUI = [];
+  for (const result of results) {
+    if (!result) continue;
+    allMessages.push(...result.messages);
+    allLocators.push(...result.locators);
+    allEndpoints.push(...result.endpoints);
+    allUI.push(...result.uiRoutes);
   }
   // Deduplicate
   allMessages = dedupe(allMessages, m => `${m.message}|${m.type}`);
   allLocators = dedupe(allLocators, l => `${l.key}|${l.strategy}|${l.by}|${l.selector}|${l.value}`);
   allEndpoints = dedupe(allEndpoints, e => `${e.method}|${e.path}`);
   allUI = dedupe(allUI, u => u.path);
-  // Write
-  fs.writeFileSync(OUT_LOCATORS, JSON.stringify(allLocators.map(l => ({ key: l.key, strategy: l.strategy, by: l.by, selector: l.selector, value: l.value })), null, 2));
-  fs.writeFileSync(OUT_ENDPOINTS, JSON.stringify(allEndpoints.map(e => ({ method: e.method, path: e.path })), null, 2));
-  fs.writeFileSync(OUT_UI, JSON.stringify(allUI.map(u => ({ path: u.path })), null, 2));
-  console.log(`(Babel) Extracted ${allLocators.length} locators, ${allEndpoints.length} endpoints, ${allUI.length} UI routes. (Messages are extracted by Python.)`);
+  return { messages: allMessages, locators: allLocators, endpoints: allEndpoints, uiRoutes: allUI };
 }
 
-main(); 
\ No newline at end of file
+function writeOutputs({ locators, endpoints, uiRoutes }) {
+  if (!fs.existsSync(OUT_DIR)) fs.mkdirSync(OUT_DIR, { recursive: true });
+  fs.writeFileSync(OUT_LOCATORS, JSON.stringify(locators.map(l => ({ key: l.key, strategy: l.strategy, by: l.by, selector: l.selector, value: l.value })), null, 2));
+  fs.writeFileSync(OUT_ENDPOINTS, JSON.stringify(endpoints.map(e => ({ method: e.method, path: e.path })), null, 2));
+  fs.writeFileSync(OUT_UI, JSON.stringify(uiRoutes.map(u => ({ path: u.path })), null, 2));
+  console.log(`(Babel) Extracted ${locators.length} locators, ${endpoints.length} endpoints, ${uiRoutes.length} UI routes. (Messages are extracted by Python.)`);
+}
+
+function main() {
+  const start = Date.now();
+  const useCache = !process.argv.includes('--no-cache') && process.env.BABEL_EXTRACT_CACHE !== 'off';
+  const files = collectSourceFiles();
+  const { results, entries, parsed, skipped } = extractFilesCached(files, useCache ? loadCache() : new Map());
+  writeOutputs(mergeResults(results));
+  if (useCache) saveCache(entries);
+  console.log(`(Babel) ${parsed} files parsed, ${skipped} unchanged files reused from cache in ${Date.now() - start} ms`);
+}
+
+module.exports = { SRC_DIR, OUT_DIR, collectSourceFiles, extractFile, extractFilesCached, loadCache, saveCache, mergeResults, writeOutputs };
+
+if (require.main === module) {
+  main();
+}
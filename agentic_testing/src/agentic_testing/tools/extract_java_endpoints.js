@@ -1,97 +1,120 @@
 // extract_java_endpoints.js
-// Run with: node extract_java_endpoints.js
+// Run with: node extract_java_endpoints.js [--benchmark [--synthetic N]]
 
 const fs = require('fs');
+const os = require('os');
 const path = require('path');
 const glob = require('glob');
+const { Worker, isMainThread, parentPort, workerData } = require('worker_threads');
 
 // Get the project root directory (4 levels up from this file)
 const projectRoot = path.resolve(__dirname, '../../../..');
 const BACKEND_DIR = path.join(projectRoot, 'testing_automation/backend/src/main/java');
 const OUT_DIR = path.join(projectRoot, 'features', 'meta_data');
 const OUT_ENDPOINTS = path.join(OUT_DIR, 'endpoints_babel.json');
+const JAVA_EXTRACT_WORKERS = parseInt(process.env.JAVA_EXTRACT_WORKERS || String(os.cpus().length), 10);
+// Below this many files starting worker threads costs more than it saves
+const PARALLEL_MIN_FILES = 200;
 
-function extractEndpointsFromJavaFile(filePath) {
-  const content = fs.readFileSync(filePath, 'utf8');
-  const endpoints = [];
-  
-  // Split content into lines for easier processing
-  const lines = content.split('\n');
+// Cheap pre-filter: only controllers declare request mappings we care about
+const CONTROLLER_PATTERN = /@(?:Rest)?Controller\b/;
+// Class-level @RequestMapping and method-level @*Mapping annotations in one pattern
+const MAPPING_PATTERN = /@(RequestMapping|GetMapping|PostMapping|PutMapping|DeleteMapping|PatchMapping)\s*\(\s*["']([^"']+)["']/g;
+const MAPPING_METHODS = {
+  GetMapping: 'GET',
+  PostMapping: 'POST',
+  PutMapping: 'PUT',
+  DeleteMapping: 'DELETE',
+  PatchMapping: 'PATCH',
+};
+
+function extractEndpointsFromJavaSource(content, filePath) {
+  if (!CONTROLLER_PATTERN.test(content)) return [];
   
   let classRequestMapping = '';
-  
-  // First pass: find class-level @RequestMapping
-  for (let i = 0; i < lines.length; i++) {
-    const line = lines[i];
-    const classRequestMappingMatch = line.match(/@RequestMapping\s*\(\s*["']([^"']+)["']/);
-    if (classRequestMappingMatch) {
-      classRequestMapping = classRequestMappingMatch[1];
-      break;
+  const methodMappings = [];
+  let line = 1;
+  let lineCountedTo = 0;
+  
+  // Single pass over the file; the first @RequestMapping is the class-level prefix
+  for (const match of content.matchAll(MAPPING_PATTERN)) {
+    for (let i = content.indexOf('\n', lineCountedTo); i !== -1 && i < match.index; i = content.indexOf('\n', i + 1)) {
+      line++;
+    }
+    lineCountedTo = match.index;
+    if (match[1] === 'RequestMapping') {
+      if (!classRequestMapping) classRequestMapping = match[2];
+    } else {
+      methodMappings.push({ method: MAPPING_METHODS[match[1]], path: match[2], line });
     }
   }
   
-  // Second pass: find method-level annotations
-  for (let i = 0; i < lines.length; i++) {
-    const line = lines[i];
-    
-    // Method-level annotations
-    const methodPatterns = [
-      { pattern: /@GetMapping\s*\(\s*["']([^"']+)["']/, method: 'GET' },
-      { pattern: /@PostMapping\s*\(\s*["']([^"']+)["']/, method: 'POST' },
-      { pattern: /@PutMapping\s*\(\s*["']([^"']+)["']/, method: 'PUT' },
-      { pattern: /@DeleteMapping\s*\(\s*["']([^"']+)["']/, method: 'DELETE' },
-      { pattern: /@PatchMapping\s*\(\s*["']([^"']+)["']/, method: 'PATCH' },
-    ];
+  return methodMappings.map(({ method, path: methodPath, line }) => {
+    let endpointPath = methodPath;
     
-    for (const { pattern, method } of methodPatterns) {
-      const match = line.match(pattern);
-      if (match) {
-        let endpointPath = match[1];
-        
-        // Combine with class-level @RequestMapping if it exists
-        if (classRequestMapping) {
-          // Ensure proper path joining (avoid double slashes)
-          if (endpointPath.startsWith('/')) {
-            endpointPath = classRequestMapping + endpointPath;
-          } else {
-            endpointPath = classRequestMapping + '/' + endpointPath;
-          }
-        }
-        
-        endpoints.push({
-          method: method,
-          path: endpointPath,
-          file: filePath,
-          line: i + 1,
-          type: 'java-backend'
-        });
+    // Combine with class-level @RequestMapping if it exists
+    if (classRequestMapping) {
+      // Ensure proper path joining (avoid double slashes)
+      if (endpointPath.startsWith('/')) {
+        endpointPath = classRequestMapping + endpointPath;
+      } else {
+        endpointPath = classRequestMapping + '/' + endpointPath;
       }
     }
-  }
-  
-  return endpoints;
+    
+    return {
+      method: method,
+      path: endpointPath,
+      file: filePath,
+      line: line,
+      type: 'java-backend'
+    };
+  });
 }
 
-function main() {
-  if (!fs.existsSync(OUT_DIR)) {
-    fs.mkdirSync(OUT_DIR, { recursive: true });
-  }
-  
-  // Find all Java files in the backend
-  const javaFiles = glob.sync(`${BACKEND_DIR}/**/*.java`);
-  
-  let allEndpoints = [];
-  
-  for (const file of javaFiles) {
+function extractEndpointsFromJavaFile(filePath) {
+  return extractEndpointsFromJavaSource(fs.readFileSync(filePath, 'utf8'), filePath);
+}
+
+// Extract a list of files, returning { file, endpoints } or { file, error } per file in order
+function extractFiles(files) {
+  return files.map(file => {
     try {
-      const endpoints = extractEndpointsFromJavaFile(file);
-      allEndpoints.push(...endpoints);
-      console.log(`Processed ${file}: found ${endpoints.length} endpoints`);
+      return { file, endpoints: extractEndpointsFromJavaFile(file) };
     } catch (error) {
-      console.warn(`Error processing ${file}: ${error.message}`);
+      return { file, error: error.message };
     }
+  });
+}
+
+// Split files into contiguous chunks and extract each chunk on its own worker thread
+function extractFilesParallel(files, workers = JAVA_EXTRACT_WORKERS) {
+  if (workers <= 1 || files.length < PARALLEL_MIN_FILES) {
+    return Promise.resolve(extractFiles(files));
   }
-  
+  const chunkSize = Math.ceil(files.length / workers);
+  const chunks = [];
+  for (let i = 0; i < files.length; i += chunkSize) {
+    chunks.push(files.slice(i, i + chunkSize));
+  }
+  return Promise.all(chunks.map(chunk => new Promise((resolve, reject) => {
+    const worker = new Worker(__filename, { workerData: { files: chunk } });
+    worker.once('message', resolve);
+    worker.once('error', reject);
+  }))).then(results => results.flat());
+}
+
+function collectJavaFiles() {
+  // Find all Java files in the backend
+  return glob.sync(`${BACKEND_DIR}/**/*.java`);
+}
+
+// Append the Java endpoints not yet listed to endpoints_babel.json (written by the Babel extractor)
+function mergeJavaEndpoints(allEndpoints) {
+  if (!fs.existsSync(OUT_DIR)) {
+    fs.mkdirSync(OUT_DIR, { recursive: true });
+  }
+
   // Read existing endpoints from endpoints_babel.json
   let existingEndpoints = [];
   if (fs.existsSync(OUT_ENDPOINTS)) {
@@ -131,6 +154,28 @@ function main() {
   
   // Write combined endpoints back to the same file
   fs.writeFileSync(OUT_ENDPOINTS, JSON.stringify(combinedEndpoints, null, 2));
+  return combinedEndpoints;
+}
+
+async function main() {
+  const javaFiles = collectJavaFiles();
+  
+  let allEndpoints = [];
+  let skipped = 0;
+  
+  for (const { file, endpoints, error } of await extractFilesParallel(javaFiles)) {
+    if (error) {
+      console.warn(`Error processing ${file}: ${error}`);
+    } else if (endpoints.length) {
+      allEndpoints.push(...endpoints);
+      console.log(`Processed ${file}: found ${endpoints.length} endpoints`);
+    } else {
+      skipped++;
+    }
+  }
+  if (skipped) console.log(`Skipped ${skipped} files without endpoints (non-controllers)`);
+  
+  const combinedEndpoints = mergeJavaEndpoints(allEndpoints);
   
   console.log(`\nExtracted ${allEndpoints.length} new Java backend endpoints:`);
   allEndpoints.forEach(endpoint => {
@@ -141,4 +186,67 @@ function main() {
   console.log(`Results appended to: ${OUT_ENDPOINTS}`);
 }
 
-main(); 
\ No newline at end of file
+// Write count synthetic Java files (one in five a controller) under dir
+function generateSyntheticTree(dir, count) {
+  for (let i = 0; i < count; i++) {
+    const pkgDir = path.join(dir, `pkg${i % 50}`);
+    fs.mkdirSync(pkgDir, { recursive: true });
+    const body = [];
+    for (let j = 0; j < 60; j++) body.push(`    private String field${j} = "value${j}"; // filler line ${j}`);
+    let source;
+    if (i % 5 === 0) {
+      const methods = [];
+      for (let j = 0; j < 8; j++) {
+        const verb = ['Get', 'Post', 'Put', 'Delete', 'Patch'][j % 5];
+        methods.push(`    @${verb}Mapping("/item${j}")\n    public ResponseEntity<?> handle${j}() { return null; }`);
+      }
+      source = `@RestController\n@RequestMapping("/api/resource${i}")\npublic class Resource${i}Controller {\n${body.join('\n')}\n${methods.join('\n')}\n}\n`;
+    } else {
+      source = `@Service\npublic class Service${i} {\n${body.join('\n')}\n}\n`;
+    }
+    fs.writeFileSync(path.join(pkgDir, `Class${i}.java`), source);
+  }
+}
+
+// Time serial vs worker-thread extraction and print files/sec; outputs are not written
+async function benchmark(args) {
+  const syntheticIndex = args.indexOf('--synthetic');
+  let files;
+  let tmpDir = null;
+  if (syntheticIndex !== -1) {
+    const count = parseInt(args[syntheticIndex + 1] || '5000', 10);
+    tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'java-extract-bench-'));
+    generateSyntheticTree(tmpDir, count);
+    files = glob.sync(`${tmpDir}/**/*.java`);
+  } else {
+    files = collectJavaFiles();
+  }
+  try {
+    console.log(`Benchmarking ${files.length} Java files with ${JAVA_EXTRACT_WORKERS} workers`);
+    const runs = [
+      ['serial', () => Promise.resolve(extractFiles(files))],
+      ['worker threads', () => extractFilesParallel(files, JAVA_EXTRACT_WORKERS)],
+    ];
+    for (const [label, run] of runs) {
+      const start = process.hrtime.bigint();
+      const results = await run();
+      const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+      const endpoints = results.reduce((sum, r) => sum + (r.endpoints ? r.endpoints.length : 0), 0);
+      console.log(`  ${label.padEnd(15)} ${seconds.toFixed(3)}s  ${Math.round(files.length / seconds)} files/sec  (${endpoints} endpoints)`);
+    }
+  } finally {
+    if (tmpDir) fs.rmSync(tmpDir, { recursive: true, force: true });
+  }
+}
+
+module.exports = { BACKEND_DIR, collectJavaFiles, extractEndpointsFromJavaFile, extractEndpointsFromJavaSource, extractFilesParallel, mergeJavaEndpoints };
+
+if (!isMainThread) {
+  parentPort.postMessage(extractFiles(workerData.files));
+} else if (require.main === module) {
+  const args = process.argv.slice(2);
+  (args.includes('--benchmark') ? benchmark(args) : main()).catch(error => {
+    console.error(error);
+    process.exit(1);
+  });
+}
@@ -0,0 +1,148 @@
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+FENCE = '```'
+# Stop sequence for the generation LLMs: a fence on its own line closes the code block, while
+# the opening fence is followed by the language name, so generation ends right after the code
+CLOSING_FENCE_STOP = '\n' + FENCE + '\n'
+
+# LLM instance -> writer; crewAI emits stream chunks with the LLM as the event source
+_writers = {}
+_writers_lock = threading.Lock()
+_handler_lock = threading.Lock()
+_handler_registered = False
+
+
+def extract_fenced_code(text, language):
+    """
+    The stripped body of the first ```<language> block in text, or None. The closing fence
+    may be missing when generation was cut off by CLOSING_FENCE_STOP.
+    """
+    match = re.search(FENCE + re.escape(language) + r'\s*([\s\S]+?)(?:' + FENCE + r'|\Z)', text)
+    return match.group(1).strip() if match else None
+
+
+class FencedCodeStreamWriter:
+    """
+    Incrementally extracts the first ```<language> fenced block from streamed LLM tokens.
+
+    Code is written to '<target_path>.partial' as it arrives and the file is moved onto
+    target_path as soon as the closing fence is seen (or, when CLOSING_FENCE_STOP ended the
+    generation before the fence, when the kickoff returns); later tokens are ignored.
+    The written content matches what extract_fenced_code returns for the full response.
+    """
+
+    def __init__(self, target_path, language):
+        self.target_path = target_path
+        self.opening = FENCE + language
+        self.partial_path = f"{target_path}.partial"
+        self.state = 'before'
+        self.pending = ''
+        self.started = False
+        self._file = None
+
+    @property
+    def done(self):
+        return self.state == 'done'
+
+    def feed(self, chunk):
+        if self.state == 'done' or not chunk:
+            return
+        self.pending += chunk
+        if self.state == 'before':
+            idx = self.pending.find(self.opening)
+            if idx == -1:
+                # Keep just enough text to recognise an opening fence split across chunks
+                self.pending = self.pending[-len(self.opening):]
+                return
+            self.pending = self.pending[idx + len(self.opening):]
+            self.state = 'inside'
+            os.makedirs(os.path.dirname(self.target_path) or '.', exist_ok=True)
+            self._file = open(self.partial_path, 'w', encoding='utf-8')
+        idx = self.pending.find(FENCE)
+        if idx != -1:
+            self._write(self.pending[:idx].rstrip())
+            self.pending = ''
+            self._finish()
+            return
+        # Hold back a possible partial closing fence and trailing whitespace (stripped at the end)
+        safe = self.pending[:len(self.pending) - (len(FENCE) - 1)].rstrip()
+        self._write(safe)
+        self.pending = self.pending[len(safe):]
+
+    def _write(self, text):
+        if not self.started:
+            text = text.lstrip()
+            if not text:
+                return
+            self.started = True
+        self._file.write(text)
+        self._file.flush()
+
+    def _finish(self):
+        self._file.close()
+        self._file = None
+        os.replace(self.partial_path, self.target_path)
+        self.state = 'done'
+        print(f"✅ Streamed fenced code to {self.target_path}")
+
+    def complete(self):
+        """The stream ended normally; a block cut off by the stop sequence is finished as is."""
+        if self.state == 'inside':
+            self._write(self.pending.rstrip())
+            self.pending = ''
+            self._finish()
+
+    def close(self):
+        """Discard an unfinished stream; the caller falls back to the full kickoff result."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if os.path.exists(self.partial_path):
+                os.remove(self.partial_path)
+
+
+def _on_stream_chunk(source, event):
+    with _writers_lock:
+        writer = _writers.get(id(source))
+    if writer is not None:
+        writer.feed(getattr(event, 'chunk', '') or '')
+
+
+def _register_handler():
+    global _handler_registered
+    with _handler_lock:
+        if _handler_registered:
+            return
+        try:
+            from crewai.events import crewai_event_bus, LLMStreamChunkEvent
+        except ImportError:
+            from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+        crewai_event_bus.on(LLMStreamChunkEvent)(_on_stream_chunk)
+        _handler_registered = True
+
+
+@contextmanager
+def stream_fenced_code(target_path, language, llm):
+    """
+    Route the stream chunks of llm (the generating agent's LLM) into a FencedCodeStreamWriter.
+
+    Writers are keyed by the LLM instance that emits the chunks rather than by thread, so the
+    routing holds whichever thread the event bus runs its handlers on; concurrent pipeline
+    jobs use their own agents (see PipelineContext) and each stream into their own file.
+    """
+    _register_handler()
+    writer = FencedCodeStreamWriter(target_path, language)
+    with _writers_lock:
+        if id(llm) in _writers:
+            raise RuntimeError(f"LLM {llm!r} is already streaming into {_writers[id(llm)].target_path}")
+        _writers[id(llm)] = writer
+    try:
+        yield writer
+        writer.complete()
+    finally:
+        with _writers_lock:
+            _writers.pop(id(llm), None)
+        writer.close()
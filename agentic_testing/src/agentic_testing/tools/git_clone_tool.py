@@ -1,33 +1,116 @@
 import os
+import re
 import shutil
-from git import Repo, GitCommandError
+from git import Repo, GitCommandError, InvalidGitRepositoryError, NoSuchPathError
 
 DEFAULT_GITHUB_REPO = "https://github.com/dhruvraj-techsur/testing_automation.git"
 DEFAULT_GITHUB_BRANCH = "full_stack_E2E_code"
+# 'update' reuses an existing checkout (fetch + hard reset), 'clone' always deletes and re-clones
+GIT_FETCH_MODE = os.environ.get('GIT_FETCH_MODE', 'update')
+# History depth to fetch; 0 fetches the full history
+GIT_CLONE_DEPTH = int(os.environ.get('GIT_CLONE_DEPTH', '1'))
+# Directories checked out (sparse cone); 'none' checks out the whole tree
+GIT_SPARSE_PATHS = os.environ.get('GIT_SPARSE_PATHS', 'src,backend/src/main/java')
 
-def clone_repo(repo_url=DEFAULT_GITHUB_REPO, branch=DEFAULT_GITHUB_BRANCH, github_token=None):
+def parse_sparse_paths(value):
+    if not value or value.lower() == 'none':
+        return []
+    return [p.strip().strip('/') for p in value.split(',') if p.strip()]
+
+def strip_credentials(url):
+    return re.sub(r'^(\w+://)[^@/]+@', r'\1', url)
+
+def open_existing_checkout(target_path, repo_url):
+    """Return the Repo at target_path if it is a checkout of repo_url, else None."""
+    try:
+        repo = Repo(target_path)
+        origin_url = repo.remotes.origin.url
+    except (InvalidGitRepositoryError, NoSuchPathError, AttributeError, ValueError):
+        return None
+    if strip_credentials(origin_url) != strip_credentials(repo_url):
+        return None
+    return repo
+
+def apply_sparse_checkout(repo, sparse_paths):
+    if sparse_paths:
+        repo.git.sparse_checkout('set', '--cone', *sparse_paths)
+    else:
+        # Harmless when the checkout is not sparse
+        repo.git.sparse_checkout('disable')
+
+def update_checkout(repo, repo_url, branch, depth, sparse_paths):
+    """Fetch branch into an existing checkout and hard-reset the working tree to it."""
+    fetch_args = ['origin', branch]
+    fetch_kwargs = {}
+    if depth:
+        fetch_kwargs['depth'] = depth
+    if sparse_paths:
+        fetch_kwargs['filter'] = 'blob:none'
+    # The token may have changed since the checkout was made
+    repo.remotes.origin.set_url(repo_url)
+    repo.git.fetch(*fetch_args, **fetch_kwargs)
+    apply_sparse_checkout(repo, sparse_paths)
+    repo.git.checkout('-f', '-B', branch, 'FETCH_HEAD')
+    # Untracked files from earlier runs; ignored files such as node_modules are kept
+    repo.git.clean('-ffd')
+
+def clone_fresh(repo_url, branch, target_path, depth, sparse_paths):
+    clone_kwargs = {'branch': branch, 'single_branch': True}
+    if depth:
+        clone_kwargs['depth'] = depth
+    if sparse_paths:
+        clone_kwargs['filter'] = 'blob:none'
+        clone_kwargs['no_checkout'] = True
+    repo = Repo.clone_from(repo_url, target_path, **clone_kwargs)
+    if sparse_paths:
+        apply_sparse_checkout(repo, sparse_paths)
+        repo.git.checkout(branch)
+    return repo
+
+def clone_repo(repo_url=DEFAULT_GITHUB_REPO, branch=DEFAULT_GITHUB_BRANCH, github_token=None,
+               mode=GIT_FETCH_MODE, depth=GIT_CLONE_DEPTH, sparse_paths=GIT_SPARSE_PATHS, project_root=None):
     """
-    Clone a GitHub repo/branch into a folder named after the repo in the project root.
-    If the folder exists, it will be deleted first.
+    Fetch a GitHub repo/branch into a folder named after the repo in the project root.
+    In 'update' mode an existing checkout of the same repo is fetched and hard-reset to the
+    branch head; otherwise (or when that fails) the folder is deleted and cloned again.
+    depth limits the fetched history and sparse_paths limits the checked-out directories.
     If a GitHub token is provided (or set in the GITHUB_TOKEN env var), it will be used for authentication.
     """
     if github_token is None:
         github_token = os.environ.get("GITHUB_TOKEN")
     if github_token:
         repo_url = repo_url.replace("https://", f"https://{github_token}@")
+    if isinstance(sparse_paths, str):
+        sparse_paths = parse_sparse_paths(sparse_paths)
 
     # Always clone into the project root
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
+    if project_root is None:
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
     repo_name = os.path.splitext(os.path.basename(repo_url.split('@')[-1].rstrip('/')))[0]
     target_path = os.path.join(project_root, repo_name)
+
+    if mode == 'update' and os.path.exists(target_path):
+        repo = open_existing_checkout(target_path, repo_url)
+        if repo is not None:
+            print(f"Updating existing checkout {target_path} (branch: {branch}) ...")
+            try:
+                update_checkout(repo, repo_url, branch, depth, sparse_paths)
+                print(f"✅ Code updated to {repo.head.commit.hexsha[:10]} in {target_path}")
+                return target_path
+            except GitCommandError as e:
+                print(f"⚠️  Update failed, cloning again: {e}")
+        else:
+            print(f"Existing folder {target_path} is not a checkout of {strip_credentials(repo_url)}")
+
     if os.path.exists(target_path):
         print(f"Deleting existing folder: {target_path}")
         shutil.rmtree(target_path)
 
-    print(f"Cloning {repo_url} (branch: {branch}) into {target_path} ...")
+    print(f"Cloning {strip_credentials(repo_url)} (branch: {branch}) into {target_path} ...")
     try:
-        Repo.clone_from(repo_url, target_path, branch=branch, single_branch=True)
+        clone_fresh(repo_url, branch, target_path, depth, sparse_paths)
     except GitCommandError as e:
         print(f"Error during git clone: {e}")
         raise
-    print(f"✅ Code fetched and saved to {target_path}") 
\ No newline at end of file
+    print(f"✅ Code fetched and saved to {target_path}")
+    return target_path
@@ -1,89 +1,254 @@
 import os
+import json
+import time
+import hashlib
+import threading
+import email.utils
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 import re
 from dotenv import load_dotenv
 
-def get_jira_session(jira_url, username, api_token):
+# Only the fields read by is_epic/extract_story_content, plus 'updated' for the sync state
+JIRA_FIELDS = 'summary,description,issuetype,updated'
+JIRA_PAGE_SIZE = int(os.environ.get('JIRA_PAGE_SIZE', '100'))
+# Tickets/epics fetched at once; also the size of the session's connection pool
+JIRA_MAX_WORKERS = max(1, int(os.environ.get('JIRA_MAX_WORKERS', '4')))
+JIRA_MAX_RETRIES = int(os.environ.get('JIRA_MAX_RETRIES', '5'))
+JIRA_TIMEOUT = float(os.environ.get('JIRA_TIMEOUT', '30'))
+# 'incremental' only asks JIRA for epic children updated since the last sync, 'full' fetches them all
+JIRA_SYNC_MODE = os.environ.get('JIRA_SYNC', 'incremental')
+# JQL dates are minute-precision and in the JIRA user's timezone, so look back this far past the last sync
+JIRA_SYNC_OVERLAP_MINUTES = int(os.environ.get('JIRA_SYNC_OVERLAP_MINUTES', '1440'))
+# An epic gets a full sync after this many incremental ones (0 disables the forced full sync)
+JIRA_FULL_SYNC_EVERY = int(os.environ.get('JIRA_FULL_SYNC_EVERY', '10'))
+
+def get_jira_session(jira_url, username, api_token, pool_size=JIRA_MAX_WORKERS):
     session = requests.Session()
     session.auth = HTTPBasicAuth(username, api_token)
     session.headers.update({
         'Accept': 'application/json',
         'Content-Type': 'application/json'
     })
+    # Keep-alive connections shared by every request (and worker thread) using this session
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
     return session
 
-def fetch_ticket(session, jira_url, ticket_key):
-    url = f"{jira_url.rstrip('/')}/rest/api/3/issue/{ticket_key}"
-    try:
-        response = session.get(url)
+def retry_after_seconds(response, attempt):
+    """Seconds to wait before retrying a 429/503: the Retry-After header, else exponential backoff."""
+    value = response.headers.get('Retry-After')
+    if value:
+        if value.strip().isdigit():
+            return int(value)
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return min(2 ** attempt, 60)
+
+def jira_get(session, url, params=None, max_retries=JIRA_MAX_RETRIES):
+    for attempt in range(max_retries + 1):
+        response = session.get(url, params=params, timeout=JIRA_TIMEOUT)
+        if response.status_code in (429, 503) and attempt < max_retries:
+            delay = retry_after_seconds(response, attempt)
+            print(f"⏳ JIRA rate limited ({response.status_code}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
         response.raise_for_status()
         return response.json()
+
+def fetch_ticket(session, jira_url, ticket_key, fields=JIRA_FIELDS):
+    url = f"{jira_url.rstrip('/')}/rest/api/3/issue/{ticket_key}"
+    try:
+        return jira_get(session, url, params={'fields': fields})
     except requests.exceptions.RequestException as e:
         print(f"❌ Error fetching ticket {ticket_key}: {e}")
         return None
 
-def fetch_epic_children(session, jira_url, epic_key):
-    jql_patterns = [
-        f'"Epic Link" = {epic_key}',
-        f'parent = {epic_key}',
-        f'issue in linkedIssues({epic_key})',
-        f'issue in subtasksOf({epic_key})'
-    ]
+def search_issues(session, jira_url, jql, fields=JIRA_FIELDS, page_size=JIRA_PAGE_SIZE):
+    """
+    Return every issue matching jql, following startAt/total pagination
+    (or nextPageToken when the server pages that way).
+    """
     url = f"{jira_url.rstrip('/')}/rest/api/3/search"
+    issues = []
+    params = {'jql': jql, 'maxResults': page_size, 'fields': fields, 'startAt': 0}
+    while True:
+        data = jira_get(session, url, params=params)
+        page = data.get('issues', [])
+        issues.extend(page)
+        if data.get('nextPageToken'):
+            params = {'jql': jql, 'maxResults': page_size, 'fields': fields, 'nextPageToken': data['nextPageToken']}
+            continue
+        total = data.get('total', 0)
+        if not page or data.get('isLast') or len(issues) >= total:
+            return issues
+        params['startAt'] = len(issues)
+
+def find_epic_children(session, jira_url, epic_key, jql_patterns=None, updated_since=None):
+    """
+    Return (issues, jql) for the first JQL pattern that finds children of the epic.
+    With updated_since (a JQL date string) only children updated since then are returned.
+    """
+    if jql_patterns is None:
+        jql_patterns = [
+            f'"Epic Link" = {epic_key}',
+            f'parent = {epic_key}',
+            f'issue in linkedIssues({epic_key})',
+            f'issue in subtasksOf({epic_key})'
+        ]
     for jql in jql_patterns:
-        params = {
-            'jql': jql,
-            'maxResults': 100,
-            'fields': 'summary,description,issuetype,status,priority,assignee,reporter'
-        }
+        query = f'({jql}) AND updated >= "{updated_since}"' if updated_since else jql
         try:
-            response = session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            issues = data.get('issues', [])
-            if issues:
-                print(f"   Found {len(issues)} child tickets using JQL: {jql}")
-                return issues
+            issues = search_issues(session, jira_url, query)
+            if issues or updated_since:
+                print(f"   Found {len(issues)} child tickets using JQL: {query}")
+                return issues, jql
         except requests.exceptions.RequestException as e:
-            print(f"   JQL '{jql}' failed: {e}")
+            print(f"   JQL '{query}' failed: {e}")
             continue
     print(f"   No child tickets found with any JQL pattern")
-    return []
+    return [], None
+
+def fetch_epic_member_keys(session, jira_url, jql):
+    """Keys of every issue currently matching the epic's children JQL (a key-only query)."""
+    return [issue.get('key') for issue in search_issues(session, jira_url, jql, fields='key')]
+
+def fetch_epic_children(session, jira_url, epic_key):
+    return find_epic_children(session, jira_url, epic_key)[0]
 
 def is_epic(ticket_data):
     issue_type = ticket_data.get('fields', {}).get('issuetype', {})
     return issue_type.get('name', '').lower() == 'epic'
 
-def extract_text_from_adf(adf):
-    def _rec(node, depth=0):
-        text = ""
-        if isinstance(node, list):
-            for n in node:
-                text += _rec(n, depth)
-            return text
-        t = node.get('type')
-        if t == 'text':
-            return node.get('text', '')
-        if t == 'paragraph':
-            return _rec(node.get('content', []), depth) + "\n"
-        if t == 'heading':
-            return _rec(node.get('content', []), depth) + "\n"
-        if t in ('bulletList', 'orderedList'):
-            s = ""
-            for item in node.get('content', []):
-                s += _rec(item, depth + 1)
-            return s
-        if t == 'listItem':
-            inner = _rec(node.get('content', []), depth).strip()
-            if depth == 1:
-                return "• " + inner + "\n"
+def iter_adf_text(adf):
+    """
+    Render an ADF node (or list of nodes) to plain text, yielding chunks as they are produced.
+
+    Iterative, so arbitrarily deep documents cannot hit the recursion limit. A list item's
+    text is stripped as it streams: leading whitespace is dropped until its first visible
+    character and trailing whitespace is held back until more text follows, so nothing is
+    re-copied per nesting level. Only table cells are buffered (their whitespace is collapsed).
+    """
+    # Entries are nodes (dict), node lists, literal text (str) or actions (tuple)
+    stack = [adf]
+    depth = 0
+    pending = ''    # trailing whitespace not yet yielded
+    unstarted = 0   # innermost open list items that have not produced visible text yet
+    cells = []      # text buffers of the table cells being rendered
+    rows = []       # (open cell count, [(cell_text, is_header)]) of the table rows being rendered
+    while stack:
+        entry = stack.pop()
+        entry_type = type(entry)
+        if entry_type is dict:
+            t = entry.get('type')
+            if t == 'text':
+                text = entry.get('text', '')
+            elif t in ('paragraph', 'heading'):
+                stack.append("\n")
+                stack.append(entry.get('content', []))
+                continue
+            elif t in ('bulletList', 'orderedList'):
+                depth += 1
+                stack.append(('dedent',))
+                stack.append(entry.get('content', []))
+                continue
+            elif t == 'listItem':
+                stack.append(('close_item', bool(cells)))
+                stack.append(entry.get('content', []))
+                stack.append(('open_item', bool(cells)))
+                text = "• " if depth == 1 else "  " * (depth - 1) + "– "
+            elif t == 'hardBreak':
+                text = "\n"
+            elif t in ('mention', 'emoji'):
+                attrs = entry.get('attrs') or {}
+                text = attrs.get('text') or attrs.get('shortName', '')
+            elif t == 'codeBlock':
+                attrs = entry.get('attrs') or {}
+                text = "```" + (attrs.get('language') or '') + "\n"
+                stack.append("\n```\n")
+                stack.append(entry.get('content', []))
+            elif t == 'panel':
+                attrs = entry.get('attrs') or {}
+                text = "[" + (attrs.get('panelType') or 'info').capitalize() + "]\n"
+                stack.append(entry.get('content', []))
+            elif t == 'tableRow':
+                rows.append((len(cells), []))
+                stack.append(('close_row',))
+                stack.append(entry.get('content', []))
+                continue
+            elif t in ('tableCell', 'tableHeader'):
+                cells.append([])
+                stack.append(('close_cell', t == 'tableHeader'))
+                stack.append(entry.get('content', []))
+                continue
+            elif 'content' in entry:
+                stack.append(entry['content'])
+                continue
             else:
-                return "  " * (depth-1) + "– " + inner + "\n"
-        if 'content' in node:
-            return _rec(node['content'], depth)
-        return ""
-    return _rec(adf)
+                continue
+        elif entry_type is str:
+            text = entry
+        elif entry_type is list:
+            stack.extend(reversed(entry))
+            continue
+        elif entry_type is tuple:
+            action = entry[0]
+            if action == 'dedent':
+                depth -= 1
+                continue
+            if action == 'open_item':
+                if not entry[1]:
+                    unstarted += 1
+                continue
+            if action == 'close_item':
+                if not entry[1]:
+                    if unstarted:
+                        # Empty item: keep the whitespace that followed its bullet
+                        unstarted -= 1
+                    else:
+                        pending = ''
+                text = "\n"
+            elif action == 'close_cell':
+                cell = ' '.join(''.join(cells.pop()).split())
+                if rows and rows[-1][0] == len(cells):
+                    rows[-1][1].append((cell, entry[1]))
+                    continue
+                # Cell outside a table row
+                text = cell + "\n"
+            else:  # close_row
+                row = rows.pop()[1]
+                text = "| " + " | ".join(cell for cell, _ in row) + " |\n"
+                if row and all(is_header for _, is_header in row):
+                    text += "|" + " --- |" * len(row) + "\n"
+        else:
+            continue
+
+        if not text:
+            continue
+        if cells:
+            cells[-1].append(text)
+            continue
+        if unstarted:
+            text = text.lstrip()
+            if not text:
+                continue
+            unstarted = 0
+        text = pending + text
+        body = text.rstrip()
+        pending = text[len(body):]
+        if body:
+            yield body
+    if pending:
+        yield pending
+
+def extract_text_from_adf(adf):
+    return ''.join(iter_adf_text(adf))
 
 def extract_story_content(ticket_data):
     fields = ticket_data.get('fields', {})
@@ -114,27 +279,159 @@ def sanitize_filename(filename):
     sanitized = re.sub(r'\s+', ' ', sanitized).strip()
     return sanitized[:100]
 
-def save_story(story_content, filename, folder=None):
+def default_story_folder():
+    # Get the absolute path to the project root
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
+    return os.path.join(project_root, 'user_stories')
+
+def hash_story(story_content):
+    return hashlib.sha256(story_content.encode('utf-8')).hexdigest()
+
+def write_story(story_content, filename, folder=None):
+    """
+    Write the story file only when its content changed, so unchanged stories keep their mtime.
+    Returns (file_path, status) with status 'added', 'updated' or 'unchanged' (file_path is None on error).
+    """
     # Always use 'user_stories' in the project root
     if folder is None:
-        # Get the absolute path to the project root
-        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
-        folder = os.path.join(project_root, 'user_stories')
+        folder = default_story_folder()
     os.makedirs(folder, exist_ok=True)
     safe_filename = sanitize_filename(filename)
     file_path = os.path.join(folder, f"{safe_filename}.txt")
+    status = 'added'
+    if os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            if f.read() == story_content:
+                print(f"⏭️  Unchanged: {file_path}")
+                return file_path, 'unchanged'
+        status = 'updated'
     try:
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(story_content)
         print(f"✅ Saved: {file_path}")
-        return file_path
+        return file_path, status
     except Exception as e:
         print(f"❌ Error saving {file_path}: {e}")
-        return None
+        return None, None
+
+def save_story(story_content, filename, folder=None):
+    return write_story(story_content, filename, folder)[0]
+
+class JiraSyncState:
+    """
+    Per-issue 'updated' timestamp and story content hash from previous syncs, plus the JQL
+    that found each epic's children and when the epic was last synced.
+
+    Stored as .jira_sync.json next to the story files.
+    """
+
+    def __init__(self, folder=None, mode=JIRA_SYNC_MODE, full_sync_every=JIRA_FULL_SYNC_EVERY):
+        self.folder = folder or default_story_folder()
+        self.path = os.path.join(self.folder, '.jira_sync.json')
+        self.mode = mode
+        self.full_sync_every = full_sync_every
+        self.counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+        self._lock = threading.Lock()
+        self.issues, self.epics = self._load()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                return data.get('issues', {}), data.get('epics', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable JIRA sync state {self.path}: {e}")
+        return {}, {}
+
+    def save(self):
+        with self._lock:
+            os.makedirs(self.folder, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'issues': self.issues, 'epics': self.epics}, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+    def updated_since(self, epic_key):
+        """JQL date to filter the epic's children by, or None when a full fetch is needed."""
+        epic = self.epics.get(epic_key)
+        if self.mode != 'incremental' or not epic:
+            return None
+        if self.full_sync_every and epic.get('incremental_runs', 0) >= self.full_sync_every:
+            return None
+        # Stories deleted locally must be fetched again
+        for key in epic.get('children', []):
+            entry = self.issues.get(key)
+            if not entry or not os.path.exists(entry['file']):
+                return None
+        since = datetime.fromisoformat(epic['last_sync']) - timedelta(minutes=JIRA_SYNC_OVERLAP_MINUTES)
+        return since.strftime('%Y-%m-%d %H:%M')
+
+    def sync_issue(self, issue, filename):
+        """Write the issue's story file if its content changed and record it in the state."""
+        key = issue.get('key', 'unknown')
+        story_content = extract_story_content(issue)
+        content_hash = hash_story(story_content)
+        entry = self.issues.get(key)
+        if entry and entry['hash'] == content_hash and os.path.exists(entry['file']):
+            file_path, status = entry['file'], 'unchanged'
+        else:
+            file_path, status = write_story(story_content, filename, self.folder)
+            if file_path is None:
+                return None
+        with self._lock:
+            self.counts[status] += 1
+            self.issues[key] = {
+                'updated': issue.get('fields', {}).get('updated'),
+                'hash': content_hash,
+                'file': file_path,
+            }
+        return file_path
 
-def process_jira_ticket(jira_url, username, api_token, ticket_key):
+    def unknown_children(self, epic_key, member_keys, children):
+        """Current members of the epic that are neither known from the last sync nor in children."""
+        known = set(self.epics.get(epic_key, {}).get('children', [])) | {child.get('key') for child in children}
+        return [key for key in member_keys if key not in known]
+
+    def record_epic(self, epic_key, jql, children, started_at, incremental, member_keys=None):
+        """
+        Record the epic's sync; returns the story files of known children JIRA did not return.
+        In an incremental sync, member_keys (the epic's current children) drops known children
+        that were removed from the epic or moved to another one.
+        """
+        with self._lock:
+            epic = self.epics.get(epic_key, {})
+            previous = epic.get('children', []) if incremental else []
+            returned = [child.get('key') for child in children]
+            if member_keys is not None:
+                members = set(member_keys)
+                removed = [key for key in previous if key not in members and key not in returned]
+                if removed:
+                    print(f"   {len(removed)} child tickets are no longer in {epic_key}: {', '.join(removed)}")
+                self.counts['removed'] += len(removed)
+                previous = [key for key in previous if key not in removed]
+            # Known children JIRA did not return in an incremental query are unchanged
+            not_returned = [key for key in previous if key not in returned]
+            self.counts['unchanged'] += len(not_returned)
+            self.epics[epic_key] = {
+                'jql': jql,
+                'last_sync': started_at.isoformat(),
+                'children': not_returned + returned,
+                'incremental_runs': epic.get('incremental_runs', 0) + 1 if incremental else 0,
+            }
+            return [self.issues[key]['file'] for key in not_returned if key in self.issues]
+
+    def report(self):
+        print(f"📊 JIRA sync: {self.counts['added']} added, {self.counts['updated']} updated, "
+              f"{self.counts['unchanged']} unchanged, {self.counts['removed']} removed from epics")
+
+def process_jira_ticket(jira_url, username, api_token, ticket_key, session=None, folder=None, sync_state=None):
     print(f"🔍 Fetching ticket: {ticket_key}")
-    session = get_jira_session(jira_url, username, api_token)
+    if session is None:
+        session = get_jira_session(jira_url, username, api_token)
+    if sync_state is None:
+        sync_state = JiraSyncState(folder, mode='full')
+    started_at = datetime.now(timezone.utc)
     ticket_data = fetch_ticket(session, jira_url, ticket_key)
     if not ticket_data:
         return []
@@ -142,27 +439,64 @@ def process_jira_ticket(jira_url, username, api_token, ticket_key):
     if is_epic(ticket_data):
         print(f"📋 Detected epic: {ticket_key}")
         print(f"   Epics are containers - fetching child tickets for actual user stories...")
-        children = fetch_epic_children(session, jira_url, ticket_key)
+        updated_since = sync_state.updated_since(ticket_key)
+        member_keys = None
+        if updated_since:
+            recorded_jql = sync_state.epics[ticket_key]['jql']
+            children, jql = find_epic_children(session, jira_url, ticket_key, [recorded_jql], updated_since)
+            try:
+                if jql is not None:
+                    # Children removed from or moved into the epic are not always 'updated' since the last sync
+                    member_keys = fetch_epic_member_keys(session, jira_url, recorded_jql)
+                    unknown = sync_state.unknown_children(ticket_key, member_keys, children)
+                    if unknown:
+                        print(f"   Fetching {len(unknown)} child tickets added to the epic since the last sync")
+                        children += search_issues(session, jira_url, f'key in ({", ".join(unknown)})')
+            except requests.exceptions.RequestException as e:
+                print(f"   Could not reconcile the children of {ticket_key} ({e})")
+                jql = None
+            if jql is None:
+                print(f"   Running a full sync of {ticket_key}")
+                updated_since, member_keys = None, None
+                children, jql = find_epic_children(session, jira_url, ticket_key)
+        else:
+            children, jql = find_epic_children(session, jira_url, ticket_key)
         print(f"📦 Found {len(children)} child tickets (user stories)")
         for child in children:
-            child_content = extract_story_content(child)
             child_key = child.get('key', 'unknown')
             child_filename = f"{child_key}_story"
-            child_file = save_story(child_content, child_filename)
+            child_file = sync_state.sync_issue(child, child_filename)
             if child_file:
                 saved_files.append(child_file)
+        if jql:
+            saved_files.extend(sync_state.record_epic(ticket_key, jql, children, started_at,
+                                                      incremental=bool(updated_since), member_keys=member_keys))
     else:
         print(f"📝 Processing regular ticket: {ticket_key}")
-        story_content = extract_story_content(ticket_data)
         filename = f"{ticket_key}_story"
-        file_path = save_story(story_content, filename)
+        file_path = sync_state.sync_issue(ticket_data, filename)
         if file_path:
             saved_files.append(file_path)
     return saved_files
 
+def process_jira_tickets(jira_url, username, api_token, ticket_keys, max_workers=JIRA_MAX_WORKERS, folder=None, sync_state=None):
+    """
+    Fetch several tickets/epics concurrently over one pooled session.
+    Returns the saved file paths in ticket_keys order.
+    """
+    session = get_jira_session(jira_url, username, api_token, pool_size=max_workers)
+    if sync_state is None:
+        sync_state = JiraSyncState(folder)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(ticket_keys)) or 1) as executor:
+        results = executor.map(lambda key: process_jira_ticket(jira_url, username, api_token, key, session, folder, sync_state), ticket_keys)
+        saved_files = [path for saved in results for path in saved]
+    sync_state.save()
+    sync_state.report()
+    return saved_files
+
 def fetch_and_save_jira_stories():
     """
-    Fetch JIRA stories for the ticket/epic specified in .env and save them as .txt files.
+    Fetch JIRA stories for the ticket(s)/epic(s) specified in .env and save them as .txt files.
     Returns a list of saved file paths.
     """
     load_dotenv()
@@ -176,13 +510,14 @@ def fetch_and_save_jira_stories():
         print("  JIRA_URL=https://your-domain.atlassian.net")
         print("  JIRA_USER=your-email@domain.com")
         print("  JIRA_API_TOKEN=your-api-token")
-        print("  JIRA_TICKET=PROJ-123 or PROJ-456")
+        print("  JIRA_TICKET=PROJ-123 or PROJ-456 (comma-separate several tickets/epics)")
         return []
+    ticket_keys = [key.strip() for key in jira_ticket.split(',') if key.strip()]
     print(f"🚀 Starting JIRA story fetch for: {jira_ticket}")
     print(f"📍 JIRA URL: {jira_url}")
     print(f"👤 User: {jira_user}")
     print()
-    saved_files = process_jira_ticket(jira_url, jira_user, jira_api_token, jira_ticket)
+    saved_files = process_jira_tickets(jira_url, jira_user, jira_api_token, ticket_keys)
     if saved_files:
         print(f"\n🎉 Successfully saved {len(saved_files)} story files:")
         for file_path in saved_files:
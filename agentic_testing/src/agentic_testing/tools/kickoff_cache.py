@@ -0,0 +1,126 @@
+import os
+import json
+import hashlib
+import threading
+
+# Get the project root directory (4 levels up from this file)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, '.kickoff_cache')
+CONFIG_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config'))
+CONFIG_FILES = ('agents.yaml', 'tasks.yaml')
+DEFAULT_MAX_BYTES = int(os.environ.get('KICKOFF_CACHE_MAX_MB', '64')) * 1024 * 1024
+
+
+def hash_text(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def config_hash():
+    """
+    Hash of agents.yaml and tasks.yaml so any prompt change invalidates cached results.
+    """
+    digest = hashlib.sha256()
+    for name in CONFIG_FILES:
+        path = os.path.join(CONFIG_DIR, name)
+        digest.update(name.encode('utf-8'))
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+class KickoffCache:
+    """
+    Persistent on-disk cache of Crew.kickoff results.
+
+    Entries are keyed by (task name, agents/tasks config hash, hash of every kickoff input)
+    and stored one JSON file per key. Reads bump the file mtime so eviction can drop the
+    least recently used entries once the cache grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._config_hash = config_hash()
+        self._lock = threading.Lock()
+
+    def make_key(self, task_name, inputs):
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hash_text(f"{task_name}|{self._config_hash}|{hash_text(payload)}")
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, task_name, inputs):
+        if not self.enabled:
+            return None
+        path = self._entry_path(self.make_key(task_name, inputs))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        print(f"♻️  Cache hit for task '{task_name}'")
+        return entry.get('result')
+
+    def put(self, task_name, inputs, result):
+        if not self.enabled:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(self.make_key(task_name, inputs))
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'task': task_name, 'result': result}, f)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith('.json'):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+    def clear(self):
+        if not os.path.isdir(self.cache_dir):
+            return
+        removed = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file():
+                    os.remove(entry.path)
+                    removed += 1
+        print(f"🗑️  Invalidated {removed} cached kickoff results in {self.cache_dir}")
+
+    def report(self):
+        if not self.enabled:
+            print("Kickoff cache disabled for this run")
+            return
+        total = self.hits + self.misses
+        print(f"📊 Kickoff cache: {self.hits} hits, {self.misses} misses ({total} lookups)")
@@ -0,0 +1,182 @@
+"""
+Compiled locator registry shared by environment.py and every step module.
+
+Step 7 copies this file to features/locator_registry.py; behave puts the features
+directory on sys.path, so step modules can `from locator_registry import get_registry`.
+features/meta_data/locators_babel.json is read once per run and every key is compiled
+to a ranked tuple of (By, selector) pairs, so a lookup is a single dict access.
+"""
+import os
+import json
+from collections import Counter
+
+from selenium.webdriver.common.by import By
+
+LOCATORS_PATH = os.path.join("features", "meta_data", "locators_babel.json")
+
+# Candidates for a key are tried in this order; unknown strategies come last
+STRATEGY_PRIORITY = {
+    "data-testid": 0,
+    "id": 1,
+    "name": 2,
+    "type": 3,
+    "placeholder": 4,
+    "aria-label": 5,
+    "css selector": 6,
+    "link text": 7,
+    "partial link text": 7,
+    "xpath": 8,
+    "class name": 9,
+    "tag name": 10,
+}
+# Strategies whose selector is a native Selenium locator value
+NATIVE_STRATEGIES = {
+    "xpath": By.XPATH,
+    "class name": By.CLASS_NAME,
+    "tag name": By.TAG_NAME,
+    "link text": By.LINK_TEXT,
+    "partial link text": By.PARTIAL_LINK_TEXT,
+}
+# Strategies whose value is an HTML attribute, located with a CSS attribute selector
+ATTRIBUTE_STRATEGIES = {"data-testid", "type", "placeholder", "aria-label", "name", "id"}
+STRATEGY_ALIASES = {"css": "css selector", "css_selector": "css selector", "testid": "data-testid"}
+
+
+def normalize_strategy(by_value):
+    key = " ".join(str(by_value).strip().lower().replace("_", " ").split())
+    key = key.replace("data testid", "data-testid").replace("aria label", "aria-label")
+    return STRATEGY_ALIASES.get(key, key)
+
+
+def compile_locator(item):
+    """
+    Turn one locators_babel.json entry into a (By, selector) tuple, or None when the
+    strategy is not supported. Attribute strategies (data-testid, id, type, placeholder,
+    ...) whose selector is already CSS, e.g. "[id='email']", are located by CSS selector.
+    """
+    strategy = normalize_strategy(item.get("by") or item.get("strategy") or "")
+    selector = item.get("selector")
+    value = item.get("value")
+    if strategy in NATIVE_STRATEGIES:
+        return (NATIVE_STRATEGIES[strategy], selector or value) if (selector or value) else None
+    if strategy == "css selector":
+        return (By.CSS_SELECTOR, selector) if selector else None
+    if strategy in ATTRIBUTE_STRATEGIES:
+        if selector and "[" in selector or selector and selector.lstrip().startswith(("#", ".")):
+            return (By.CSS_SELECTOR, selector)
+        plain = selector or value
+        if not plain:
+            return None
+        if strategy == "id":
+            return (By.ID, plain)
+        if strategy == "name":
+            return (By.NAME, plain)
+        return (By.CSS_SELECTOR, f"[{strategy}='{plain}']")
+    return None
+
+
+class LocatorRegistry:
+    """
+    Locator keys compiled to ranked (By, selector) candidates, with hit/miss statistics.
+    """
+
+    def __init__(self, entries):
+        ranked = {}
+        self.raw = {}
+        self.skipped = 0
+        for position, item in enumerate(entries):
+            key = item.get("key")
+            if not key:
+                continue
+            # Same key -> single item or list of items, as load_locators used to return
+            if key in self.raw:
+                existing = self.raw[key]
+                self.raw[key] = (existing if isinstance(existing, list) else [existing]) + [item]
+            else:
+                self.raw[key] = item
+            compiled = compile_locator(item)
+            if compiled is None:
+                self.skipped += 1
+                continue
+            rank = STRATEGY_PRIORITY.get(normalize_strategy(item.get("by") or item.get("strategy") or ""), len(STRATEGY_PRIORITY))
+            ranked.setdefault(key, []).append((rank, position, compiled))
+        self._candidates = {}
+        for key, options in ranked.items():
+            unique = []
+            for _, _, compiled in sorted(options):
+                if compiled not in unique:
+                    unique.append(compiled)
+            self._candidates[key] = tuple(unique)
+        self._best = {key: options[0] for key, options in self._candidates.items()}
+        self.hits = 0
+        self.misses = Counter()
+
+    @classmethod
+    def from_file(cls, path=LOCATORS_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self._candidates)
+
+    def __contains__(self, key):
+        return key in self._candidates
+
+    def get(self, key, default=None):
+        """Best (By, selector) for key, or default when the key has no usable locator."""
+        best = self._best.get(key)
+        if best is None:
+            self.misses[key] += 1
+            return default
+        self.hits += 1
+        return best
+
+    def locator(self, key):
+        """Best (By, selector) for key; raises KeyError when the key has no usable locator."""
+        best = self.get(key)
+        if best is None:
+            raise KeyError(f"Locator key '{key}' not found in {LOCATORS_PATH}")
+        return best
+
+    __getitem__ = locator
+
+    def candidates(self, key):
+        """Every (By, selector) for key, best strategy first; empty when unknown."""
+        options = self._candidates.get(key)
+        if options is None:
+            self.misses[key] += 1
+            return ()
+        self.hits += 1
+        return options
+
+    def stats(self):
+        return {
+            "keys": len(self._candidates),
+            "skipped_entries": self.skipped,
+            "hits": self.hits,
+            "misses": sum(self.misses.values()),
+            "missing_keys": dict(self.misses.most_common()),
+        }
+
+
+_registries = {}
+
+
+def get_registry(path=LOCATORS_PATH):
+    """
+    The process-wide registry for path, compiled on first use and recompiled only when the
+    file changes; a missing or unreadable file gives an empty registry.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    cached = _registries.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        registry = LocatorRegistry.from_file(path) if mtime is not None else LocatorRegistry([])
+    except (OSError, ValueError):
+        registry = LocatorRegistry([])
+    _registries[path] = (mtime, registry)
+    return registry
@@ -1,6 +1,8 @@
 import os
 import re
 import json
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 
 EXCLUDE_DIRS = {'node_modules', 'dist', 'build', '.git'}
 SCAN_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
@@ -16,6 +18,18 @@ MESSAGE_PATTERNS = {
     'alert': r"alert\(\s*['\"]([^'\"]{5,150})['\"]\s*\)",
     'console': r"console\.(?:log|warn|error)\(\s*['\"]([^'\"]{5,150})['\"]\s*\)"
 }
+# All MESSAGE_PATTERNS as one alternation; group gN holds the message of the N-th pattern.
+# The leading lookahead on the patterns' first characters lets the engine skip positions
+# that cannot start any alternative instead of trying all nine branches there.
+MESSAGE_GROUP_TYPES = {f'g{i}': msg_type for i, msg_type in enumerate(MESSAGE_PATTERNS)}
+MESSAGE_CAPTURE = r"([^'\"]{5,150})"
+MESSAGE_FIRST_CHARS = ''.join(sorted({re.sub(r'^\\b', '', pattern)[0] for pattern in MESSAGE_PATTERNS.values()}))
+COMBINED_MESSAGE_PATTERN = re.compile(f"(?=[{MESSAGE_FIRST_CHARS}])(?:" + '|'.join(
+    pattern.replace(MESSAGE_CAPTURE, f"(?P<g{i}>{MESSAGE_CAPTURE[1:]}", 1)
+    for i, pattern in enumerate(MESSAGE_PATTERNS.values())
+) + ")")
+# Below this many files the process pool costs more than it saves
+PARALLEL_MIN_FILES = 64
 
 def is_relevant(msg: str) -> bool:
     low = msg.lower()
@@ -25,28 +39,49 @@ def is_relevant(msg: str) -> bool:
     return 5 <= len(msg) <= 150 and any(c.isalpha() for c in msg)
 
 def extract_messages_from_file(path):
+    """
+    Single pass over the file with COMBINED_MESSAGE_PATTERN; line numbers come from a
+    newline offset index instead of re-counting newlines before every match.
+    """
     messages = []
     try:
         with open(path, encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-            full_text = ''.join(lines)
-            for msg_type, pattern in MESSAGE_PATTERNS.items():
-                for match in re.finditer(pattern, full_text):
-                    msg = match.group(1).strip()
-                    if is_relevant(msg):
-                        start = match.start()
-                        line_no = full_text[:start].count('\n') + 1
-                        messages.append({
-                            'message': msg,
-                            'type': msg_type,
-                            'file': path,
-                            'line': line_no
-                        })
+            full_text = f.read()
+        newline_offsets = [m.start() for m in re.finditer('\n', full_text)]
+        for match in COMBINED_MESSAGE_PATTERN.finditer(full_text):
+            msg = match.group(match.lastgroup).strip()
+            if is_relevant(msg):
+                messages.append({
+                    'message': msg,
+                    'type': MESSAGE_GROUP_TYPES[match.lastgroup],
+                    'file': path,
+                    'line': bisect_right(newline_offsets, match.start()) + 1
+                })
     except Exception as e:
         print(f"Error parsing {path}: {e}")
     return messages
 
-def extract_messages():
+def find_source_files(scan_dir):
+    paths = []
+    for root, dirs, files in os.walk(scan_dir):
+        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+        for f in files:
+            if f.endswith(SCAN_EXTENSIONS):
+                paths.append(os.path.join(root, f))
+    return paths
+
+def scan_files(paths, workers=None):
+    """
+    Yield the messages of each file in path order, scanning in a process pool for large trees.
+    """
+    if len(paths) < PARALLEL_MIN_FILES or workers == 1:
+        yield from map(extract_messages_from_file, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+        yield from pool.map(extract_messages_from_file, paths, chunksize=chunksize)
+
+def extract_messages(workers=None):
     # Get the project root directory (4 levels up from this file)
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
     
@@ -58,16 +93,12 @@ def extract_messages():
         print(f"Directory not found: {scan_dir}")
         return
         
-    for root, dirs, files in os.walk(scan_dir):
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-        for f in files:
-            if f.endswith(SCAN_EXTENSIONS):
-                path = os.path.join(root, f)
-                for msg in extract_messages_from_file(path):
-                    key = (msg['message'], msg['type'])
-                    if key not in seen:
-                        all_msgs.append({'message': msg['message'], 'type': msg['type']})
-                        seen.add(key)
+    for file_messages in scan_files(find_source_files(scan_dir), workers):
+        for msg in file_messages:
+            key = (msg['message'], msg['type'])
+            if key not in seen:
+                all_msgs.append({'message': msg['message'], 'type': msg['type']})
+                seen.add(key)
     
     # Use absolute path for output
     out_dir = os.path.join(project_root, 'features', 'meta_data')
@@ -0,0 +1,96 @@
+import os
+import json
+import time
+import socket
+import subprocess
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (4 levels up from this file)
+PROJECT_ROOT = os.path.abspath(os.path.join(TOOLS_DIR, '../../../..'))
+SERVER_SCRIPT = os.path.join(TOOLS_DIR, 'metadata_extraction_server.js')
+EXTRACTOR_SCRIPTS = ('extract_all_metadata_babel.js', 'extract_java_endpoints.js')
+
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = int(os.environ.get('METADATA_SERVER_PORT', '47631'))
+SERVER_LOG = os.path.join(PROJECT_ROOT, 'features', 'meta_data', 'metadata_server.log')
+
+
+def send_command(command, host=SERVER_HOST, port=SERVER_PORT, timeout=300):
+    """
+    Send one JSON-lines request to the metadata extraction server and return its response.
+    Raises OSError when no server is listening.
+    """
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall((json.dumps({'command': command}) + '\n').encode('utf-8'))
+        buffer = b''
+        while not buffer.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buffer += chunk
+    return json.loads(buffer.decode('utf-8'))
+
+
+def start_server(port=SERVER_PORT, watch=False, wait_seconds=10):
+    """
+    Start metadata_extraction_server.js in the background (it outlives the pipeline run)
+    and wait until it accepts connections.
+    """
+    command = ['node', SERVER_SCRIPT, '--port', str(port)]
+    if watch:
+        command.append('--watch')
+    os.makedirs(os.path.dirname(SERVER_LOG), exist_ok=True)
+    with open(SERVER_LOG, 'a') as log:
+        subprocess.Popen(command, cwd=PROJECT_ROOT, stdout=log, stderr=subprocess.STDOUT,
+                         stdin=subprocess.DEVNULL, start_new_session=True)
+    deadline = time.monotonic() + wait_seconds
+    while time.monotonic() < deadline:
+        try:
+            return send_command('status', port=port, timeout=1)
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Metadata extraction server did not start on port {port}")
+
+
+def run_extractors_once():
+    """The original Step 2: run both node extractors as fresh processes."""
+    for script in EXTRACTOR_SCRIPTS:
+        subprocess.run(["node", os.path.join(TOOLS_DIR, script)], cwd=PROJECT_ROOT)
+
+
+def extract_metadata(mode='off'):
+    """
+    Refresh features/meta_data/*.json with the Babel and Java extractors.
+
+    mode 'off' spawns the node scripts as before; 'on' asks a running extraction server
+    (falling back to the scripts when none is listening); 'auto' also starts the server
+    in the background when it is not running, so later runs reuse its per-file cache.
+    """
+    if mode in ('on', 'auto'):
+        try:
+            try:
+                response = send_command('extract')
+            except OSError:
+                if mode != 'auto':
+                    raise
+                print(f"🚀 Starting metadata extraction server on port {SERVER_PORT} (log: {SERVER_LOG})")
+                start_server()
+                response = send_command('extract')
+            if response.get('ok'):
+                print(f"✅ Extraction server: {response['parsed']} files parsed, {response['reused']} reused, "
+                      f"{response['locators']} locators, {response['endpoints']} endpoints, "
+                      f"{response['ui_routes']} UI routes in {response['elapsed_ms']} ms")
+                return response
+            print(f"⚠️  Extraction server error: {response.get('error')}; running extractors directly")
+        except (OSError, TimeoutError, ValueError) as e:
+            print(f"⚠️  Metadata extraction server unavailable ({e}); running extractors directly")
+    run_extractors_once()
+    return None
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] in ('status', 'shutdown'):
+        print(send_command(sys.argv[1]))
+    else:
+        extract_metadata(sys.argv[1] if len(sys.argv) > 1 else 'auto')
@@ -0,0 +1,183 @@
+// metadata_extraction_server.js
+// Run with: node metadata_extraction_server.js [--port 47631] [--watch]
+//
+// Long-running version of extract_all_metadata_babel.js + extract_java_endpoints.js.
+// Per-file extraction results are kept in memory, keyed by path and validated by
+// mtime/size and then by content hash, so each request only re-parses changed files.
+// Clients send one JSON object per line over a local TCP socket:
+//   {"command": "extract"}   re-extract changed files and rewrite features/meta_data/*.json
+//   {"command": "status"}    cache statistics
+//   {"command": "shutdown"}  stop the server
+// Each request gets one JSON line back. With --watch, source changes trigger an
+// extraction on their own (debounced), so outputs stay current between pipeline runs.
+
+const fs = require('fs');
+const net = require('net');
+const crypto = require('crypto');
+
+const babel = require('./extract_all_metadata_babel');
+const java = require('./extract_java_endpoints');
+
+const HOST = '127.0.0.1';
+const DEFAULT_PORT = parseInt(process.env.METADATA_SERVER_PORT || '47631', 10);
+const WATCH_DEBOUNCE_MS = 300;
+
+// path -> { mtimeMs, size, hash, result }
+const babelCache = new Map();
+const javaCache = new Map();
+const stats = { requests: 0, parsed: 0, reused: 0, lastExtractMs: 0 };
+
+function hashContent(content) {
+  return crypto.createHash('sha1').update(content).digest('hex');
+}
+
+// Return the cached result for file, or recompute it with extract(file) when the file changed
+function cachedExtract(cache, file, extract, counts) {
+  const stat = fs.statSync(file);
+  const entry = cache.get(file);
+  if (entry && entry.mtimeMs === stat.mtimeMs && entry.size === stat.size) {
+    counts.reused++;
+    return entry.result;
+  }
+  const hash = hashContent(fs.readFileSync(file));
+  if (entry && entry.hash === hash) {
+    // Touched but not modified
+    entry.mtimeMs = stat.mtimeMs;
+    entry.size = stat.size;
+    counts.reused++;
+    return entry.result;
+  }
+  const result = extract(file);
+  cache.set(file, { mtimeMs: stat.mtimeMs, size: stat.size, hash, result });
+  counts.parsed++;
+  return result;
+}
+
+// Drop entries for files that no longer exist
+function prune(cache, files) {
+  const current = new Set(files);
+  for (const file of cache.keys()) {
+    if (!current.has(file)) cache.delete(file);
+  }
+}
+
+function extractJavaFile(file) {
+  try {
+    return java.extractEndpointsFromJavaFile(file);
+  } catch (error) {
+    console.warn(`Error processing ${file}: ${error.message}`);
+    return [];
+  }
+}
+
+function extractAll() {
+  const start = Date.now();
+  const counts = { parsed: 0, reused: 0 };
+
+  const sourceFiles = babel.collectSourceFiles();
+  prune(babelCache, sourceFiles);
+  const results = sourceFiles.map(file => cachedExtract(babelCache, file, babel.extractFile, counts));
+  const merged = babel.mergeResults(results);
+  babel.writeOutputs(merged);
+
+  const javaFiles = java.collectJavaFiles();
+  prune(javaCache, javaFiles);
+  const javaEndpoints = [];
+  for (const file of javaFiles) {
+    javaEndpoints.push(...cachedExtract(javaCache, file, extractJavaFile, counts));
+  }
+  const combinedEndpoints = java.mergeJavaEndpoints(javaEndpoints);
+
+  stats.parsed += counts.parsed;
+  stats.reused += counts.reused;
+  stats.lastExtractMs = Date.now() - start;
+  console.log(`(Server) Extraction done in ${stats.lastExtractMs} ms: ${counts.parsed} files parsed, ${counts.reused} reused from cache`);
+  return {
+    ok: true,
+    parsed: counts.parsed,
+    reused: counts.reused,
+    files: sourceFiles.length + javaFiles.length,
+    locators: merged.locators.length,
+    endpoints: combinedEndpoints.length,
+    ui_routes: merged.uiRoutes.length,
+    elapsed_ms: stats.lastExtractMs,
+  };
+}
+
+function handleRequest(request, server) {
+  stats.requests++;
+  switch (request.command) {
+    case 'extract':
+      return extractAll();
+    case 'status':
+      return { ok: true, cached_files: babelCache.size + javaCache.size, ...stats };
+    case 'shutdown':
+      setImmediate(() => server.close(() => process.exit(0)));
+      return { ok: true };
+    default:
+      return { ok: false, error: `Unknown command: ${request.command}` };
+  }
+}
+
+function watchSources(onChange) {
+  let timer = null;
+  const trigger = () => {
+    clearTimeout(timer);
+    timer = setTimeout(onChange, WATCH_DEBOUNCE_MS);
+  };
+  for (const dir of [babel.SRC_DIR, java.BACKEND_DIR]) {
+    if (!fs.existsSync(dir)) continue;
+    try {
+      fs.watch(dir, { recursive: true }, trigger);
+      console.log(`(Server) Watching ${dir}`);
+    } catch (error) {
+      console.warn(`(Server) Cannot watch ${dir}: ${error.message}`);
+    }
+  }
+}
+
+function main() {
+  const args = process.argv.slice(2);
+  const portIndex = args.indexOf('--port');
+  const port = portIndex !== -1 ? parseInt(args[portIndex + 1], 10) : DEFAULT_PORT;
+
+  const server = net.createServer(socket => {
+    let buffer = '';
+    socket.setEncoding('utf8');
+    socket.on('data', chunk => {
+      buffer += chunk;
+      let newline;
+      while ((newline = buffer.indexOf('\n')) !== -1) {
+        const line = buffer.slice(0, newline).trim();
+        buffer = buffer.slice(newline + 1);
+        if (!line) continue;
+        let response;
+        try {
+          response = handleRequest(JSON.parse(line), server);
+        } catch (error) {
+          response = { ok: false, error: error.message };
+        }
+        socket.write(JSON.stringify(response) + '\n');
+      }
+    });
+    socket.on('error', () => {});
+  });
+
+  server.listen(port, HOST, () => {
+    console.log(`(Server) Metadata extraction server listening on ${HOST}:${port}`);
+    if (args.includes('--watch')) {
+      extractAll();
+      watchSources(() => {
+        try {
+          extractAll();
+        } catch (error) {
+          console.warn(`(Server) Extraction failed: ${error.message}`);
+        }
+      });
+    }
+  });
+}
+
+if (require.main === module) {
+  main();
+}
@@ -0,0 +1,371 @@
+import os
+import re
+import sys
+import json
+import glob
+import heapq
+import argparse
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from agentic_testing.tools.stream_report import merge_jsonl_reports
+    from agentic_testing.tools.step_profiler import format_summary, merge_profiles
+except ImportError:  # run as a script from the tools directory
+    from stream_report import merge_jsonl_reports
+    from step_profiler import format_summary, merge_profiles
+
+# Get the project root directory (4 levels up from this file)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
+REPORTS_DIR = os.path.join('features', 'reports')
+LOGS_DIR = os.path.join('features', 'logs')
+REPORT_PATH = os.path.join(REPORTS_DIR, 'behave_report.json')
+SUMMARY_PATH = os.path.join(REPORTS_DIR, 'behave_parallel_summary.json')
+WORKER_REPORTS_DIR = os.path.join(REPORTS_DIR, 'workers')
+# Streaming reports written by environment.py in each worker, merged into STREAM_REPORT_PATH
+WORKER_STREAM_REPORT = os.path.join(REPORTS_DIR, 'behave_report_worker{worker_id}.jsonl')
+STREAM_REPORT_PATH = os.path.join(REPORTS_DIR, 'behave_report.jsonl')
+# Step time breakdowns written by environment.py in each worker (see step_profiler.py)
+WORKER_PROFILE = os.path.join(REPORTS_DIR, 'step_profile_worker{worker_id}.json')
+PROFILE_PATH = os.path.join(REPORTS_DIR, 'step_profile.json')
+
+# Each worker is a separate behave process with its own Chrome, so keep the default modest
+BEHAVE_WORKERS = int(os.environ.get('BEHAVE_WORKERS', str(min(4, os.cpu_count() or 1))))
+# 'scenario' shards scenarios and Scenario Outline example rows, 'feature' shards whole feature files
+BEHAVE_SHARD_MODE = os.environ.get('BEHAVE_SHARD_MODE', 'scenario')
+# Cost of a step when the previous report has no timing for its scenario
+DEFAULT_STEP_SECONDS = 1.0
+
+SCENARIO_PATTERN = re.compile(r'^\s*(Scenario Outline|Scenario Template|Scenario|Example)\s*:')
+OUTLINE_KEYWORDS = ('Scenario Outline', 'Scenario Template')
+EXAMPLES_PATTERN = re.compile(r'^\s*(Examples|Scenarios)\s*:')
+BACKGROUND_PATTERN = re.compile(r'^\s*Background\s*:')
+STEP_PATTERN = re.compile(r'^\s*(Given|When|Then|And|But|\*)\s')
+
+
+def find_feature_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '**', '*.feature'), recursive=True)))
+        elif path.endswith('.feature'):
+            files.append(path)
+    return files
+
+
+def parse_feature_units(path):
+    """
+    Return the runnable units of a feature file as dicts with 'location' (file:line, as
+    accepted by behave), 'file', 'line' and 'steps'. Every example row of a Scenario Outline
+    is its own unit, so outlines can be spread across workers too.
+    """
+    units = []
+    background_steps = 0
+    section = None  # 'background', 'scenario' or 'outline'
+    current = None
+    outline_rows = []
+    in_examples = False
+    header_seen = False
+    in_docstring = False
+
+    def close_scenario():
+        if current is None:
+            return
+        steps = background_steps + current['steps']
+        if current['outline']:
+            # An outline without example rows runs nothing in behave either
+            for row_line in outline_rows:
+                units.append({'file': path, 'line': row_line, 'location': f"{path}:{row_line}", 'steps': steps})
+        else:
+            units.append({'file': path, 'line': current['line'], 'location': f"{path}:{current['line']}", 'steps': steps})
+
+    with open(path, encoding='utf-8') as f:
+        for lineno, line in enumerate(f, start=1):
+            stripped = line.strip()
+            if stripped.startswith('"""') or stripped.startswith('```'):
+                in_docstring = not in_docstring
+                continue
+            if in_docstring or not stripped or stripped.startswith('#'):
+                continue
+            scenario = SCENARIO_PATTERN.match(line)
+            if scenario:
+                close_scenario()
+                current = {'line': lineno, 'steps': 0, 'outline': scenario.group(1) in OUTLINE_KEYWORDS}
+                outline_rows = []
+                section = 'outline' if current['outline'] else 'scenario'
+                in_examples = False
+                continue
+            if BACKGROUND_PATTERN.match(line):
+                section = 'background'
+                continue
+            if EXAMPLES_PATTERN.match(line):
+                in_examples = True
+                header_seen = False
+                continue
+            if in_examples and stripped.startswith('|'):
+                if header_seen:
+                    outline_rows.append(lineno)
+                header_seen = True
+                continue
+            if STEP_PATTERN.match(line):
+                if section == 'background':
+                    background_steps += 1
+                elif current is not None and not in_examples:
+                    current['steps'] += 1
+    close_scenario()
+    return units
+
+
+def load_previous_durations(report_path=REPORT_PATH):
+    """Scenario durations by location from a previous behave JSON report, if there is one."""
+    try:
+        with open(report_path, encoding='utf-8') as f:
+            features = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    durations = {}
+    if not isinstance(features, list):
+        return durations
+    for feature in features:
+        for element in feature.get('elements', []):
+            if element.get('type') == 'background' or 'location' not in element:
+                continue
+            durations[element['location']] = sum(
+                step.get('result', {}).get('duration', 0) for step in element.get('steps', []))
+    return durations
+
+
+def collect_units(paths, mode, durations):
+    """Runnable units with an estimated cost, per scenario or per feature file."""
+    units = []
+    for path in find_feature_files(paths):
+        scenarios = parse_feature_units(path)
+        for unit in scenarios:
+            unit['cost'] = durations.get(unit['location'], unit['steps'] * DEFAULT_STEP_SECONDS)
+        if mode == 'feature':
+            if scenarios:
+                units.append({'file': path, 'line': 0, 'location': path,
+                              'steps': sum(u['steps'] for u in scenarios),
+                              'cost': sum(u['cost'] for u in scenarios)})
+        else:
+            units.extend(scenarios)
+    return units
+
+
+def shard_units(units, workers):
+    """
+    Longest-processing-time-first assignment: the most expensive unit goes to the least
+    loaded worker. Each shard keeps its units in file/line order.
+    """
+    shards = [[] for _ in range(max(1, min(workers, len(units))))]
+    heap = [(0.0, index) for index in range(len(shards))]
+    for unit in sorted(units, key=lambda u: (-u['cost'], u['file'], u['line'])):
+        load, index = heapq.heappop(heap)
+        shards[index].append(unit)
+        heapq.heappush(heap, (load + unit['cost'], index))
+    for shard in shards:
+        shard.sort(key=lambda u: (u['file'], u['line']))
+    return shards
+
+
+def run_worker(worker_id, shard, behave_args, root):
+    """Run one behave process over the shard's locations with its own JSON report and log."""
+    report = os.path.join(WORKER_REPORTS_DIR, f'behave_worker{worker_id}.json')
+    log_path = os.path.join(LOGS_DIR, f'behave_worker{worker_id}.log')
+    command = [sys.executable, '-m', 'behave', '--format', 'json', '--outfile', report,
+               '--format', 'progress', *behave_args, *[unit['location'] for unit in shard]]
+    env = dict(os.environ, BEHAVE_WORKER_ID=str(worker_id))
+    start = time.monotonic()
+    with open(os.path.join(root, log_path), 'w', encoding='utf-8') as log:
+        log.write(' '.join(command) + '\n')
+        log.flush()
+        returncode = subprocess.call(command, cwd=root, env=env, stdout=log, stderr=subprocess.STDOUT,
+                                     stdin=subprocess.DEVNULL)
+    return {
+        'worker': worker_id,
+        'units': len(shard),
+        'estimated_seconds': round(sum(unit['cost'] for unit in shard), 3),
+        'returncode': returncode,
+        'start': start,
+        'elapsed': time.monotonic() - start,
+        'report': report,
+        'log': log_path,
+    }
+
+
+def load_worker_report(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not read worker report {path}: {e}")
+        return []
+
+
+def location_key(location):
+    path, _, line = location.rpartition(':')
+    return (path, int(line)) if line.isdigit() else (location, 0)
+
+
+def merge_reports(reports, shards):
+    """
+    Merge behave JSON reports from several workers: the scenarios each worker was assigned
+    (behave also lists the unselected ones as skipped) are combined under one entry per
+    feature, after the feature's background, and ordered by their line in the feature file.
+    """
+    merged = {}
+    for features, shard in zip(reports, shards):
+        wanted = {unit['location'] for unit in shard}
+        for feature in features:
+            key = feature.get('location') or feature.get('name')
+            if key not in merged:
+                merged[key] = {'feature': dict(feature, elements=[]), 'background': None, 'scenarios': []}
+            entry = merged[key]
+            for element in feature.get('elements', []):
+                location = element.get('location', '')
+                if element.get('type') == 'background':
+                    entry['background'] = entry['background'] or element
+                elif location in wanted or location_key(location)[0] in wanted:
+                    entry['scenarios'].append(element)
+    result = []
+    for key in sorted(merged, key=location_key):
+        entry = merged[key]
+        feature = entry['feature']
+        scenarios = sorted(entry['scenarios'], key=lambda element: location_key(element.get('location', '')))
+        feature['elements'] = ([entry['background']] if entry['background'] else []) + scenarios
+        statuses = {scenario.get('status') for scenario in scenarios}
+        feature['status'] = 'failed' if 'failed' in statuses else 'passed' if 'passed' in statuses else feature.get('status')
+        result.append(feature)
+    return result
+
+
+def scenario_counts(features):
+    counts = {}
+    for feature in features:
+        for element in feature.get('elements', []):
+            if element.get('type') == 'background':
+                continue
+            status = element.get('status', 'untested')
+            counts[status] = counts.get(status, 0) + 1
+    return counts
+
+
+def step_seconds(features):
+    return sum(step.get('result', {}).get('duration', 0)
+               for feature in features for element in feature.get('elements', []) for step in element.get('steps', []))
+
+
+def run_parallel(paths=('features',), workers=BEHAVE_WORKERS, mode=BEHAVE_SHARD_MODE, behave_args=(), root=PROJECT_ROOT, dry_run=False):
+    """
+    Shard the feature files under paths across worker behave processes, merge their JSON
+    results into features/reports/behave_report.json and report wall-clock time and
+    per-worker utilization. Returns the summary dict.
+    """
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        units = collect_units(paths, mode, load_previous_durations())
+    finally:
+        os.chdir(cwd)
+    if not units:
+        print(f"No scenarios found under {', '.join(paths)}")
+        return None
+    shards = shard_units(units, workers)
+    print(f"🧪 Running {len(units)} {'feature files' if mode == 'feature' else 'scenarios'} on {len(shards)} behave workers")
+    for worker_id, shard in enumerate(shards, start=1):
+        print(f"  worker {worker_id}: {len(shard)} units, ~{sum(u['cost'] for u in shard):.1f}s estimated")
+    if dry_run:
+        for worker_id, shard in enumerate(shards, start=1):
+            print(f"  worker {worker_id}: {' '.join(unit['location'] for unit in shard)}")
+        return None
+
+    for directory in (WORKER_REPORTS_DIR, LOGS_DIR):
+        os.makedirs(os.path.join(root, directory), exist_ok=True)
+    # Streaming reports left by an earlier run must not be merged into this one
+    for pattern in (WORKER_STREAM_REPORT, WORKER_PROFILE):
+        for stale in glob.glob(os.path.join(root, pattern.format(worker_id='*'))):
+            os.remove(stale)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        results = list(executor.map(lambda args: run_worker(args[0], args[1], list(behave_args), root),
+                                    enumerate(shards, start=1)))
+    wall = time.monotonic() - start
+
+    worker_reports = []
+    for result in results:
+        features = load_worker_report(os.path.join(root, result['report']))
+        worker_reports.append(features)
+        result['step_seconds'] = round(step_seconds(features), 3)
+        result['utilization'] = round(result['elapsed'] / wall, 3) if wall else 0.0
+        result['elapsed'] = round(result['elapsed'], 3)
+        del result['start']
+    merged = merge_reports(worker_reports, shards)
+    with open(os.path.join(root, REPORT_PATH), 'w', encoding='utf-8') as f:
+        json.dump(merged, f, indent=2)
+
+    stream_reports = [path for path in (os.path.join(root, WORKER_STREAM_REPORT.format(worker_id=result['worker']))
+                                        for result in results) if os.path.isfile(path)]
+    stream_summary = None
+    if stream_reports:
+        try:
+            stream_summary = merge_jsonl_reports(stream_reports, os.path.join(root, STREAM_REPORT_PATH))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not merge the workers' streaming reports: {e}")
+
+    profiles = [load_worker_report(path) for path in (os.path.join(root, WORKER_PROFILE.format(worker_id=result['worker']))
+                                                      for result in results) if os.path.isfile(path)]
+    profiles = [profile for profile in profiles if profile]
+    profile = merge_profiles(profiles) if profiles else None
+    if profile:
+        with open(os.path.join(root, PROFILE_PATH), 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2)
+
+    busy = sum(result['elapsed'] for result in results)
+    summary = {
+        'mode': mode,
+        'workers': len(shards),
+        'units': len(units),
+        'wall_seconds': round(wall, 3),
+        'busy_seconds': round(busy, 3),
+        'speedup': round(busy / wall, 2) if wall else 0.0,
+        'scenarios': scenario_counts(merged),
+        'per_worker': results,
+        # A worker killed by a signal has a negative returncode, so max() could report success
+        'returncode': next((result['returncode'] for result in results if result['returncode']), 0),
+    }
+    if stream_summary:
+        # Run-level counters (driver pool, locators, ...) summed over the workers
+        summary['run_stats'] = stream_summary['stats']
+    with open(os.path.join(root, SUMMARY_PATH), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"\n{'worker':>6} {'units':>6} {'elapsed':>9} {'steps':>9} {'util':>6}  exit  log")
+    for result in results:
+        print(f"{result['worker']:>6} {result['units']:>6} {result['elapsed']:>8.1f}s {result['step_seconds']:>8.1f}s "
+              f"{result['utilization']:>6.0%}  {result['returncode']:>4}  {result['log']}")
+    counts = ', '.join(f"{count} {status}" for status, count in sorted(summary['scenarios'].items()))
+    print(f"\n⏱️  Wall clock {wall:.1f}s for {busy:.1f}s of worker time ({summary['speedup']:.2f}x); scenarios: {counts or 'none'}")
+    print(f"✅ Merged report written to {REPORT_PATH}")
+    if profile:
+        print(f"\n{format_summary(profile)}\n✅ Step profile written to {PROFILE_PATH}")
+    if stream_summary:
+        print(f"✅ Merged {stream_summary['workers']} streaming reports into {STREAM_REPORT_PATH} (HTML: {os.path.relpath(stream_summary['html'], root)})")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Behave suite sharded across parallel worker processes.",
+                                     epilog="Unrecognized options (e.g. --tags=@ui) are passed to every behave worker.")
+    parser.add_argument('paths', nargs='*', default=['features'], help="feature files or directories (default: features)")
+    parser.add_argument('--workers', type=int, default=BEHAVE_WORKERS)
+    parser.add_argument('--mode', choices=('scenario', 'feature'), default=BEHAVE_SHARD_MODE)
+    parser.add_argument('--root', default=PROJECT_ROOT, help="directory behave runs in (contains features/)")
+    parser.add_argument('--dry-run', action='store_true', help="print the shards without running behave")
+    args, behave_args = parser.parse_known_args()
+    summary = run_parallel(args.paths, args.workers, args.mode, behave_args, args.root, args.dry_run)
+    sys.exit(summary['returncode'] if summary else 0)
+
+
+if __name__ == "__main__":
+    main()
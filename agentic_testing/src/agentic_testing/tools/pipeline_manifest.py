@@ -0,0 +1,88 @@
+import os
+import json
+import hashlib
+import threading
+
+# Get the project root directory (4 levels up from this file)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
+DEFAULT_MANIFEST_PATH = os.path.join(PROJECT_ROOT, 'features', 'meta_data', 'pipeline_manifest.json')
+
+
+def hash_file(path):
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PipelineManifest:
+    """
+    Records, for every generated artifact, the content hashes of the inputs it was built from.
+
+    An artifact is rebuilt only when it has no entry yet, its output file is missing or moved,
+    or one of its input hashes changed since it was recorded (make-style).
+    """
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self.skipped = 0
+        self.rebuilt = 0
+        self._lock = threading.Lock()
+        self.artifacts = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('artifacts', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable pipeline manifest {self.path}: {e}")
+            return {}
+
+    def stale_reason(self, artifact, output_path, inputs):
+        """Return why the artifact must be rebuilt, or None when it is up to date."""
+        if not self.enabled:
+            return "incremental build disabled"
+        entry = self.artifacts.get(artifact)
+        if entry is None:
+            return "no manifest entry"
+        if entry.get('output') != output_path:
+            return "output path changed"
+        if not os.path.exists(output_path):
+            return "output file missing"
+        recorded = entry.get('inputs', {})
+        changed = sorted(name for name in set(inputs) | set(recorded) if inputs.get(name) != recorded.get(name))
+        if changed:
+            return f"inputs changed: {', '.join(changed)}"
+        return None
+
+    def needs_rebuild(self, artifact, output_path, inputs):
+        reason = self.stale_reason(artifact, output_path, inputs)
+        with self._lock:
+            if reason is None:
+                self.skipped += 1
+                print(f"⏭️  Skipping {artifact}: {os.path.basename(output_path)} is up to date")
+                return False
+            self.rebuilt += 1
+        print(f"🔨 Building {artifact}: {reason}")
+        return True
+
+    def record(self, artifact, output_path, inputs):
+        with self._lock:
+            self.artifacts[artifact] = {'output': output_path, 'inputs': inputs}
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'artifacts': self.artifacts}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def report(self):
+        print(f"📊 Incremental build: {self.rebuilt} artifacts rebuilt, {self.skipped} up to date")
@@ -0,0 +1,99 @@
+import os
+import re
+import json
+
+DEFAULT_TOKEN_BUDGET = int(os.environ.get('PROMPT_TOKEN_BUDGET', '8000'))
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+# UI routes passed even when the step text does not mention them (the app's entry page)
+ALWAYS_KEEP_ROUTES = {'/'}
+QUOTED_PATTERN = re.compile(r'["\']([^"\'\n]{1,80})["\']')
+STOP_WORDS = {
+    'the', 'and', 'for', 'with', 'that', 'this', 'are', 'was', 'from', 'into', 'then', 'when', 'given',
+    'should', 'user', 'page', 'api', 'true', 'false', 'none', 'self', 'def', 'import', 'context', 'step',
+    'impl', 'scenario', 'feature', 'outline', 'examples',
+}
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+
+def estimate_tokens(text):
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    # Rough fallback: ~4 characters per token for English text and JSON
+    return len(text) // 4 + 1
+
+
+def words(text):
+    text = re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', text)
+    return {w for w in WORD_PATTERN.findall(text.lower()) if len(w) > 2 and w not in STOP_WORDS}
+
+
+class MetadataIndex:
+    """
+    Inverted index from words in the given fields of each metadata entry to the entry positions.
+    Exact field values (e.g. a locator key quoted in the step file) are indexed separately.
+    """
+
+    def __init__(self, entries, fields):
+        self.entries = entries
+        self.by_word = {}
+        self.by_value = {}
+        for i, entry in enumerate(entries):
+            for field in fields:
+                value = entry.get(field)
+                if not isinstance(value, str):
+                    continue
+                self.by_value.setdefault(value, set()).add(i)
+                for word in words(value):
+                    self.by_word.setdefault(word, set()).add(i)
+
+    def score(self, text_words, quoted):
+        scores = {}
+        for value in quoted:
+            for i in self.by_value.get(value, ()):
+                scores[i] = scores.get(i, 0) + 10
+        for word in text_words:
+            for i in self.by_word.get(word, ()):
+                scores[i] = scores.get(i, 0) + 1
+        return scores
+
+
+def trim_metadata(step_text, locators, endpoints, ui_routes, token_budget=DEFAULT_TOKEN_BUDGET):
+    """
+    Keep only the locators/endpoints/UI routes referenced by the feature and step text.
+
+    Entries are ranked by relevance (exact quoted matches first, then shared words) and added
+    until the serialized metadata reaches token_budget; entries that match nothing are left
+    out, except the routes in ALWAYS_KEEP_ROUTES. Kept entries retain their original order.
+    Returns (locators, endpoints, ui_routes).
+    """
+    text_words = words(step_text)
+    quoted = set(QUOTED_PATTERN.findall(step_text))
+    candidates = []
+    groups = (
+        (locators, ('key', 'value', 'selector')),
+        (endpoints, ('path',)),
+        (ui_routes, ('path',)),
+    )
+    for group, (entries, fields) in enumerate(groups):
+        scores = MetadataIndex(entries, fields).score(text_words, quoted)
+        if group == 2:
+            for i, entry in enumerate(entries):
+                if i not in scores and entry.get('path') in ALWAYS_KEEP_ROUTES:
+                    scores[i] = 0
+        for i, score in scores.items():
+            candidates.append((-score, group, i))
+    candidates.sort()
+    kept = ([], [], [])
+    used = 0
+    for _, group, i in candidates:
+        cost = estimate_tokens(json.dumps(groups[group][0][i], indent=2))
+        if used + cost > token_budget:
+            continue
+        kept[group].append(i)
+        used += cost
+    return tuple([groups[g][0][i] for i in sorted(kept[g])] for g in range(3))
@@ -0,0 +1,302 @@
+"""
+Step-level timing profile for behave runs.
+
+after_step only knew each step's total duration. StepProfiler splits it into:
+    webdriver      WebDriver commands outside explicit waits (clicks, send_keys, finds, ...)
+    explicit_wait  WebDriverWait.until/until_not and ElementResolver.resolve, including the
+                   commands they poll with
+    implicit_wait  find commands that came back empty or with NoSuchElementException while
+                   an implicit wait was set, i.e. time the driver spent waiting for nothing
+    python         the rest of the step
+and ranks the slowest steps and the locators that cost the most time. The report also keeps
+the untruncated per-step and per-locator aggregates, so parallel workers' reports are merged
+before the lists are ranked and cut. The commands are
+timed by wrapping driver.execute on each session, and waits by patching WebDriverWait once
+per process. environment.py writes the result to features/reports/step_profile.json and
+logs a summary. Step 7 copies this file next to environment.py with the other support
+modules.
+"""
+import os
+import time
+import heapq
+import weakref
+import functools
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.support.wait import WebDriverWait
+
+# 'off' disables the instrumentation
+STEP_PROFILE = os.environ.get('STEP_PROFILE', 'on').lower() not in ('off', '0', 'false', 'no')
+# Entries in each ranked list of the report
+STEP_PROFILE_TOP = int(os.environ.get('STEP_PROFILE_TOP', '15'))
+
+FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+PARTS = ("webdriver", "explicit_wait", "implicit_wait", "python")
+
+
+def describe_locator(by, value):
+    return f"{by}={value}"
+
+
+def describe_condition(method):
+    """Locator an expected condition waits for, or the condition's name when it has none."""
+    code = getattr(method, "__code__", None)
+    if code is not None and method.__closure__:
+        for name, cell in zip(code.co_freevars, method.__closure__):
+            try:
+                value = cell.cell_contents
+            except ValueError:
+                continue
+            if name in ("locator", "mark") and isinstance(value, tuple) and len(value) == 2:
+                return describe_locator(*value)
+    return getattr(method, "__qualname__", type(method).__name__).split(".<locals>")[0]
+
+
+class StepProfiler:
+    """
+    Collects the time breakdown of the current step and aggregates the run's slowest steps
+    and locators.
+    """
+
+    def __init__(self, top=STEP_PROFILE_TOP):
+        self.top = top
+        self._drivers = weakref.WeakKeyDictionary()
+        self._wait_depth = 0
+        self._current = None
+        self._sequence = 0
+        # Bounded: only the top slowest individual steps are kept
+        self._slowest = []
+        self.by_step = {}
+        self.locators = {}
+        self.totals = {"steps": 0, "seconds": 0.0, "commands": 0, **dict.fromkeys(PARTS, 0.0)}
+
+    # --- instrumentation ---
+
+    def instrument(self, driver):
+        """Time every WebDriver command of driver's session (once per session)."""
+        if driver in self._drivers:
+            return
+        try:
+            # Implicit wait in seconds; kept up to date from later setTimeouts commands
+            self._drivers[driver] = driver.timeouts.implicit_wait
+        except Exception:
+            self._drivers[driver] = 0
+        execute = driver.execute
+        profiler = self
+
+        @functools.wraps(execute)
+        def profiled_execute(command, params=None):
+            if command == "setTimeouts" and params and "implicit" in params:
+                profiler._drivers[driver] = (params["implicit"] or 0) / 1000
+            start = time.perf_counter()
+            missed = False
+            try:
+                response = execute(command, params)
+                if command in ("findElements", "findChildElements") and not (response or {}).get("value"):
+                    missed = True
+                return response
+            except NoSuchElementException:
+                missed = True
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                locator = describe_locator(params.get("using"), params.get("value")) if command in FIND_COMMANDS and params else None
+                profiler._command(elapsed, locator, missed and profiler._drivers.get(driver, 0) > 0)
+
+        driver.execute = profiled_execute
+
+    def _command(self, elapsed, locator, implicit_miss):
+        current = self._current
+        if current is None:
+            return
+        current["commands"] += 1
+        if self._wait_depth:
+            # Already counted as explicit-wait time by the enclosing wait
+            return
+        current["implicit_wait" if implicit_miss else "webdriver"] += elapsed
+        if locator:
+            self._locator(locator, elapsed, "implicit_wait" if implicit_miss else "webdriver", implicit_miss)
+
+    def _locator(self, locator, elapsed, part, missed):
+        entry = self.locators.setdefault(locator, {"seconds": 0.0, "calls": 0, "misses": 0, "webdriver": 0.0,
+                                                   "explicit_wait": 0.0, "implicit_wait": 0.0, "steps": set()})
+        entry["seconds"] += elapsed
+        entry[part] += elapsed
+        entry["calls"] += 1
+        entry["misses"] += int(missed)
+        if self._current is not None:
+            entry["steps"].add(self._current["name"])
+
+    def wait(self, func, describe):
+        """Wrap a waiting function so its whole duration counts as explicit-wait time."""
+        profiler = self
+
+        @functools.wraps(func)
+        def profiled_wait(*args, **kwargs):
+            if profiler._current is None or profiler._wait_depth:
+                return func(*args, **kwargs)
+            profiler._wait_depth += 1
+            start = time.perf_counter()
+            missed = True
+            try:
+                result = func(*args, **kwargs)
+                missed = False
+                return result
+            finally:
+                profiler._wait_depth -= 1
+                elapsed = time.perf_counter() - start
+                if profiler._current is not None:
+                    profiler._current["explicit_wait"] += elapsed
+                    profiler._locator(describe(*args, **kwargs), elapsed, "explicit_wait", missed)
+
+        profiled_wait._profiled = True
+        return profiled_wait
+
+    # --- steps ---
+
+    def begin_step(self, step):
+        self._current = {"name": f"{step.keyword} {step.name}", "commands": 0,
+                         **dict.fromkeys(PARTS[:-1], 0.0), "start": time.perf_counter()}
+
+    def end_step(self, step, scenario=None):
+        """Close the current step and return its breakdown (rounded seconds)."""
+        current, self._current = self._current, None
+        if current is None:
+            return None
+        duration = time.perf_counter() - current.pop("start")
+        current["python"] = max(0.0, duration - sum(current[part] for part in PARTS[:-1]))
+        profile = {part: round(current[part], 3) for part in PARTS}
+        profile["commands"] = current["commands"]
+
+        self.totals["steps"] += 1
+        self.totals["seconds"] += duration
+        self.totals["commands"] += current["commands"]
+        for part in PARTS:
+            self.totals[part] += current[part]
+        by_name = self.by_step.setdefault(current["name"], {"count": 0, "seconds": 0.0, "max": 0.0, **dict.fromkeys(PARTS, 0.0)})
+        by_name["count"] += 1
+        by_name["seconds"] += duration
+        by_name["max"] = max(by_name["max"], duration)
+        for part in PARTS:
+            by_name[part] += current[part]
+
+        self._sequence += 1
+        entry = (duration, self._sequence, {
+            "step": current["name"],
+            "scenario": getattr(scenario, "name", None),
+            "location": str(getattr(step, "location", "")),
+            "status": getattr(step.status, "name", step.status),
+            "seconds": round(duration, 3),
+            **profile,
+        })
+        if len(self._slowest) < self.top:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+        return profile
+
+    # --- report ---
+
+    def report(self):
+        return rank_profile(
+            _rounded(self.totals),
+            [entry for _, _, entry in sorted(self._slowest, reverse=True)],
+            {name: _rounded(values) for name, values in self.by_step.items()},
+            {locator: dict(_rounded(values), steps=sorted(values["steps"])) for locator, values in self.locators.items()},
+            self.top,
+        )
+
+
+def _rounded(values):
+    return {key: round(value, 3) if isinstance(value, float) else value for key, value in values.items()}
+
+
+def rank_profile(totals, slowest, by_step, locators, top=STEP_PROFILE_TOP):
+    """
+    Report dict: the top ranked lists, plus the untruncated by_step/locators aggregates under
+    "aggregates" for merge_profiles.
+    """
+    by_time = lambda item: item[1]["seconds"]
+    return {
+        "totals": totals,
+        "slowest_steps": sorted(slowest, key=lambda entry: entry["seconds"], reverse=True)[:top],
+        "steps_by_total_time": [dict(values, step=name, mean=round(values["seconds"] / values["count"], 3))
+                                for name, values in sorted(by_step.items(), key=by_time, reverse=True)[:top]],
+        "slowest_locators": [dict(values, locator=locator, steps=values["steps"][:5])
+                             for locator, values in sorted(locators.items(), key=by_time, reverse=True)[:top]],
+        "aggregates": {"by_step": by_step, "locators": locators},
+    }
+
+
+def format_summary(report, limit=10):
+    """Terminal summary of a report() dict."""
+    totals = report["totals"]
+    seconds = totals["seconds"] or 1.0
+    lines = [f"⏱️  Step profile: {totals['steps']} steps in {totals['seconds']:.1f}s, {totals['commands']} WebDriver commands"]
+    lines.append("   " + ", ".join(f"{part} {totals[part]:.1f}s ({totals[part] / seconds:.0%})" for part in PARTS))
+    if report["slowest_steps"]:
+        lines.append(f"\n{'seconds':>8} {'driver':>7} {'explicit':>8} {'implicit':>8} {'python':>7}  step")
+        for entry in report["slowest_steps"][:limit]:
+            lines.append(f"{entry['seconds']:>8.2f} {entry['webdriver']:>7.2f} {entry['explicit_wait']:>8.2f} "
+                         f"{entry['implicit_wait']:>8.2f} {entry['python']:>7.2f}  {entry['step']} ({entry['location']})")
+    if report["slowest_locators"]:
+        lines.append(f"\n{'seconds':>8} {'calls':>6} {'misses':>6}  locator")
+        for entry in report["slowest_locators"][:limit]:
+            lines.append(f"{entry['seconds']:>8.2f} {entry['calls']:>6} {entry['misses']:>6}  {entry['locator']}")
+    return "\n".join(lines)
+
+
+_profiler = None
+
+
+def get_profiler():
+    """
+    The process-wide profiler; the first call patches WebDriverWait (and ElementResolver when
+    it is importable) so explicit waits in every step module are timed.
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = StepProfiler()
+        for name in ("until", "until_not"):
+            method = getattr(WebDriverWait, name)
+            if not getattr(method, "_profiled", False):
+                setattr(WebDriverWait, name, _profiler.wait(method, lambda wait, condition, *args, **kwargs: describe_condition(condition)))
+        try:
+            from element_resolver import ElementResolver
+        except ImportError:
+            ElementResolver = None
+        if ElementResolver is not None and not getattr(ElementResolver.resolve, "_profiled", False):
+            ElementResolver.resolve = _profiler.wait(
+                ElementResolver.resolve, lambda resolver, driver, *candidates, **kwargs: " | ".join(map(str, candidates)))
+    return _profiler
+
+
+def merge_profiles(reports, top=STEP_PROFILE_TOP):
+    """
+    Combine the report() dicts written by parallel workers into one ranked report. The
+    workers' untruncated aggregates are summed first and the lists are cut once at the end;
+    a step or locator that misses one worker's top list still counts its time from all of them.
+    """
+    totals = {}
+    slowest = []
+    by_step = {}
+    locators = {}
+    for report in reports:
+        for key, value in report.get("totals", {}).items():
+            totals[key] = round(totals.get(key, 0) + value, 3)
+        # Each worker keeps its own slowest steps, so the overall slowest are among them
+        slowest.extend(report.get("slowest_steps", []))
+        aggregates = report.get("aggregates", {})
+        for name, values in aggregates.get("by_step", {}).items():
+            merged = by_step.setdefault(name, {"count": 0, "seconds": 0.0, "max": 0.0, **dict.fromkeys(PARTS, 0.0)})
+            for key in merged:
+                merged[key] = max(merged[key], values[key]) if key == "max" else round(merged[key] + values[key], 3)
+        for locator, values in aggregates.get("locators", {}).items():
+            merged = locators.setdefault(locator, {"seconds": 0.0, "calls": 0, "misses": 0, "webdriver": 0.0,
+                                                   "explicit_wait": 0.0, "implicit_wait": 0.0, "steps": []})
+            for key in merged:
+                if key == "steps":
+                    merged[key] = sorted(set(merged[key]) | set(values[key]))
+                else:
+                    merged[key] = round(merged[key] + values[key], 3)
+    return rank_profile(totals, slowest, by_step, locators, top)
@@ -0,0 +1,72 @@
+import os
+import re
+
+TAG_PATTERN = re.compile(r'(?<!\S)@([\w.-]+)')
+CONTEXT_ATTR_PATTERN = re.compile(r'\bcontext\.(\w+)')
+LOCATOR_KEY_PATTERN = re.compile(r'get_locator\(\s*(?:context\s*,\s*)?["\']([^"\']+)["\']')
+ROUTE_PATTERN = re.compile(r'base_url\s*\+\s*["\'](/[^"\']*)["\']')
+API_PATH_PATTERN = re.compile(r'["\'](/(?:api|auth|v1|v2)/[^"\']*)["\']')
+FIXTURE_PATTERN = re.compile(r'use_fixture\(\s*(\w+)')
+IMPORT_PATTERN = re.compile(r'^\s*(?:from\s+([\w.]+)\s+import|import\s+([\w.]+))', re.MULTILINE)
+
+# Attributes Behave itself puts on the context; they never need environment.py support
+BEHAVE_CONTEXT_ATTRS = {'table', 'text', 'scenario', 'feature', 'tags', 'config', 'failed', 'log_capture', 'stdout_capture', 'stderr_capture'}
+
+
+def extract_feature_tags(feature_content):
+    tags = set()
+    for line in feature_content.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('@'):
+            tags.update(TAG_PATTERN.findall(stripped))
+    return tags
+
+
+def extract_test_requirements(feature_file, test_file):
+    """
+    Summarize what a generated test needs from environment.py: scenario tags, context
+    attributes, locator keys, routes, mocked API paths, fixtures and third-party imports.
+    """
+    feature_content = ''
+    if os.path.exists(feature_file):
+        with open(feature_file, 'r', encoding='utf-8') as f:
+            feature_content = f.read()
+    test_code = ''
+    if os.path.exists(test_file):
+        with open(test_file, 'r', encoding='utf-8') as f:
+            test_code = f.read()
+    imports = set()
+    for from_module, module in IMPORT_PATTERN.findall(test_code):
+        imports.add((from_module or module).split('.')[0])
+    return {
+        'test_file': os.path.basename(test_file),
+        'tags': extract_feature_tags(feature_content),
+        'context_attributes': set(CONTEXT_ATTR_PATTERN.findall(test_code)) - BEHAVE_CONTEXT_ATTRS,
+        'locator_keys': set(LOCATOR_KEY_PATTERN.findall(test_code)),
+        'routes': set(ROUTE_PATTERN.findall(test_code)),
+        'api_paths': set(API_PATH_PATTERN.findall(test_code) + API_PATH_PATTERN.findall(feature_content)),
+        'fixtures': set(FIXTURE_PATTERN.findall(test_code)),
+        'imports': imports - {'behave'},
+    }
+
+
+def format_test_requirements(requirements):
+    """
+    Render the merged requirements of several tests as a compact text block for the LLM prompt.
+    """
+    merged = {}
+    for req in requirements:
+        for name, values in req.items():
+            if name == 'test_file':
+                continue
+            merged.setdefault(name, set()).update(values)
+    lines = [f"Test files: {', '.join(req['test_file'] for req in requirements)}"]
+    for name in ('tags', 'context_attributes', 'fixtures', 'routes', 'api_paths', 'locator_keys', 'imports'):
+        values = sorted(merged.get(name, ()))
+        lines.append(f"{name}: {', '.join(values) if values else '(none)'}")
+    lines.append("Per test file:")
+    for req in requirements:
+        tags = ', '.join(sorted(req['tags'])) or '(none)'
+        attrs = ', '.join(sorted(req['context_attributes'])) or '(none)'
+        lines.append(f"- {req['test_file']}: tags [{tags}]; context attributes [{attrs}]")
+    return '\n'.join(lines)
@@ -0,0 +1,144 @@
+"""
+Disable browser and React form validation once per WebDriver session instead of per step.
+
+before_step used to send the whole validation-disabling script with execute_script before
+every step, whether or not the step touched a form. ValidationGuard registers the script
+with CDP Page.addScriptToEvaluateOnNewDocument when the session is first seen, so Chrome
+runs it in every document the tab loads and steps cost no WebDriver round-trip at all.
+Drivers without CDP (remote/grid sessions) fall back to execute_script, sent only when a
+command that can navigate (get, back, refresh, click, submit, ...) has run since the last
+injection. Step 7 copies this file next to environment.py with the other support modules.
+"""
+import weakref
+
+from selenium.common.exceptions import WebDriverException
+
+# Idempotent: the flag stops a second run in the same document, and the properties are
+# defined configurable so a re-run after a soft navigation cannot throw.
+DISABLE_VALIDATION_JS = """
+(function () {
+    if (window.__behaveValidationDisabled) return;
+    window.__behaveValidationDisabled = true;
+    // Disable native browser validation messages
+    HTMLFormElement.prototype.reportValidity = function() { return true; };
+    // Override setCustomValidity to noop
+    HTMLElement.prototype.setCustomValidity = function() {};
+    // Override checkValidity to always valid
+    HTMLInputElement.prototype.checkValidity = function() { return true; };
+    // Disable required attribute enforcement
+    Object.defineProperty(HTMLInputElement.prototype, 'required', { get: function() { return false; }, configurable: true });
+    // For React: override validationMessage and validity
+    Object.defineProperty(HTMLInputElement.prototype, 'validationMessage', { get: function() { return ''; }, configurable: true });
+    Object.defineProperty(HTMLInputElement.prototype, 'validity', { get: function() { return { valid: true }; }, configurable: true });
+    function noValidate() {
+        document.querySelectorAll('form').forEach(f => f.noValidate = true);
+    }
+    function observe() {
+        noValidate();
+        // Forms rendered later (e.g. React re-render) get noValidate as well
+        new MutationObserver(noValidate).observe(document.documentElement, { childList: true, subtree: true });
+        console.log('[Behave] Disabled browser and React validation, set noValidate on all forms.');
+    }
+    // Scripts registered through CDP run before the document has a body
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', observe);
+    } else {
+        observe();
+    }
+})();
+"""
+
+# WebDriver commands after which the current document may have been replaced
+NAVIGATION_COMMANDS = {
+    "get", "goBack", "goForward", "refresh", "newWindow", "switchToWindow", "switchToFrame",
+    "switchToParentFrame", "clickElement", "submitElement", "sendKeysToElement",
+}
+
+
+class ValidationGuard:
+    """
+    Keeps validation disabled in every page of the sessions it has seen, with counters for
+    the execute_script round-trips it saved.
+    """
+
+    def __init__(self, logger=None):
+        self.logger = logger
+        # driver -> "cdp" or "inject"; fallback drivers also get a "page may have changed" flag
+        self._sessions = weakref.WeakKeyDictionary()
+        self._dirty = weakref.WeakKeyDictionary()
+        self.stats = {"cdp_sessions": 0, "fallback_sessions": 0, "steps": 0, "injections": 0, "saved_round_trips": 0}
+
+    def _log(self, message):
+        if self.logger:
+            self.logger.info(message)
+
+    def install(self, driver):
+        """
+        Register the script for every future document of driver's session and apply it to
+        the current one; does nothing for a session that is already registered.
+        """
+        if driver in self._sessions:
+            return self._sessions[driver]
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": DISABLE_VALIDATION_JS})
+            mode = "cdp"
+            self.stats["cdp_sessions"] += 1
+        except (AttributeError, WebDriverException) as e:
+            mode = "inject"
+            self.stats["fallback_sessions"] += 1
+            self._watch_navigation(driver)
+            self._log(f"CDP not available ({e.__class__.__name__}); re-injecting validation JS after navigations.")
+        self._sessions[driver] = mode
+        self._inject(driver)
+        self._log(f"Validation-disabling JS registered for WebDriver session ({mode}).")
+        return mode
+
+    def _watch_navigation(self, driver):
+        execute = driver.execute
+
+        def tracked_execute(command, params=None):
+            if command in NAVIGATION_COMMANDS:
+                self._dirty[driver] = True
+            return execute(command, params)
+
+        driver.execute = tracked_execute
+
+    def _inject(self, driver):
+        self.stats["injections"] += 1
+        driver.execute_script(DISABLE_VALIDATION_JS)
+        self._dirty[driver] = False
+
+    def before_step(self, driver):
+        """Called from before_step; sends the script only when the page may have changed."""
+        self.stats["steps"] += 1
+        try:
+            if driver not in self._sessions:
+                # Session not created through create_chrome_driver
+                self.install(driver)
+                return
+            if self._sessions[driver] == "inject" and self._dirty.get(driver, True):
+                self._inject(driver)
+                return
+        except WebDriverException as e:
+            if self.logger:
+                self.logger.warning(f"Failed to inject validation-disabling JS before step: {e}")
+            return
+        self.stats["saved_round_trips"] += 1
+
+    def summary(self):
+        return (f"{self.stats['saved_round_trips']} of {self.stats['steps']} per-step injections saved "
+                f"({self.stats['injections']} sent; {self.stats['cdp_sessions']} CDP sessions, "
+                f"{self.stats['fallback_sessions']} fallback sessions)")
+
+
+_guard = None
+
+
+def get_validation_guard(logger=None):
+    """The process-wide guard, so sessions registered by create_chrome_driver are known to before_step."""
+    global _guard
+    if _guard is None:
+        _guard = ValidationGuard(logger)
+    elif logger is not None and _guard.logger is None:
+        _guard.logger = logger
+    return _guard
@@ -0,0 +1,38 @@
+import logging
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agentic_testing.tools.driver_pool import DriverPool
+
+
+class DeadDriver:
+    """A session whose browser is gone: every call fails with a connection error."""
+
+    def __init__(self):
+        self.quit_called = False
+
+    @property
+    def window_handles(self):
+        raise ConnectionRefusedError("[Errno 111] Connection refused")
+
+    def quit(self):
+        self.quit_called = True
+        raise ConnectionRefusedError("[Errno 111] Connection refused")
+
+
+class DriverPoolReleaseTest(unittest.TestCase):
+    def test_session_failing_to_reset_with_any_error_is_discarded(self):
+        pool = DriverPool(DeadDriver, logging.getLogger(__name__), max_uses=5)
+        driver = pool.acquire()
+        with self.assertLogs(__name__, level='WARNING'):
+            pool.release(driver)
+        self.assertTrue(driver.quit_called)
+        self.assertEqual(pool.stats["crashed"], 1)
+        self.assertIsNot(pool.acquire(), driver)
+
+
+if __name__ == '__main__':
+    unittest.main()
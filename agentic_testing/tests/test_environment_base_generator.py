@@ -0,0 +1,23 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agentic_testing.tools.environment_base_generator import generate_base_environment_file
+
+
+class GenerateBaseEnvironmentFileTest(unittest.TestCase):
+    def test_generated_environment_compiles(self):
+        # The template is a plain string literal, so unescaped backslashes break the generated file
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'features', 'environment.py')
+            generate_base_environment_file(path)
+            with open(path, encoding='utf-8') as f:
+                source = f.read()
+        compile(source, path, 'exec')
+
+
+if __name__ == '__main__':
+    unittest.main()
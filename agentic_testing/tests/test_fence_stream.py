@@ -0,0 +1,82 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agentic_testing.tools import fence_stream
+from agentic_testing.tools.fence_stream import FencedCodeStreamWriter, extract_fenced_code
+
+CODE = 'from behave import given\n\n@given("a user")\ndef step_impl(context):\n    pass'
+
+
+def feed(writer, text, size=3):
+    for i in range(0, len(text), size):
+        writer.feed(text[i:i + size])
+
+
+class FencedCodeStreamWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.target = os.path.join(self.tmp.name, 'steps', 'login_steps.py')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_target(self):
+        with open(self.target, encoding='utf-8') as f:
+            return f.read()
+
+    def test_closing_fence_finishes_the_file(self):
+        writer = FencedCodeStreamWriter(self.target, 'python')
+        feed(writer, 'Final Answer: ```python\n' + CODE + '\n```\nSome trailing prose')
+        self.assertTrue(writer.done)
+        self.assertEqual(self.read_target(), CODE)
+
+    def test_stream_stopped_before_the_fence_is_completed(self):
+        # The stop sequence removes the closing fence from the response
+        response = 'Final Answer: ```python\n' + CODE + '\n'
+        writer = FencedCodeStreamWriter(self.target, 'python')
+        feed(writer, response)
+        self.assertFalse(writer.done)
+        writer.complete()
+        self.assertEqual(self.read_target(), CODE)
+        self.assertEqual(extract_fenced_code(response, 'python'), CODE)
+
+    def test_close_discards_an_unfinished_stream(self):
+        writer = FencedCodeStreamWriter(self.target, 'python')
+        feed(writer, '```python\nimport os')
+        writer.close()
+        self.assertFalse(os.path.exists(self.target))
+        self.assertFalse(os.path.exists(self.target + '.partial'))
+
+    def test_chunks_are_routed_by_source_on_any_thread(self):
+        llm = object()
+        writer = FencedCodeStreamWriter(self.target, 'python')
+        fence_stream._writers[id(llm)] = writer
+        try:
+            chunk = type('Chunk', (), {'chunk': '```python\n' + CODE + '\n```'})()
+            thread = threading.Thread(target=fence_stream._on_stream_chunk, args=(llm, chunk))
+            thread.start()
+            thread.join()
+            fence_stream._on_stream_chunk(object(), chunk)
+        finally:
+            fence_stream._writers.pop(id(llm), None)
+        self.assertTrue(writer.done)
+        self.assertEqual(self.read_target(), CODE)
+
+
+class ExtractFencedCodeTest(unittest.TestCase):
+    def test_returns_first_block_of_the_language(self):
+        text = '```gherkin\nFeature: Login\n```\n```python\n' + CODE + '\n```\n```python\nother\n```'
+        self.assertEqual(extract_fenced_code(text, 'python'), CODE)
+        self.assertEqual(extract_fenced_code(text, 'gherkin'), 'Feature: Login')
+
+    def test_no_block(self):
+        self.assertIsNone(extract_fenced_code(CODE, 'python'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agentic_testing.tools.jira_fetch_tool import JiraSyncState, process_jira_ticket
+
+JIRA_URL = 'https://jira.example.com'
+EPIC = {'key': 'PROJ-1', 'fields': {'summary': 'Epic', 'issuetype': {'name': 'Epic'}}}
+
+
+def issue(key, summary=None):
+    return {'key': key, 'fields': {'summary': summary or f'Story {key}', 'description': '',
+                                   'issuetype': {'name': 'Story'}, 'updated': '2026-10-01T10:00:00.000+0000'}}
+
+
+class Response:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeJira:
+    """Answers issue and search requests for an epic whose children are self.children."""
+
+    def __init__(self, children):
+        self.children = children
+        self.queries = []
+
+    def get(self, url, params=None, timeout=None):
+        if '/issue/' in url:
+            return Response(EPIC)
+        jql = params['jql']
+        self.queries.append((jql, params['fields']))
+        if jql.startswith('key in'):
+            keys = jql[len('key in ('):-1].split(', ')
+            found = [self.children[key] for key in keys]
+        elif 'updated >=' in jql:
+            found = [child for child in self.children.values() if child['fields']['summary'].endswith('(edited)')]
+        else:
+            found = list(self.children.values())
+        if params['fields'] == 'key':
+            found = [{'key': child['key']} for child in found]
+        return Response({'issues': found, 'total': len(found)})
+
+
+class IncrementalEpicSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = self.tmp.name
+        self.jira = FakeJira({key: issue(key) for key in ('PROJ-2', 'PROJ-3', 'PROJ-4')})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sync(self, full_sync_every=10):
+        state = JiraSyncState(self.folder, mode='incremental', full_sync_every=full_sync_every)
+        with contextlib.redirect_stdout(io.StringIO()):
+            files = process_jira_ticket(JIRA_URL, 'user', 'token', 'PROJ-1', self.jira, self.folder, state)
+        state.save()
+        return state, sorted(os.path.basename(path) for path in files)
+
+    def test_membership_changes_are_reconciled(self):
+        self.sync()
+        # PROJ-3 moves to another epic, PROJ-5 joins without being updated, PROJ-2 is edited
+        del self.jira.children['PROJ-3']
+        self.jira.children['PROJ-5'] = issue('PROJ-5')
+        self.jira.children['PROJ-2'] = issue('PROJ-2', 'Story PROJ-2 (edited)')
+        self.jira.queries.clear()
+        state, files = self.sync()
+        self.assertEqual(files, ['PROJ-2_story.txt', 'PROJ-4_story.txt', 'PROJ-5_story.txt'])
+        self.assertEqual(sorted(state.epics['PROJ-1']['children']), ['PROJ-2', 'PROJ-4', 'PROJ-5'])
+        self.assertEqual(state.counts, {'added': 1, 'updated': 1, 'unchanged': 1, 'removed': 1})
+        self.assertIn(('"Epic Link" = PROJ-1', 'key'), self.jira.queries)
+
+    def test_full_sync_is_forced_after_incremental_runs(self):
+        self.sync(full_sync_every=2)
+        self.assertIsNotNone(self.sync(full_sync_every=2)[0].updated_since('PROJ-1'))
+        state, _ = self.sync(full_sync_every=2)
+        self.assertEqual(state.epics['PROJ-1']['incremental_runs'], 2)
+        self.assertIsNone(state.updated_since('PROJ-1'))
+        state, _ = self.sync(full_sync_every=2)
+        self.assertEqual(state.epics['PROJ-1']['incremental_runs'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agentic_testing.tools.prompt_budget import estimate_tokens, trim_metadata
+
+STEP_TEXT = '''
+Scenario: Login with valid credentials
+  When the user enters "user@example.com" in the email field
+  And clicks the button "#login-submit"
+  Then the dashboard is shown
+'''
+LOCATORS = [
+    {'key': 'email-input', 'by': 'data-testid', 'value': 'email-input'},
+    {'key': 'submit', 'by': 'css selector', 'selector': '#login-submit'},
+    {'key': 'profile-avatar', 'by': 'data-testid', 'value': 'profile-avatar'},
+    {'key': 'settings-tab', 'by': 'id', 'value': 'settings-tab'},
+]
+ENDPOINTS = [{'path': '/api/auth/login'}, {'path': '/api/invoices'}]
+UI_ROUTES = [{'path': '/'}, {'path': '/dashboard'}, {'path': '/reports'}]
+
+
+class TrimMetadataTest(unittest.TestCase):
+    def test_unmatched_entries_are_left_out(self):
+        locators, endpoints, routes = trim_metadata(STEP_TEXT, LOCATORS, ENDPOINTS, UI_ROUTES, token_budget=10000)
+        self.assertEqual([l['key'] for l in locators], ['email-input', 'submit'])
+        self.assertEqual(endpoints, [{'path': '/api/auth/login'}])
+        # '/' is always passed; '/reports' matches nothing
+        self.assertEqual(routes, [{'path': '/'}, {'path': '/dashboard'}])
+
+    def test_quoted_selector_matches_locator(self):
+        locators, _, _ = trim_metadata('Then "#login-submit" is disabled', LOCATORS, [], [], token_budget=10000)
+        self.assertEqual([l['key'] for l in locators], ['submit'])
+
+    def test_budget_caps_matched_entries(self):
+        cost = estimate_tokens(json.dumps(LOCATORS[1], indent=2))
+        locators, endpoints, routes = trim_metadata(STEP_TEXT, LOCATORS, ENDPOINTS, UI_ROUTES, token_budget=cost)
+        # The exact quoted match ranks first and fills the budget
+        self.assertEqual(locators, [LOCATORS[1]])
+        self.assertEqual((endpoints, routes), ([], []))
+
+    def test_kept_entries_keep_their_order(self):
+        locators, _, _ = trim_metadata('"#login-submit" and the email input', LOCATORS, [], [], token_budget=10000)
+        self.assertEqual([l['key'] for l in locators], ['email-input', 'submit'])
+
+
+if __name__ == '__main__':
+    unittest.main()
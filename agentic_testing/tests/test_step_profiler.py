@@ -0,0 +1,61 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agentic_testing.tools.step_profiler import PARTS, StepProfiler, merge_profiles
+
+
+def worker_report(steps, locators, top=2):
+    """report() of a profiler that ran steps {name: [seconds, ...]} and locators {locator: seconds}."""
+    profiler = StepProfiler(top=top)
+    for name, durations in steps.items():
+        for seconds in durations:
+            profiler.totals["steps"] += 1
+            profiler.totals["seconds"] += seconds
+            profiler.totals["python"] += seconds
+            entry = profiler.by_step.setdefault(name, {"count": 0, "seconds": 0.0, "max": 0.0, **dict.fromkeys(PARTS, 0.0)})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            entry["python"] += seconds
+    profiler._current = {"name": "Given a step"}
+    for locator, seconds in locators.items():
+        profiler._locator(locator, seconds, "webdriver", False)
+    return profiler.report()
+
+
+class MergeProfilesTest(unittest.TestCase):
+    def setUp(self):
+        # "When open" is third in each worker's top-2 list but first overall
+        self.reports = [
+            worker_report({"When a": [5.0], "When b": [4.0], "When open": [3.0]},
+                          {"id=a": 5.0, "id=b": 4.0, "id=open": 3.0}),
+            worker_report({"When c": [5.0], "When d": [4.0], "When open": [3.0, 3.0]},
+                          {"id=c": 5.0, "id=d": 4.0, "id=open": 3.0}),
+        ]
+
+    def test_worker_lists_are_truncated_but_aggregates_are_not(self):
+        report = self.reports[0]
+        self.assertEqual([entry["step"] for entry in report["steps_by_total_time"]], ["When a", "When b"])
+        self.assertEqual(set(report["aggregates"]["by_step"]), {"When a", "When b", "When open"})
+        self.assertEqual(set(report["aggregates"]["locators"]), {"id=a", "id=b", "id=open"})
+
+    def test_totals_are_summed_across_workers(self):
+        merged = merge_profiles(self.reports, top=2)
+        self.assertEqual(merged["totals"]["steps"], 7)
+        self.assertEqual(merged["totals"]["seconds"], 27.0)
+        self.assertEqual(merged["aggregates"]["by_step"]["When open"]["count"], 3)
+        self.assertEqual(merged["aggregates"]["by_step"]["When open"]["seconds"], 9.0)
+
+    def test_lists_are_ranked_after_merging(self):
+        merged = merge_profiles(self.reports, top=2)
+        self.assertEqual([entry["step"] for entry in merged["steps_by_total_time"]], ["When open", "When a"])
+        self.assertEqual(merged["steps_by_total_time"][0]["mean"], 3.0)
+        self.assertEqual([entry["locator"] for entry in merged["slowest_locators"]], ["id=open", "id=a"])
+        self.assertEqual(merged["slowest_locators"][0]["calls"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
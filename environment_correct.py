@@ -13,6 +13,13 @@ from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException
 import responses
 
+from locator_registry import LOCATORS_PATH, get_registry
+from element_resolver import get_resolver
+from validation_guard import get_validation_guard
+from stream_report import StreamingReport, render_html
+from driver_pool import DEFAULT_IMPLICIT_WAIT, DRIVER_POOL, DriverPool
+from step_profiler import STEP_PROFILE, format_summary, get_profiler
+
 # === Helper classes for mock HTTP server ===
 
 class ThreadedHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
@@ -56,12 +63,9 @@ class MockRequestHandler(http.server.BaseHTTPRequestHandler):
         # Override to suppress default console logging of HTTP requests
         pass
 
-# === Behave fixtures ===
-
-@fixture
-def selenium_browser_chrome(context):
+def create_chrome_driver(logger):
     """
-    Initialize Selenium Chrome WebDriver with headless mode and JS hooks to disable validations.
+    Start a Selenium Chrome WebDriver with JS hooks to disable validations.
     """
     options = Options()
     # options.add_argument("--headless")  # Commented out to show browser window
@@ -71,26 +75,38 @@ def selenium_browser_chrome(context):
     options.add_argument("--disable-dev-shm-usage")
     # Additional Chrome options can be added here if needed
 
+    driver = webdriver.Chrome(options=options)
+    driver.implicitly_wait(DEFAULT_IMPLICIT_WAIT)
+    # Disable all HTML5 and React validation in every page of the session (CDP), so
+    # before_step does not have to re-send the script
+    mode = get_validation_guard(logger).install(driver)
+    logger.info(f"Registered JS to disable all browser and React validation ({mode}).")
+    return driver
+
+# === Behave fixtures ===
+
+@fixture
+def selenium_browser_pooled(context):
+    """
+    Borrow a warm WebDriver session from context.driver_pool for the scenario; the cleanup
+    resets it and returns it to the pool instead of quitting Chrome.
+    """
+    try:
+        driver = context.driver_pool.acquire()
+    except WebDriverException as e:
+        context.logger.error(f"Error initializing Chrome WebDriver: {e}")
+        raise
+    context.driver = driver
+    yield driver
+    context.driver_pool.release(driver)
+
+@fixture
+def selenium_browser_chrome(context):
+    """
+    Initialize a dedicated Selenium Chrome WebDriver for the scenario (DRIVER_POOL=off).
+    """
     try:
-        driver = webdriver.Chrome(options=options)
-        driver.implicitly_wait(5)
-        # Insert robust JS hooks to disable all HTML5 and React validation
-        disable_validation_js = """
-            // Disable native browser validation messages
-            HTMLFormElement.prototype.reportValidity = function() { return true; };
-            // Override setCustomValidity to noop
-            HTMLElement.prototype.setCustomValidity = function() {};
-            // Override checkValidity to always valid
-            HTMLInputElement.prototype.checkValidity = function() { return true; };
-            // Disable required attribute enforcement
-            Object.defineProperty(HTMLInputElement.prototype, 'required', { get: function() { return false; } });
-            // For React: override validationMessage
-            Object.defineProperty(HTMLInputElement.prototype, 'validationMessage', { get: function() { return ''; } });
-            // For React: override validity property
-            Object.defineProperty(HTMLInputElement.prototype, 'validity', { get: function() { return { valid: true }; } });
-        """
-        driver.execute_script(disable_validation_js)
-        context.logger.info("Injected JS to disable all browser and React validation.")
+        driver = create_chrome_driver(context.logger)
         context.driver = driver
         yield driver
     except WebDriverException as e:
@@ -180,19 +196,17 @@ def responses_mock_api(context):
 
 # === Helper function for loading locators ===
 
-def load_locators(logger) -> dict:
-    locators_path = Path("features/meta_data/locators_babel.json")
+def load_locators(logger):
+    """
+    Compiled LocatorRegistry for features/meta_data/locators_babel.json, shared with the
+    step modules through locator_registry.get_registry().
+    """
+    locators_path = Path(LOCATORS_PATH)
     if not locators_path.is_file():
         logger.warning(f"Locators config file {locators_path} not found. context.locators will be empty.")
-        return {}
-    try:
-        with locators_path.open() as f:
-            locs = json.load(f)
-        logger.info(f"Loaded {len(locs)} locators from {locators_path}.")
-        return locs
-    except Exception as e:
-        logger.error(f"Failed to load locators from {locators_path}: {e}")
-        return {}
+    registry = get_registry()
+    logger.info(f"Loaded {len(registry)} locator keys from {locators_path} ({registry.skipped} unsupported entries skipped).")
+    return registry
 
 # === Behave environment hooks ===
 
@@ -208,7 +222,10 @@ def before_all(context):
     reports_dir.mkdir(parents=True, exist_ok=True)
 
     # Setup logger, log to file and stream (console)
-    log_file = logs_dir / "test_execution.log"
+    # Parallel runs (parallel_behave) give every worker process its own log file and report
+    context.worker_id = os.environ.get("BEHAVE_WORKER_ID")
+    worker_suffix = f"_worker{context.worker_id}" if context.worker_id else ""
+    log_file = logs_dir / f"test_execution{worker_suffix}.log"
     logger = logging.getLogger("behave_test")
     logger.setLevel(logging.DEBUG)
     formatter = logging.Formatter('%(asctime)s | %(levelname)s | %(message)s')
@@ -233,8 +250,13 @@ def before_all(context):
     # Base URL for all tests
     context.base_url = "http://localhost:3000"
 
-    # Load locators at start to share across scenarios
-    context.locators = load_locators(context.logger)
+    # Load locators at start to share across scenarios; keys resolve to ranked (By, selector) tuples
+    context.locator_registry = load_locators(context.logger)
+    context.locators = context.locator_registry.raw
+    context.get_locator = context.locator_registry.locator
+    # Fallback locators are polled together in one wait; see element_resolver.py
+    context.element_resolver = get_resolver()
+    context.validation_guard = get_validation_guard(context.logger)
 
     # Start mock API server globally if any api-related tag sets present in feature files (heuristic)
     # TODO: Adjust if smarter global detection needed
@@ -243,31 +265,30 @@ def before_all(context):
     context.mock_thread = None
 
     # Similarly, no driver at this point; will start as needed per scenario
-    context._report_results = []
-    context._current_feature = None
-    context._current_scenario = None
+    # Steps and scenarios are appended to the JSONL report as they finish (see stream_report.py)
+    context.report = StreamingReport(Path('features/reports') / f'behave_report{worker_suffix}.jsonl', context.worker_id)
     context._step_start_time = None
-    context._step_results = []
+    context._step_count = 0
+    # Splits step time into WebDriver commands, explicit/implicit waits and Python (STEP_PROFILE=off disables)
+    context.profiler = get_profiler() if STEP_PROFILE else None
+
+    # Warm Chrome sessions shared by the UI scenarios (see DriverPool)
+    context.driver_pool = DriverPool(lambda: create_chrome_driver(logger), logger) if DRIVER_POOL else None
+    # Run-level counters written next to the report in after_all
+    context.run_stats = {}
 
 def before_feature(context, feature):
-    context._current_feature = {
-        'name': feature.name,
-        'scenarios': []
-    }
+    context.report.feature(feature)
 
 def before_scenario(context, scenario):
-    context._current_scenario = {
-        'name': scenario.name,
-        'steps': []
-    }
-    context._step_results = []
+    context._step_count = 0
     # Prepare scenario-specific context attributes and services
     tags = set(scenario.tags)
 
     # Start Selenium driver for UI-related tags
     if tags.intersection({'ui', 'visual', 'ux'}):
         context.logger.info(f"Scenario '{scenario.name}' requires UI testing. Starting Selenium driver.")
-        use_fixture(selenium_browser_chrome, context)
+        use_fixture(selenium_browser_pooled if context.driver_pool else selenium_browser_chrome, context)
         # The fixture now sets context.driver, so context.driver.get is safe here
         try:
             context.driver.get(context.base_url)
@@ -303,52 +324,22 @@ def before_scenario(context, scenario):
         context.logger.debug(f"Scenario '{scenario.name}' includes validation-related tags: {tags & validation_tags}")
 
 def before_step(context, step):
-    # Inject validation-disabling JS before every step if UI driver is present
+    # Validation-disabling JS is registered once per session; it is only re-sent after a
+    # navigation when the driver has no CDP (see validation_guard.py)
     if hasattr(context, 'driver') and context.driver:
-        disable_validation_js = """
-            // Disable native browser validation messages
-            HTMLFormElement.prototype.reportValidity = function() { return true; };
-            // Override setCustomValidity to noop
-            HTMLElement.prototype.setCustomValidity = function() {};
-            // Override checkValidity to always valid
-            HTMLInputElement.prototype.checkValidity = function() { return true; };
-            // Disable required attribute enforcement
-            Object.defineProperty(HTMLInputElement.prototype, 'required', { get: function() { return false; } });
-            // For React: override validationMessage
-            Object.defineProperty(HTMLInputElement.prototype, 'validationMessage', { get: function() { return ''; } });
-            // For React: override validity property
-            Object.defineProperty(HTMLInputElement.prototype, 'validity', { get: function() { return { valid: true }; } });
-            // Set noValidate on all forms
-            document.querySelectorAll('form').forEach(f => f.noValidate = true);
-            // Log to browser console
-            console.log('[Behave] Disabled browser and React validation, set noValidate on all forms.');
-            // MutationObserver to re-apply after DOM changes (e.g., React re-render)
-            if (!window._behaveValidationObserver) {
-                window._behaveValidationObserver = new MutationObserver(function() {
-                    document.querySelectorAll('form').forEach(f => f.noValidate = true);
-                    HTMLFormElement.prototype.reportValidity = function() { return true; };
-                    HTMLElement.prototype.setCustomValidity = function() {};
-                    HTMLInputElement.prototype.checkValidity = function() { return true; };
-                    Object.defineProperty(HTMLInputElement.prototype, 'required', { get: function() { return false; } });
-                    Object.defineProperty(HTMLInputElement.prototype, 'validationMessage', { get: function() { return ''; } });
-                    Object.defineProperty(HTMLInputElement.prototype, 'validity', { get: function() { return { valid: true }; } });
-                    console.log('[Behave] MutationObserver reapplied validation disables.');
-                });
-                window._behaveValidationObserver.observe(document.body, { childList: true, subtree: true });
-            }
-        """
-        context.driver.execute_script(disable_validation_js)
-        context.logger.info("Injected JS to disable all browser and React validation, set noValidate, and attached MutationObserver.")
+        context.validation_guard.before_step(context.driver)
+    if context.profiler:
+        if getattr(context, 'driver', None):
+            context.profiler.instrument(context.driver)
+        context.profiler.begin_step(step)
     context._step_start_time = time.time()
     context.logger.info(f"Starting Step: {step.keyword} {step.name}")
 
 def after_step(context, step):
     duration = time.time() - context._step_start_time if context._step_start_time else 0
-    context._step_results.append({
-        'name': f"{step.keyword} {step.name}",
-        'status': step.status,
-        'duration': duration
-    })
+    profile = context.profiler.end_step(step, context.scenario) if context.profiler else None
+    context.report.step(context.scenario, step, duration, profile)
+    context._step_count += 1
     if step.status == "failed":
         context.logger.error(f"Step failed: {step.keyword} {step.name}")
         # For UI steps, screenshot on failure
@@ -364,8 +355,7 @@ def after_step(context, step):
         context.logger.info(f"Step passed: {step.keyword} {step.name}")
 
 def after_scenario(context, scenario):
-    context._current_scenario['steps'] = context._step_results
-    context._current_feature['scenarios'].append(context._current_scenario)
+    context.report.scenario(scenario, context._step_count)
     # On failure for UI, capture screenshot to features/screenshots with scenario name sanitized
     if scenario.status == "failed":
         if context.driver:
@@ -377,14 +367,14 @@ def after_scenario(context, scenario):
             except Exception as e:
                 context.logger.error(f"Failed to take screenshot: {e}")
 
-    # Selenium driver quit if initialized
-    if getattr(context, "driver", None):
+    # Selenium driver quit if initialized; pooled sessions are reset and returned by the fixture cleanup
+    if getattr(context, "driver", None) and not context.driver_pool:
         try:
             context.driver.quit()
             context.logger.info("Selenium WebDriver quit after scenario.")
         except Exception as e:
             context.logger.warning(f"Exception quitting Selenium WebDriver: {e}")
-        context.driver = None
+    context.driver = None
 
     # Stop API mocks if started
     if getattr(context, "mock_api", None):
@@ -403,9 +393,6 @@ def after_scenario(context, scenario):
         # context.db_stub.stop()
         context.db_stub = None
 
-def after_feature(context, feature):
-    context._report_results.append(context._current_feature)
-
 def after_all(context):
     if hasattr(context, 'mock_httpd') and context.mock_httpd:
         context.logger.info("Shutting down mock HTTP server at after_all.")
@@ -414,25 +401,34 @@ def after_all(context):
             context.mock_thread.join()
         context.logger.info("Mock HTTP server shut down at after_all.")
 
-    # Write JSON and HTML report
+    if context.driver_pool:
+        context.driver_pool.close()
+        context.run_stats['driver_pool'] = dict(context.driver_pool.stats)
+        context.logger.info(f"WebDriver pool: {context.driver_pool.summary()}")
+    context.run_stats['locators'] = context.locator_registry.stats()
+    context.run_stats['validation_guard'] = dict(context.validation_guard.stats)
+    context.logger.info(f"Validation guard: {context.validation_guard.summary()}")
+    context.run_stats['element_resolver'] = dict(context.element_resolver.stats, winners=context.element_resolver.winners())
+
+    # Finish the JSONL report and render the HTML report from it
     reports_dir = Path('features/reports')
-    reports_dir.mkdir(parents=True, exist_ok=True)
-    json_report_path = reports_dir / 'behave_report.json'
-    html_report_path = reports_dir / 'behave_report.html'
-    with open(json_report_path, 'w', encoding='utf-8') as f:
-        json.dump(context._report_results, f, indent=2)
-    # Generate simple HTML report
-    html = ['<html><head><title>Behave Test Report</title></head><body>']
-    for feature in context._report_results:
-        html.append(f"<h2>Feature: {feature['name']}</h2>")
-        for scenario in feature['scenarios']:
-            html.append(f"<h3>Scenario: {scenario['name']}</h3><ul>")
-            for step in scenario['steps']:
-                html.append(f"<li>{step['name']} ... <b>{step['status']}</b> in {step['duration']:.3f}s</li>")
-            html.append("</ul>")
-    html.append('</body></html>')
-    with open(html_report_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(html))
+    worker_suffix = f"_worker{context.worker_id}" if context.worker_id else ""
+    if context.profiler:
+        profile = context.profiler.report()
+        context.run_stats['step_profile'] = profile['totals']
+        profile_path = reports_dir / f'step_profile{worker_suffix}.json'
+        with open(profile_path, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2)
+        # behave captures stdout in hooks, so the summary goes through the logger's console handler
+        context.logger.info("\n" + format_summary(profile))
+        context.logger.info(f"Step profile written to {profile_path}")
+    with open(reports_dir / f'behave_run_stats{worker_suffix}.json', 'w', encoding='utf-8') as f:
+        json.dump(context.run_stats, f, indent=2)
+    for name, stats in context.run_stats.items():
+        context.report.stats(name, stats)
+    context.report.close()
+    html_report_path = render_html(context.report.path)
+    context.logger.info(f"Wrote {context.report.records} report records to {context.report.path} and HTML report to {html_report_path}")
 
     context.logger.info("=== Test execution finished ===")
     handlers = context.logger.handlers[:]
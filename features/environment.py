@@ -1,4 +1,5 @@
 import os
+import atexit
 import logging
 import json
 import threading
@@ -14,6 +15,10 @@ from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 import responses
 
+from locator_registry import LOCATORS_PATH, get_registry
+from validation_guard import get_validation_guard
+from driver_pool import DEFAULT_IMPLICIT_WAIT, DriverPool
+
 # --- Locator strategy mapping ---
 def map_locator_strategy(by, value):
     """
@@ -68,51 +73,25 @@ def get_by_strategy(by_value):
     else:
         raise ValueError(f"Unknown locator strategy in locators file: {by_value}")
 
-def load_locators(logger) -> dict:
-    locators_path = Path("features/meta_data/locators_babel.json")
+def load_locators(logger):
+    """
+    Compiled LocatorRegistry for features/meta_data/locators_babel.json; the step modules
+    share the same instance through locator_registry.get_registry().
+    """
+    locators_path = Path(LOCATORS_PATH)
     if not locators_path.is_file():
         logger.warning(f"Locators file {locators_path} not found.")
-        return {}
-    try:
-        with locators_path.open() as f:
-            locs = json.load(f)
-        logger.info(f"Loaded {len(locs)} locators.")
-        result = {}
-        for item in locs:
-            key = item.get('key')
-            if not key:
-                continue
-            if key in result:
-                if isinstance(result[key], list):
-                    result[key].append(item)
-                else:
-                    result[key] = [result[key], item]
-            else:
-                result[key] = item
-        return result
-    except Exception as e:
-        logger.error(f"Failed to load locators: {e}")
-        return {}
+    registry = get_registry()
+    logger.info(f"Loaded {len(registry)} locator keys ({registry.skipped} unsupported entries skipped).")
+    return registry
 
 def get_locator(context, key):
-    locators = context.locators.get(key)
-    if not locators:
+    registry = getattr(context, "locator_registry", None) or get_registry()
+    try:
+        return registry.locator(key)
+    except KeyError:
         context.logger.warning(f"Locator key '{key}' not found in locators.")
-        return None
-    if not isinstance(locators, list):
-        locators = [locators]
-    for locator in locators:
-        by_raw = locator.get("by")
-        selector = locator.get("selector")
-        if not by_raw or not selector:
-            continue
-        try:
-            by = get_by_strategy(by_raw)
-            return (by, selector)
-        except ValueError:
-            continue  # skip unsupported strategies
-    context.logger.error(f"No valid locator found for key '{key}'.")
-    return None
+        raise
 
 # Patch context after loading locators in before_all
 
@@ -143,18 +122,45 @@ class MockRequestHandler(http.server.BaseHTTPRequestHandler):
     def log_message(self, format, *args):
         pass
 
-@fixture
-def selenium_browser_chrome(context):
+_default_pool = None
+
+def default_driver_pool(logger):
+    """Process-wide pool for when before_all did not set context.driver_pool; closed at exit."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = DriverPool(lambda: create_chrome_driver(logger), logger)
+        atexit.register(_default_pool.close)
+    return _default_pool
+
+def create_chrome_driver(logger):
     options = Options()
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--disable-dev-shm-usage")
+    driver = webdriver.Chrome(options=options)
+    driver.implicitly_wait(DEFAULT_IMPLICIT_WAIT)
+    # Validation stays disabled in every page of the session; before_step no longer re-sends it
+    get_validation_guard(logger).install(driver)
+    logger.info("Chrome WebDriver initialized.")
+    return driver
 
+@fixture
+def selenium_browser_pooled(context):
+    pool = getattr(context, "driver_pool", None) or default_driver_pool(context.logger)
+    try:
+        driver = pool.acquire()
+    except WebDriverException as e:
+        context.logger.error(f"Error initializing Chrome WebDriver: {e}")
+        raise
+    context.driver = driver
+    yield driver
+    pool.release(driver)
+
+@fixture
+def selenium_browser_chrome(context):
     try:
-        driver = webdriver.Chrome(options=options)
-        driver.implicitly_wait(5)
-        context.logger.info("Chrome WebDriver initialized.")
+        driver = create_chrome_driver(context.logger)
         context.driver = driver
         yield driver
     except WebDriverException as e:
@@ -192,3 +198,7 @@ def responses_mock_api(context):
     context.mock_api = rsps_mock
 
 # Additional environment hooks, such as before_all, after_all, could also be here
+# With DRIVER_POOL on, use selenium_browser_pooled instead of selenium_browser_chrome in
+# before_scenario and skip driver.quit() in after_scenario; setting
+#     context.driver_pool = DriverPool(lambda: create_chrome_driver(context.logger), context.logger)
+# in before_all (and closing it in after_all) gives the run its own pool.
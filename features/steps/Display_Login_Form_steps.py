@@ -2,6 +2,9 @@ from behave import given, when, then
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from element_resolver import resolve_element
 
 @given("the login page is opened")
 def step_impl(context):
@@ -23,34 +26,14 @@ def step_impl(context):
 
 @then("the login form includes an email input field")
 def step_impl(context):
-    # Prefer locator with data-testid for email input; fallback to id or type
-    try:
-        by, selector = context.get_locator("email-input")
-    except KeyError:
-        try:
-            by, selector = context.get_locator("email")
-        except KeyError:
-            # fallback to type=email selector
-            by, selector = 'css selector', "[type='email']"
-    element = WebDriverWait(context.driver, 10).until(
-        EC.visibility_of_element_located((by, selector))
-    )
+    # Prefer locator with data-testid for email input; fallback to id or type (all polled in one wait)
+    element = resolve_element(context.driver, "email-input", "email", (By.CSS_SELECTOR, "[type='email']"), condition="visible")
     assert element.is_displayed(), "Email input field is not visible"
 
 @then("the login form includes a password input field")
 def step_impl(context):
-    # Prefer locator with data-testid for password input; fallback to id or placeholder
-    try:
-        by, selector = context.get_locator("password-input")
-    except KeyError:
-        try:
-            by, selector = context.get_locator("password")
-        except KeyError:
-            # fallback to css placeholder selector
-            by, selector = 'css selector', "[placeholder='Enter your password']"
-    element = WebDriverWait(context.driver, 10).until(
-        EC.visibility_of_element_located((by, selector))
-    )
+    # Prefer locator with data-testid for password input; fallback to id or placeholder (all polled in one wait)
+    element = resolve_element(context.driver, "password-input", "password", (By.CSS_SELECTOR, "[placeholder='Enter your password']"), condition="visible")
     assert element.is_displayed(), "Password input field is not visible"
 
 @then("the login form includes a login button")
@@ -65,64 +48,28 @@ def step_impl(context):
 def step_impl(context, email):
     value = "" if email.strip() == "<empty>" else email.strip()
     # Clear and set email input accordingly
-    try:
-        by, selector = context.get_locator("email-input")
-    except KeyError:
-        try:
-            by, selector = context.get_locator("email")
-        except KeyError:
-            by, selector = 'css selector', "[type='email']"
-    email_input = WebDriverWait(context.driver, 10).until(
-        EC.element_to_be_clickable((by, selector))
-    )
+    email_input = resolve_element(context.driver, "email-input", "email", (By.CSS_SELECTOR, "[type='email']"), condition="clickable")
     email_input.clear()
     email_input.send_keys(value)
 
 @when("I leave the password field as {password}")
 def step_impl(context, password):
     value = "" if password.strip() == "<empty>" else password.strip()
-    try:
-        by, selector = context.get_locator("password-input")
-    except KeyError:
-        try:
-            by, selector = context.get_locator("password")
-        except KeyError:
-            by, selector = 'css selector', "[type='password']"
-    password_input = WebDriverWait(context.driver, 10).until(
-        EC.element_to_be_clickable((by, selector))
-    )
+    password_input = resolve_element(context.driver, "password-input", "password", (By.CSS_SELECTOR, "[type='password']"), condition="clickable")
     password_input.clear()
     password_input.send_keys(value)
 
 @when("I enter the email {email}")
 def step_impl(context, email):
     value = email.strip().strip('"').strip("'")
-    try:
-        by, selector = context.get_locator("email-input")
-    except KeyError:
-        try:
-            by, selector = context.get_locator("email")
-        except KeyError:
-            by, selector = 'css selector', "[type='email']"
-    email_input = WebDriverWait(context.driver, 10).until(
-        EC.element_to_be_clickable((by, selector))
-    )
+    email_input = resolve_element(context.driver, "email-input", "email", (By.CSS_SELECTOR, "[type='email']"), condition="clickable")
     email_input.clear()
     email_input.send_keys(value)
 
 @when("I enter the password {password}")
 def step_impl(context, password):
     value = password.strip().strip('"').strip("'")
-    try:
-        by, selector = context.get_locator("password-input")
-    except KeyError:
-        try:
-            by, selector = context.get_locator("password")
-        except KeyError:
-            by, selector = 'css selector', "[type='password']"
-    password_input = WebDriverWait(context.driver, 10).until(
-        EC.element_to_be_clickable((by, selector))
-    )
+    password_input = resolve_element(context.driver, "password-input", "password", (By.CSS_SELECTOR, "[type='password']"), condition="clickable")
     password_input.clear()
     password_input.send_keys(value)
 
@@ -0,0 +1,278 @@
+"""
+Streaming JSON Lines test report for environment.py.
+
+Instead of collecting every feature/scenario/step in memory and writing the report in
+after_all, StreamingReport appends one JSON record per line as each step and scenario
+finishes and flushes after every scenario, so memory stays flat and a crashed run still
+leaves a readable report. The HTML report is rendered from the JSONL file afterwards,
+one scenario at a time. Parallel workers write one JSONL file each; merge_jsonl_reports
+combines them, grouping the scenarios of a feature split across workers.
+
+Record types (the "type" key):
+    run       {"worker", "started"}
+    feature   {"name", "location"}
+    step      {"feature", "scenario", "name", "status", "duration", "error"?, "profile"?}
+    scenario  {"feature", "name", "location", "status", "duration", "steps"}
+    stats     {"name", "stats"}  # run-level counters (driver pool, locators, ...)
+
+    python stream_report.py render features/reports/behave_report.jsonl
+    python stream_report.py merge features/reports/behave_report_worker*.jsonl -o features/reports/behave_report.jsonl
+
+Step 7 copies this file next to environment.py with the other support modules.
+"""
+import os
+import sys
+import json
+import html
+import argparse
+from datetime import datetime
+
+# Records written between flushes; a finished scenario is always flushed
+REPORT_FLUSH_EVERY = int(os.environ.get('REPORT_FLUSH_EVERY', '50'))
+# Run-level counters that are the same in every worker, so merging keeps the largest
+NON_ADDITIVE_STATS = {"keys", "skipped_entries", "max_uses"}
+
+
+def status_name(status):
+    """behave reports statuses as a Status enum, which json cannot serialize."""
+    return getattr(status, "name", status)
+
+
+class StreamingReport:
+    """
+    Appends report records to a JSONL file as the run progresses.
+    """
+
+    def __init__(self, path, worker_id=None, flush_every=REPORT_FLUSH_EVERY):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path) or os.curdir, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self.flush_every = max(1, flush_every)
+        self._pending = 0
+        self.records = 0
+        self.write({"type": "run", "worker": worker_id, "started": datetime.now().isoformat(timespec="seconds")}, flush=True)
+
+    def write(self, record, flush=False):
+        if self._file is None:
+            return
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self.records += 1
+        self._pending += 1
+        if flush or self._pending >= self.flush_every:
+            self._file.flush()
+            self._pending = 0
+
+    def feature(self, feature):
+        self.write({"type": "feature", "name": feature.name, "location": str(feature.location)})
+
+    def step(self, scenario, step, duration, profile=None):
+        record = {
+            "type": "step",
+            "feature": scenario.feature.name,
+            "scenario": scenario.name,
+            "name": f"{step.keyword} {step.name}",
+            "status": status_name(step.status),
+            "duration": round(duration, 3),
+        }
+        if getattr(step, "error_message", None):
+            record["error"] = step.error_message.strip().splitlines()[-1]
+        if profile:
+            # Time breakdown from step_profiler.py
+            record["profile"] = profile
+        self.write(record)
+
+    def scenario(self, scenario, steps):
+        self.write({
+            "type": "scenario",
+            "feature": scenario.feature.name,
+            "name": scenario.name,
+            "location": str(scenario.location),
+            "status": status_name(scenario.status),
+            "duration": round(scenario.duration or 0, 3),
+            "steps": steps,
+        }, flush=True)
+
+    def stats(self, name, stats):
+        self.write({"type": "stats", "name": name, "stats": stats})
+
+    def close(self):
+        if self._file is not None:
+            self._file.flush()
+            self._file.close()
+            self._file = None
+
+
+def iter_records(path):
+    """Records of a JSONL report; a line cut short by a crash is skipped."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def render_html(jsonl_path, html_path=None):
+    """
+    Write the HTML report for a JSONL report (default: same name with .html) and return
+    its path. Only the steps of the scenario being rendered are held in memory.
+    """
+    html_path = html_path or os.path.splitext(jsonl_path)[0] + ".html"
+    counts = {}
+    steps = []
+    stats = []
+    with open(html_path, "w", encoding="utf-8") as out:
+        out.write("<html><head><title>Behave Test Report</title></head><body>\n")
+
+        def write_scenario(name, status, duration):
+            out.write(f"<h3>Scenario: {html.escape(name)} ... <b>{html.escape(status)}</b> in {duration:.3f}s</h3><ul>\n")
+            for step in steps:
+                error = f" <i>{html.escape(step['error'])}</i>" if step.get("error") else ""
+                out.write(f"<li>{html.escape(step['name'])} ... <b>{html.escape(str(step['status']))}</b> "
+                          f"in {step['duration']:.3f}s{error}</li>\n")
+            out.write("</ul>\n")
+            counts[status] = counts.get(status, 0) + 1
+            steps.clear()
+
+        def write_incomplete():
+            # The run (or a worker) stopped in the middle of this scenario
+            if steps:
+                write_scenario(steps[-1]["scenario"], "incomplete", sum(step["duration"] for step in steps))
+
+        for record in iter_records(jsonl_path):
+            kind = record.get("type")
+            if kind == "feature":
+                write_incomplete()
+                out.write(f"<h2>Feature: {html.escape(record['name'])}</h2>\n")
+            elif kind == "step":
+                if steps and (steps[-1]["feature"], steps[-1]["scenario"]) != (record["feature"], record["scenario"]):
+                    write_incomplete()
+                steps.append(record)
+            elif kind == "scenario":
+                write_scenario(record["name"], str(record["status"]), record.get("duration", 0))
+            elif kind == "stats":
+                stats.append(record)
+        write_incomplete()
+        out.write("<h2>Summary</h2><ul>\n")
+        for status, count in sorted(counts.items()):
+            out.write(f"<li>{html.escape(status)}: {count}</li>\n")
+        out.write("</ul>\n")
+        for record in stats:
+            out.write(f"<h2>{html.escape(record['name'])}</h2><ul>\n")
+            for key, value in record["stats"].items():
+                out.write(f"<li>{html.escape(str(key))}: {html.escape(str(value))}</li>\n")
+            out.write("</ul>\n")
+        out.write("</body></html>\n")
+    return html_path
+
+
+def merge_stats(total, stats):
+    """Add one worker's counters into total: numbers are summed, nested dicts merged."""
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float, dict)):
+            total.setdefault(key, value)
+        elif isinstance(value, dict):
+            merge_stats(total.setdefault(key, {}), value)
+        elif key in NON_ADDITIVE_STATS:
+            total[key] = max(total.get(key, value), value)
+        else:
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def index_blocks(path, blocks, order):
+    """
+    Record the byte ranges of path's step/scenario lines per feature (a feature split across
+    workers has a block in each file) and return the file's stats records.
+    """
+    stats = []
+    feature = start = None
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            end = offset + len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = {}
+            kind = record.get("type")
+            if kind in ("step", "scenario") and feature is not None:
+                if start is None:
+                    start = offset
+            else:
+                if feature is not None and start is not None:
+                    blocks[feature].append((path, start, offset))
+                start = None
+                if kind == "feature":
+                    feature = record["name"]
+                    if feature not in blocks:
+                        blocks[feature] = []
+                        order.append(record)
+                else:
+                    feature = None
+                    if kind == "stats":
+                        stats.append(record)
+            offset = end
+        if feature is not None and start is not None:
+            blocks[feature].append((path, start, offset))
+    return stats
+
+
+def merge_jsonl_reports(paths, output_path, html_path=None):
+    """
+    Merge worker JSONL reports into output_path, one feature record followed by all of its
+    scenarios from every worker, then the summed run-level stats, and render the HTML
+    report. Lines are copied by byte range, so memory does not grow with the suite.
+    Returns {"workers", "scenarios", "stats", "html"}.
+    """
+    blocks, order, stats = {}, [], {}
+    workers = []
+    for path in paths:
+        for record in index_blocks(path, blocks, order):
+            merge_stats(stats.setdefault(record["name"], {}), record["stats"])
+        workers.append(path)
+    counts = {}
+    with open(output_path, "wb") as out:
+        out.write((json.dumps({"type": "run", "worker": None, "merged": workers,
+                               "started": datetime.now().isoformat(timespec="seconds")}) + "\n").encode("utf-8"))
+        for feature in order:
+            out.write((json.dumps(feature) + "\n").encode("utf-8"))
+            for path, start, end in blocks[feature["name"]]:
+                with open(path, "rb") as f:
+                    f.seek(start)
+                    chunk = f.read(end - start)
+                out.write(chunk)
+                for line in chunk.splitlines():
+                    record = json.loads(line)
+                    if record.get("type") == "scenario":
+                        counts[record["status"]] = counts.get(record["status"], 0) + 1
+        for name, values in stats.items():
+            out.write((json.dumps({"type": "stats", "name": name, "stats": values}) + "\n").encode("utf-8"))
+    return {"workers": len(workers), "scenarios": counts, "stats": stats, "html": render_html(output_path, html_path)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render or merge streaming JSONL behave reports.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    render = commands.add_parser("render", help="write the HTML report for a JSONL report")
+    render.add_argument("report")
+    render.add_argument("--html", help="output path (default: report name with .html)")
+    merge = commands.add_parser("merge", help="merge worker JSONL reports and render the HTML report")
+    merge.add_argument("reports", nargs="+")
+    merge.add_argument("-o", "--output", default=os.path.join("features", "reports", "behave_report.jsonl"))
+    merge.add_argument("--html", help="output path (default: output name with .html)")
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "render":
+            print(f"✅ HTML report written to {render_html(args.report, args.html)}")
+        else:
+            result = merge_jsonl_reports(args.reports, args.output, args.html)
+            counts = ", ".join(f"{count} {status}" for status, count in sorted(result["scenarios"].items()))
+            print(f"✅ Merged {result['workers']} reports into {args.output} ({counts or 'no scenarios'}); HTML at {result['html']}")
+    except OSError as e:
+        print(f"❌ Could not {args.command} report: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
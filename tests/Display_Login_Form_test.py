@@ -1,51 +1,30 @@
 from behave import given, when, then
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from element_resolver import get_resolver
+from locator_registry import get_registry
 
 DEFAULT_TIMEOUT = 10
 BASE_URL = "http://localhost:3000"  # As per instructions
 
 
 def get_locator(context, key):
-    if not hasattr(context, "locators"):
-        raise AssertionError("Locators not loaded in context.")
-    locators = context.locators
-    if key not in locators:
+    # Keys are compiled once per run by the shared registry (features/locator_registry.py):
+    # data-testid/type/placeholder selectors are already CSS, and the best strategy wins.
+    locator = get_registry().get(key)
+    if locator is None:
         raise AssertionError(f"Locator for key '{key}' not found in locators.")
-    locator_info = locators[key]
-    by_raw = locator_info.get("by")
-    selector = locator_info.get("selector")
-    if not by_raw or not selector:
-        raise AssertionError(f"Locator for key '{key}' is missing 'by' or 'selector' attributes.")
-    # The 'by' value in locators.json is lowercased version of By enum keys generally,
-    # but some locators use custom strings like 'data-testid'.
-    # We must map them accordingly:
-    # Selenium By supports 'id', 'xpath', 'css selector', 'class name', 'name', 'tag name', 'link text', 'partial link text'
-    # And supports By.CSS_SELECTOR, By.ID, etc.
-    # The locators.json uses "data-testid" as "by" string, which is not standard By enum.
-    # However, we can use By.CSS_SELECTOR with the selector "[data-testid='value']".
-    # So if 'by' is 'data-testid' we must treat as CSS_SELECTOR.
-    # If 'by' is a standard By enum member, use it.
-    # Also handle 'type', 'placeholder' which are CSS selectors as well.
-    by_map = {
-        "id": By.ID,
-        "css": By.CSS_SELECTOR,
-        "css selector": By.CSS_SELECTOR,
-        "xpath": By.XPATH,
-        "class name": By.CLASS_NAME,
-        "name": By.NAME,
-        "tag name": By.TAG_NAME,
-        "link text": By.LINK_TEXT,
-        "partial link text": By.PARTIAL_LINK_TEXT,
-        "data-testid": By.CSS_SELECTOR,
-        "type": By.CSS_SELECTOR,
-        "placeholder": By.CSS_SELECTOR,
-    }
-    if by_raw not in by_map:
-        raise AssertionError(f"Locator 'by' value '{by_raw}' for key '{key}' is not supported.")
-    by = by_map[by_raw]
-    return (by, selector)
+    return locator
+
+
+def find_first(context, keys, condition, error):
+    # All keys are polled together in one wait; the key that matched is tried first next time
+    try:
+        return get_resolver().resolve(context.driver, *keys, condition=condition, timeout=DEFAULT_TIMEOUT)
+    except (KeyError, TimeoutException):
+        raise AssertionError(error)
 
 
 @given('the user navigates to the login page')
@@ -75,20 +54,7 @@ def step_login_form_visible(context):
 @then('the email input field is visible and empty')
 def step_email_input_visible_empty(context):
     # Prefer using "email-input" key, fallback on "email" keys present
-    possible_keys = ["email-input", "email"]
-    email_element = None
-    for key in possible_keys:
-        try:
-            locator = get_locator(context, key)
-            email_element = WebDriverWait(context.driver, DEFAULT_TIMEOUT).until(
-                EC.visibility_of_element_located(locator)
-            )
-            if email_element:
-                break
-        except AssertionError:
-            continue
-    if not email_element:
-        raise AssertionError("Email input field locator not found or visible.")
+    email_element = find_first(context, ["email-input", "email"], "visible", "Email input field locator not found or visible.")
 
     value = email_element.get_attribute("value")
     assert value == "" or value is None, f"Expected email input to be empty but got '{value}'"
@@ -98,20 +64,7 @@ def step_email_input_visible_empty(context):
 @then('the password input field is visible and empty')
 def step_password_input_visible_empty(context):
     # Use password-input data-testid if present else fallback to 'password'
-    possible_keys = ["password-input", "password"]
-    password_element = None
-    for key in possible_keys:
-        try:
-            locator = get_locator(context, key)
-            password_element = WebDriverWait(context.driver, DEFAULT_TIMEOUT).until(
-                EC.visibility_of_element_located(locator)
-            )
-            if password_element:
-                break
-        except AssertionError:
-            continue
-    if not password_element:
-        raise AssertionError("Password input field locator not found or visible.")
+    password_element = find_first(context, ["password-input", "password"], "visible", "Password input field locator not found or visible.")
 
     value = password_element.get_attribute("value")
     assert value == "" or value is None, f"Expected password input to be empty but got '{value}'"
@@ -121,20 +74,7 @@ def step_password_input_visible_empty(context):
 @then('the login button is visible and enabled')
 def step_login_button_visible_enabled(context):
     # Use "login-button" key primarily, then "login-btn" or "submit" or "login-button" alternative keys
-    possible_keys = ["login-button", "login-btn", "submit"]
-    button_element = None
-    for key in possible_keys:
-        try:
-            locator = get_locator(context, key)
-            button_element = WebDriverWait(context.driver, DEFAULT_TIMEOUT).until(
-                EC.visibility_of_element_located(locator)
-            )
-            if button_element:
-                break
-        except AssertionError:
-            continue
-    if not button_element:
-        raise AssertionError("Login button locator not found or visible.")
+    button_element = find_first(context, ["login-button", "login-btn", "submit"], "visible", "Login button locator not found or visible.")
     assert button_element.is_enabled(), "Login button is not enabled"
     context.logger.info("Login button is visible and enabled.")
 
@@ -142,20 +82,7 @@ def step_login_button_visible_enabled(context):
 @when('the user submits the login form with email "{email}" and password "{password}"')
 def step_submit_login_form(context, email, password):
     # Find email field
-    possible_email_keys = ["email-input", "email"]
-    email_element = None
-    for key in possible_email_keys:
-        try:
-            locator = get_locator(context, key)
-            email_element = WebDriverWait(context.driver, DEFAULT_TIMEOUT).until(
-                EC.presence_of_element_located(locator)
-            )
-            if email_element:
-                break
-        except AssertionError:
-            continue
-    if not email_element:
-        raise AssertionError("Email input field not found to fill.")
+    email_element = find_first(context, ["email-input", "email"], "present", "Email input field not found to fill.")
 
     # Clear and send keys - treat "<empty>" as empty string
     value_email = "" if email.strip().lower() == "<empty>" else email
@@ -164,20 +91,7 @@ def step_submit_login_form(context, email, password):
     context.logger.info(f"Entered email: '{value_email}'")
 
     # Find password field
-    possible_password_keys = ["password-input", "password"]
-    password_element = None
-    for key in possible_password_keys:
-        try:
-            locator = get_locator(context, key)
-            password_element = WebDriverWait(context.driver, DEFAULT_TIMEOUT).until(
-                EC.presence_of_element_located(locator)
-            )
-            if password_element:
-                break
-        except AssertionError:
-            continue
-    if not password_element:
-        raise AssertionError("Password input field not found to fill.")
+    password_element = find_first(context, ["password-input", "password"], "present", "Password input field not found to fill.")
 
     value_password = "" if password.strip().lower() == "<empty>" else password
     password_element.clear()
@@ -185,20 +99,7 @@ def step_submit_login_form(context, email, password):
     context.logger.info(f"Entered password: '{value_password}'")
 
     # Find and click login button
-    possible_button_keys = ["login-button", "login-btn", "submit"]
-    button_element = None
-    for key in possible_button_keys:
-        try:
-            locator = get_locator(context, key)
-            button_element = WebDriverWait(context.driver, DEFAULT_TIMEOUT).until(
-                EC.element_to_be_clickable(locator)
-            )
-            if button_element:
-                break
-        except AssertionError:
-            continue
-    if not button_element:
-        raise AssertionError("Login button not found or not clickable.")
+    button_element = find_first(context, ["login-button", "login-btn", "submit"], "clickable", "Login button not found or not clickable.")
     button_element.click()
     context.logger.info("Login button clicked to submit form.")
 
@@ -214,18 +115,11 @@ def step_validation_messages_shown(context):
     error_keys = ["email-error", "password-error", "error-message"]
     actual_messages = []
 
-    for key in error_keys:
-        try:
-            locator = get_locator(context, key)
-            elements = context.driver.find_elements(*locator)
-            for elem in elements:
-                if elem.is_displayed():
-                    text = elem.text.strip()
-                    if text:
-                        actual_messages.append(text)
-        except Exception:
-            # If locator missing or no elements, skip silently
-            pass
+    # One probe for every key (missing keys are skipped) instead of a find_elements per key
+    for elem in get_resolver().resolve_all(context.driver, *error_keys):
+        text = elem.text.strip()
+        if text:
+            actual_messages.append(text)
 
     # Check each expected message is among the actual displayed messages
     missing_messages = []
@@ -240,20 +134,8 @@ def step_validation_messages_shown(context):
 def step_single_validation_message_shown(context, expected_message):
     # Look for any error-message or email-error or password-error elements containing the expected_message text
     error_keys = ["email-error", "password-error", "error-message"]
-    found = False
-    for key in error_keys:
-        try:
-            locator = get_locator(context, key)
-            elements = context.driver.find_elements(*locator)
-            for elem in elements:
-                if elem.is_displayed():
-                    if expected_message.lower() in elem.text.strip().lower():
-                        found = True
-                        break
-        except Exception:
-            continue
-        if found:
-            break
+    found = any(expected_message.lower() in elem.text.strip().lower()
+                for elem in get_resolver().resolve_all(context.driver, *error_keys))
     assert found, f"Expected validation message '{expected_message}' not found on page."
     context.logger.info(f"Validation message shown on page: '{expected_message}'")
 